@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, Query
+
+from app.schemas.slow_query import SlowQueryLog
+from app.services.auth_service import require_admin
+from app.services.slow_query_service import clear_slow_queries, slow_queries
+
+router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/slow-queries", response_model=SlowQueryLog)
+def list_slow_queries(
+    limit: int = Query(50, ge=1, le=1000),
+    min_ms: float | None = Query(None, ge=0),
+    sort: str = Query("recent"),
+):
+    """Slow queries recorded by the worker serving this request"""
+    return slow_queries(limit, min_ms, sort)
+
+
+@router.delete("/slow-queries")
+def reset_slow_queries():
+    clear_slow_queries()
+    return {"message": "Slow query log cleared"}
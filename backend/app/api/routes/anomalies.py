@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.orm import Session
+
+from app.database.session import SessionLocal
+from app.schemas.anomaly import AnomalyResponse, AnomalyScanResult
+from app.services.auth_service import require_admin
+from app.services.anomaly_service import run_anomaly_scan, list_anomalies
+
+router = APIRouter(prefix="/anomalies", tags=["Anomalies"])
+
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@router.post("/scan", response_model=AnomalyScanResult, dependencies=[Depends(require_admin)])
+def scan_anomalies(db: Session = Depends(get_db)):
+    return run_anomaly_scan(db)
+
+
+@router.get("", response_model=list[AnomalyResponse])
+def get_anomalies(
+    response: Response,
+    source: str | None = Query(None, regex="^(fuel|trip|driver_expense)$"),
+    rule: str | None = Query(None),
+    vehicle: str | None = Query(None),
+    driver_id: int | None = Query(None),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = Query(None, description="X-Next-Cursor from the previous page"),
+    db: Session = Depends(get_db),
+):
+    anomalies, next_cursor = list_anomalies(db, source, rule, vehicle, driver_id, limit, cursor)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return anomalies
@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.database.session import SessionLocal
+from app.schemas.availability import AvailabilityResponse
+from app.services.booking_service import availability
+
+router = APIRouter(prefix="/availability", tags=["Availability"])
+
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@router.get("", response_model=AvailabilityResponse, response_model_by_alias=True)
+def get_availability(
+    from_: datetime = Query(..., alias="from"),
+    to: datetime = Query(...),
+    db: Session = Depends(get_db),
+):
+    """Vehicles and drivers free / booked for the whole of [from, to)"""
+    return availability(db, from_, to)
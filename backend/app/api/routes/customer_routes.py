@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from app.database.session import SessionLocal
 from app.schemas.customer import (
     CustomerCreate,
     CustomerResponse,
+    CustomerListItem,
     CustomerUpdate,
     CustomerWithTrips,
 )
@@ -28,9 +29,24 @@ def get_db():
 def add_customer(data: CustomerCreate, db: Session = Depends(get_db)):
     return create_customer(db, data.name, data.phone, data.email)
 
-@router.get("", response_model=list[CustomerResponse])
-def list_customers(db: Session = Depends(get_db)):
-    return get_customers(db)
+@router.get("", response_model=list[CustomerListItem])
+def list_customers(
+    response: Response,
+    q: str | None = Query(None, description="Search name, phone or email"),
+    match: str = Query("substring", regex="^(prefix|substring)$"),
+    invoice: str | None = Query(None, description="Customers with a matching invoice number"),
+    sort: str = Query(
+        "name",
+        regex="^(name|total_billed|pending_balance|trip_count|last_trip_date)$",
+    ),
+    limit: int | None = Query(None, ge=1, le=500),
+    cursor: str | None = Query(None, description="X-Next-Cursor from the previous page"),
+    db: Session = Depends(get_db),
+):
+    customers, next_cursor = get_customers(db, q, match, invoice, sort, limit, cursor)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return customers
 
 @router.get("/{customer_id}", response_model=CustomerResponse)
 def customer_details(customer_id: int, db: Session = Depends(get_db)):
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List
 from app.database.session import SessionLocal
+from app.schemas.bulk import BulkResult
 from app.schemas.driver_expense import DriverExpenseCreate, DriverExpenseUpdate, DriverExpenseResponse
 from app.services.driver_expense_service import DriverExpenseService
 
@@ -25,6 +26,11 @@ def create_expense(expense: DriverExpenseCreate, db: Session = Depends(get_db)):
     service = DriverExpenseService(db)
     return service.create_expense(expense)
 
+@router.post("/bulk", response_model=BulkResult)
+def create_expenses_bulk(expenses: List[DriverExpenseCreate], db: Session = Depends(get_db)):
+    service = DriverExpenseService(db)
+    return service.create_expenses_bulk(expenses)
+
 @router.get("/trip/{trip_id}", response_model=List[DriverExpenseResponse])
 def get_expenses_by_trip(trip_id: int, db: Session = Depends(get_db)):
     service = DriverExpenseService(db)
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from app.database.session import SessionLocal
-from app.schemas.driver import DriverCreate, DriverResponse
+from app.schemas.driver import DriverCreate, DriverResponse, DriverOverview
 from app.services.driver_service import create_driver, get_drivers
+from app.services.driver_stats_service import driver_overview
 from app.models.driver import Driver
 
 router = APIRouter(
@@ -41,3 +42,20 @@ def get_driver(driver_id: int, db: Session = Depends(get_db)):
     if not driver:
         raise HTTPException(status_code=404, detail="Driver not found")
     return driver
+
+
+@router.get("/{driver_id}/overview", response_model=DriverOverview)
+def get_driver_overview(
+    driver_id: int,
+    month: str | None = Query(
+        default=None,
+        regex=r"^\d{4}-\d{2}$",
+        description="Format: YYYY-MM"
+    ),
+    recent: int = Query(5, ge=1, le=50, description="Number of recent salary payments"),
+    db: Session = Depends(get_db),
+):
+    overview = driver_overview(db, driver_id, month, recent)
+    if not overview:
+        raise HTTPException(status_code=404, detail="Driver not found")
+    return overview
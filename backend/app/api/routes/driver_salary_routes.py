@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.database.session import SessionLocal
+from app.schemas.bulk import BulkResult
 from app.schemas.driver_salary import DriverSalaryCreate, DriverSalaryResponse
 from app.services.driver_salary_service import (
     list_salaries_by_driver,
     create_salary,
+    create_salaries_bulk,
     delete_salary,
 )
 
@@ -29,6 +31,11 @@ def add_salary(data: DriverSalaryCreate, db: Session = Depends(get_db)):
     return create_salary(db, data)
 
 
+@router.post("/bulk", response_model=BulkResult)
+def add_salaries_bulk(items: list[DriverSalaryCreate], db: Session = Depends(get_db)):
+    return create_salaries_bulk(db, items)
+
+
 @router.delete("/{salary_id}")
 def remove_salary(salary_id: int, db: Session = Depends(get_db)):
     deleted = delete_salary(db, salary_id)
@@ -0,0 +1,34 @@
+from datetime import date
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.services.export_service import EXPORTS, MEDIA_TYPES, export_select, stream_export
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+FORMAT_PATTERN = "^(ndjson|csv)$"
+
+
+def _select(entity: str, date_from: date | None, date_to: date | None, vehicle: str | None):
+    if entity not in EXPORTS:
+        raise HTTPException(status_code=404, detail=f"Unknown export: {entity}")
+    return export_select(entity, date_from, date_to, vehicle)
+
+
+# No get_db here: the stream outlives the request's dependencies and
+# opens its own session
+@router.get("/{entity}")
+def export_entity(
+    entity: str,
+    format: str = Query("ndjson", regex=FORMAT_PATTERN),
+    date_from: date | None = Query(None, alias="from"),
+    date_to: date | None = Query(None, alias="to"),
+    vehicle: str | None = Query(None),
+):
+    stmt = _select(entity, date_from, date_to, vehicle)
+    return StreamingResponse(
+        stream_export(stmt, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{entity}.{format}"'},
+    )
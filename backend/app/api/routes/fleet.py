@@ -0,0 +1,34 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.database.session import SessionLocal
+from app.schemas.fleet import FleetCalendar
+from app.services.fleet_service import fleet_calendar
+from app.utils.dates import month_bounds
+
+router = APIRouter(prefix="/fleet", tags=["Fleet"])
+
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@router.get("/calendar", response_model=FleetCalendar, response_model_by_alias=True)
+def get_fleet_calendar(
+    month: str | None = Query(None, regex=r"^\d{4}-\d{2}$", description="Format: YYYY-MM"),
+    year: int | None = Query(None, ge=2000, le=2100, description="Whole year"),
+    db: Session = Depends(get_db),
+):
+    if bool(month) == bool(year):
+        raise HTTPException(status_code=400, detail="Pass either month or year")
+    if month:
+        start, end = month_bounds(month)
+    else:
+        start, end = date(year, 1, 1), date(year, 12, 31)
+    return fleet_calendar(db, start, end)
@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app.database.session import SessionLocal
-from app.schemas.fuel import FuelCreate, FuelResponse
-from app.services.fuel_service import add_fuel, fuel_history_by_vehicle, get_all_fuel, get_fuel_by_id, update_fuel
+from app.schemas.bulk import BulkResult
+from app.schemas.fuel import FuelCreate, FuelResponse, FuelEfficiencyResponse
+from app.services.fuel_service import add_fuel, add_fuel_bulk, fuel_history_by_vehicle, get_all_fuel, get_fuel_by_id, update_fuel
+from app.services.fuel_efficiency_service import fuel_efficiency
 from app.models.fuel import Fuel
 
 router = APIRouter(prefix="/fuel", tags=["Fuel"])
@@ -19,6 +23,10 @@ def get_db():
 def create_fuel(data: FuelCreate, db: Session = Depends(get_db)):
     return add_fuel(db, data)
 
+@router.post("/bulk", response_model=BulkResult)
+def create_fuel_bulk(items: list[FuelCreate], db: Session = Depends(get_db)):
+    return add_fuel_bulk(db, items)
+
 @router.get("/vehicle/{vehicle_number}", response_model=list[FuelResponse])
 def fuel_history(vehicle_number: str, db: Session = Depends(get_db)):
     return fuel_history_by_vehicle(db, vehicle_number)
@@ -29,6 +37,18 @@ def all_fuel(db: Session = Depends(get_db)):
     return get_all_fuel(db)
 
 
+@router.get("/efficiency", response_model=FuelEfficiencyResponse, response_model_by_alias=True)
+def get_fuel_efficiency(
+    date_from: date | None = Query(None, alias="from"),
+    date_to: date | None = Query(None, alias="to"),
+    vehicle: str | None = Query(None, description="Only this vehicle; percentiles stay fleet-wide"),
+    db: Session = Depends(get_db),
+):
+    if date_from and date_to and date_to < date_from:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    return fuel_efficiency(db, date_from, date_to, vehicle)
+
+
 
 @router.delete("/{fuel_id}")
 def delete_fuel(
@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.orm import Session
+
+from app.database.session import SessionLocal
+from app.schemas.invoice import InvoiceBatchRequest
+from app.services.invoice_render_service import render_invoice_batch
+
+router = APIRouter(prefix="/invoices", tags=["Invoices"])
+
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@router.post("/render-batch")
+def render_batch(
+    data: InvoiceBatchRequest | None = None,
+    month: str | None = Query(None, regex=r"^\d{4}-\d{2}$", description="Format: YYYY-MM"),
+    format: str = Query("html", regex="^(html|pdf)$"),
+    db: Session = Depends(get_db),
+):
+    archive, stats = render_invoice_batch(db, month, data.trip_ids if data else None, format)
+    name = f"invoices-{month}" if month else "invoices"
+    return Response(
+        content=archive,
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f'attachment; filename="{name}.zip"',
+            "X-Invoices-Rendered": str(stats["rendered"]),
+            "X-Invoices-Cached": str(stats["cached"]),
+        },
+    )
+
@@ -6,7 +6,8 @@ from app.schemas.maintenance import (
     MaintenanceCreate,
     MaintenanceResponse,
     MaintenanceUpdate,
-    MaintenanceType
+    MaintenanceType,
+    UpcomingMaintenance
 )
 from app.services.maintenance_service import (
     add_maintenance,
@@ -15,7 +16,8 @@ from app.services.maintenance_service import (
     get_maintenance_by_id,
     update_maintenance,
     delete_maintenance,
-    calculate_monthly_maintenance_cost
+    calculate_monthly_maintenance_cost,
+    upcoming_maintenance
 )
 
 router = APIRouter(
@@ -46,6 +48,16 @@ def list_maintenance(
     return get_all_maintenance(db, maintenance_type)
 
 
+# ---------------- UPCOMING RENEWALS (FLEET) ----------------
+@router.get("/upcoming", response_model=list[UpcomingMaintenance])
+def list_upcoming_maintenance(
+    within_days: int = Query(30, ge=0, le=366),
+    maintenance_type: MaintenanceType = Query(None),
+    db: Session = Depends(get_db)
+):
+    return upcoming_maintenance(db, within_days, maintenance_type)
+
+
 # ---------------- GET MAINTENANCE BY VEHICLE ----------------
 @router.get("/vehicle/{vehicle_number}", response_model=list[MaintenanceResponse])
 def maintenance_history(
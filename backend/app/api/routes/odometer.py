@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.database.session import SessionLocal
+from app.schemas.odometer import OdometerFindingResponse, VehicleOdometerSummary, OdometerAuditResult
+from app.services.auth_service import require_admin
+from app.services.odometer_service import run_odometer_audit, odometer_summary, vehicle_findings
+
+router = APIRouter(prefix="/odometer", tags=["Odometer"])
+
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@router.post("/audit", response_model=OdometerAuditResult, dependencies=[Depends(require_admin)])
+def audit_odometer(db: Session = Depends(get_db)):
+    return run_odometer_audit(db)
+
+
+@router.get("/vehicles", response_model=list[VehicleOdometerSummary])
+def get_odometer_summary(db: Session = Depends(get_db)):
+    return odometer_summary(db)
+
+
+@router.get("/vehicles/{vehicle_number}", response_model=list[OdometerFindingResponse])
+def get_vehicle_findings(
+    vehicle_number: str,
+    kind: str | None = Query(None, regex="^(gap|overlap|reversed|distance_mismatch)$"),
+    db: Session = Depends(get_db),
+):
+    return vehicle_findings(db, vehicle_number, kind)
@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.database.session import SessionLocal
+from app.schemas.payroll import PayrollRunSummary, PayrollRunResponse
+from app.services.payroll_service import (
+    run_payroll,
+    year_months,
+    list_payroll_runs,
+    get_payroll_run,
+)
+
+router = APIRouter(prefix="/payroll", tags=["Payroll"])
+
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@router.post("/runs", response_model=list[PayrollRunSummary])
+def create_payroll_runs(
+    month: str | None = Query(None, regex=r"^\d{4}-\d{2}$", description="Format: YYYY-MM"),
+    year: int | None = Query(None, ge=2000, le=2100, description="Run all 12 months"),
+    db: Session = Depends(get_db),
+):
+    if bool(month) == bool(year):
+        raise HTTPException(status_code=400, detail="Pass either month or year")
+    months = [month] if month else year_months(year)
+    return run_payroll(db, months)
+
+
+@router.get("/runs", response_model=list[PayrollRunSummary])
+def get_payroll_runs(db: Session = Depends(get_db)):
+    return list_payroll_runs(db)
+
+
+@router.get("/runs/{month}", response_model=PayrollRunResponse)
+def get_payroll_run_details(month: str, db: Session = Depends(get_db)):
+    run = get_payroll_run(db, month)
+    if not run:
+        raise HTTPException(status_code=404, detail="Payroll run not found")
+    return run
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.database.session import SessionLocal
+from app.schemas.quote import QuoteRequest, QuoteResponse
+from app.services.quote_service import quote_trip
+
+router = APIRouter(prefix="/quotes", tags=["Quotes"])
+
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@router.post("", response_model=QuoteResponse)
+def create_quote(data: QuoteRequest, db: Session = Depends(get_db)):
+    return quote_trip(db, data)
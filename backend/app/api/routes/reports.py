@@ -0,0 +1,86 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+
+from app.database.session import SessionLocal
+from app.schemas.report import ReportQuery, ReportResult, ReportJobCreate, ReportJobResponse
+from app.services.report_service import run_report
+from app.services.report_job_service import (
+    submit_report_job,
+    list_report_jobs,
+    get_report_job,
+    delete_report_job,
+)
+
+router = APIRouter(prefix="/reports", tags=["Reports"])
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@router.post("/query", response_model=ReportResult)
+def query_report(query: ReportQuery, db: Session = Depends(get_db)):
+    filters = query.filters
+    return run_report(
+        db,
+        query.dimensions,
+        query.metrics,
+        date_from=filters.from_,
+        date_to=filters.to,
+        filters=filters.model_dump(exclude={"from_", "to"}),
+        sort=query.sort,
+        limit=query.limit,
+    )
+
+
+# ===============================
+# BACKGROUND JOBS
+# ===============================
+
+@router.post("/jobs", response_model=ReportJobResponse)
+def create_report_job(data: ReportJobCreate, db: Session = Depends(get_db)):
+    return submit_report_job(db, data.report, data.format, data.from_, data.to, data.vehicle_number)
+
+
+@router.get("/jobs", response_model=list[ReportJobResponse])
+def get_report_jobs(limit: int = Query(50, ge=1, le=200), db: Session = Depends(get_db)):
+    return list_report_jobs(db, limit)
+
+
+@router.get("/jobs/{job_id}", response_model=ReportJobResponse)
+def get_report_job_status(job_id: int, db: Session = Depends(get_db)):
+    job = get_report_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Report job not found")
+    return job
+
+
+@router.get("/jobs/{job_id}/download")
+def download_report(job_id: int, db: Session = Depends(get_db)):
+    job = get_report_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Report job not found")
+    if job.status != "done":
+        raise HTTPException(status_code=409, detail=f"Report is {job.status}")
+    return FileResponse(
+        job.file_path,
+        media_type=MEDIA_TYPES[job.format],
+        filename=f"{job.report}-{job.id}.{job.format}",
+    )
+
+
+@router.delete("/jobs/{job_id}")
+def remove_report_job(job_id: int, db: Session = Depends(get_db)):
+    if not delete_report_job(db, job_id):
+        raise HTTPException(status_code=404, detail="Report job not found")
+    return {"message": "Report job deleted"}
@@ -0,0 +1,49 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.database.session import SessionLocal
+from app.schemas.location import LocationMerge, LocationMergeResult, LocationMergeSuggestion, RouteStats
+from app.services.location_service import MERGE_SIMILARITY, location_merge_suggestions, merge_locations
+from app.services.quote_service import invalidate_quote_index
+from app.services.route_stats_service import route_stats
+
+router = APIRouter(prefix="/routes", tags=["Routes"])
+
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@router.get("/stats", response_model=list[RouteStats])
+def get_route_stats(
+    date_from: date | None = Query(None, alias="from"),
+    date_to: date | None = Query(None, alias="to"),
+    vehicle: str | None = Query(None),
+    min_trips: int = Query(1, ge=1),
+    sort: str = Query("trips", regex="^(trips|median_distance_km|revenue_per_km|avg_toll|revenue)$"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+):
+    return route_stats(db, date_from, date_to, vehicle, min_trips, sort, limit)
+
+
+@router.get("/locations/merge-suggestions", response_model=list[LocationMergeSuggestion])
+def get_merge_suggestions(
+    min_similarity: float = Query(MERGE_SIMILARITY, ge=0.5, le=1.0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+):
+    return location_merge_suggestions(db, min_similarity, limit)
+
+
+@router.post("/locations/merge", response_model=LocationMergeResult)
+def merge_location(data: LocationMerge, db: Session = Depends(get_db)):
+    result = merge_locations(db, data.source_id, data.target_id)
+    invalidate_quote_index()
+    return result
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.database.session import SessionLocal
+from app.schemas.search import SearchResult, SearchIndexRebuild
+from app.services.auth_service import require_admin
+from app.services.search_service import search, rebuild_search_index
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@router.get("", response_model=list[SearchResult])
+def global_search(
+    q: str = Query(..., min_length=1, max_length=200),
+    types: list[str] | None = Query(None, description="trip, customer, driver, vehicle, vendor"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    return search(db, q, types, limit)
+
+
+@router.post("/rebuild", response_model=SearchIndexRebuild, dependencies=[Depends(require_admin)])
+def rebuild_index(db: Session = Depends(get_db)):
+    return {"entries": rebuild_search_index(db)}
@@ -1,18 +1,21 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from app.models.spare_part import SparePart
 from fastapi import HTTPException
 
 
 from app.database.session import SessionLocal
-from app.schemas.spare_part import SparePartCreate, SparePartResponse
+from app.schemas.bulk import BulkResult
+from app.schemas.spare_part import ReplacementIntervalsResponse, SparePartCreate, SparePartResponse
 from app.services.spare_part_service import (
     add_spare_part,
+    add_spare_parts_bulk,
     get_all_spare_parts,
     spare_parts_by_vehicle,
     update_spare_part,
     delete_spare_part
 )
+from app.services.spare_part_stats_service import replacement_intervals
 
 router = APIRouter(prefix="/spare-parts", tags=["Spare Parts"])
 
@@ -30,6 +33,11 @@ def create_spare(data: SparePartCreate, db: Session = Depends(get_db)):
     return add_spare_part(db, data)
 
 
+@router.post("/bulk", response_model=BulkResult)
+def create_spares_bulk(items: list[SparePartCreate], db: Session = Depends(get_db)):
+    return add_spare_parts_bulk(db, items)
+
+
 @router.get("/vehicle/{vehicle_number}", response_model=list[SparePartResponse])
 def get_spares(vehicle_number: str, db: Session = Depends(get_db)):
     return spare_parts_by_vehicle(db, vehicle_number)
@@ -49,6 +57,15 @@ def remove_spare(spare_id: int, db: Session = Depends(get_db)):
 def all_spare_parts(db: Session = Depends(get_db)):
     return get_all_spare_parts(db)
 
+@router.get("/intervals", response_model=ReplacementIntervalsResponse)
+def get_replacement_intervals(
+    part: str | None = Query(None),
+    vehicle: str | None = Query(None, description="Only this vehicle; percentiles stay fleet-wide"),
+    db: Session = Depends(get_db),
+):
+    return replacement_intervals(db, part, vehicle)
+
+
 @router.get("/{spare_id}", response_model=SparePartResponse)
 def get_spare_part(spare_id: int, db: Session = Depends(get_db)):
     spare = db.query(SparePart).filter(SparePart.id == spare_id).first()
@@ -1,16 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 from app.database.session import SessionLocal
 from app.models.trip import Trip
-from app.schemas.trip import TripCreate, TripResponse, TripUpdate
+from app.schemas.trip import TripCreate, TripResponse, TripUpdate, TripProfitability
+from app.schemas.trip_document import TripDocument
 from app.services.trip_service import (
     create_trip,
     get_trips_by_vehicle,
     get_trips_by_driver,
+    get_trip_document,
     update_trip,
     delete_trip
 )
+from app.services.trip_stats_service import trip_profitability
+from app.services.invoice_number_service import get_trip_by_invoice
 
 router = APIRouter(
     prefix="/trips",
@@ -45,6 +51,36 @@ def trips_by_vehicle(vehicle_number: str, db: Session = Depends(get_db)):
 def trips_by_driver(driver_id: int, db: Session = Depends(get_db)):
     return get_trips_by_driver(db, driver_id)
 
+# ---------------- PROFITABILITY ----------------
+@router.get("/profitability", response_model=list[TripProfitability])
+def get_trip_profitability(
+    response: Response,
+    date_from: date | None = Query(None, alias="from"),
+    date_to: date | None = Query(None, alias="to"),
+    vehicle: str | None = Query(None),
+    driver_id: int | None = Query(None),
+    customer_id: int | None = Query(None),
+    loss_only: bool = Query(False, description="Only trips with a negative margin"),
+    sort: str = Query("margin", regex="^(margin|revenue|driver_expenses|trip_date)$"),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = Query(None, description="X-Next-Cursor from the previous page"),
+    db: Session = Depends(get_db),
+):
+    rows, next_cursor = trip_profitability(
+        db, date_from, date_to, vehicle, driver_id, customer_id, loss_only, sort, limit, cursor
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return rows
+
+# ---------------- GET TRIP BY INVOICE NUMBER ----------------
+@router.get("/by-invoice/{invoice_number:path}", response_model=TripResponse)
+def trip_by_invoice(invoice_number: str, db: Session = Depends(get_db)):
+    trip = get_trip_by_invoice(db, invoice_number)
+    if not trip:
+        raise HTTPException(status_code=404, detail="Trip not found")
+    return trip
+
 # ---------------- GET SINGLE TRIP ----------------
 @router.get("/{trip_id}", response_model=TripResponse)
 def get_trip(trip_id: int, db: Session = Depends(get_db)):
@@ -53,6 +89,14 @@ def get_trip(trip_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Trip not found")
     return trip
 
+# ---------------- TRIP DOCUMENT (DETAILS / INVOICE) ----------------
+@router.get("/{trip_id}/document", response_model=TripDocument)
+def get_trip_with_details(trip_id: int, db: Session = Depends(get_db)):
+    trip = get_trip_document(db, trip_id)
+    if not trip:
+        raise HTTPException(status_code=404, detail="Trip not found")
+    return trip
+
 # ---------------- UPDATE TRIP ----------------
 @router.put("/{trip_id}", response_model=TripResponse)
 def edit_trip(trip_id: int, trip: TripUpdate, db: Session = Depends(get_db)):
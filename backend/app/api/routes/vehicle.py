@@ -1,9 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 from app.database.session import SessionLocal
 from app.models.vehicle import Vehicle
-from app.schemas.vehicle import VehicleCreate, VehicleResponse
+from app.schemas.vehicle import TimelineEvent, VehicleCreate, VehicleResponse, VehicleUpdate
 from app.services.vehicle_service import (
     create_vehicle,
     get_all_vehicles,
@@ -11,7 +11,9 @@ from app.services.vehicle_service import (
     soft_delete_vehicle
 )
 
+from app.services.quote_service import refresh_vehicle_routes
 from app.services.vehicle_stats_service import vehicle_summary
+from app.services.vehicle_timeline_service import vehicle_timeline
 
 router = APIRouter(
     prefix="/vehicles",
@@ -54,6 +56,21 @@ def get_vehicle_summary(vehicle_number: str, db: Session = Depends(get_db)):
     return vehicle_summary(db, vehicle_number)
 
 
+@router.get("/{vehicle_number}/timeline", response_model=list[TimelineEvent])
+def get_vehicle_timeline(
+    vehicle_number: str,
+    response: Response,
+    types: list[str] | None = Query(None, description="trip, fuel, spare_part, maintenance, note"),
+    limit: int = Query(50, ge=1, le=200),
+    before: str | None = Query(None, description="X-Next-Cursor from the previous page"),
+    db: Session = Depends(get_db),
+):
+    events, next_cursor = vehicle_timeline(db, vehicle_number, types, limit, before)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return events
+
+
 @router.delete("/{vehicle_id}")
 def remove_vehicle(vehicle_id: int, db: Session = Depends(get_db)):
     return soft_delete_vehicle(db, vehicle_id)
@@ -63,6 +80,7 @@ def remove_vehicle(vehicle_id: int, db: Session = Depends(get_db)):
 @router.put("/{vehicle_number}", response_model=VehicleResponse)
 def update_vehicle(
     vehicle_number: str,
+    data: VehicleUpdate,
     db: Session = Depends(get_db),
 ):
     vehicle = db.query(Vehicle).filter(
@@ -72,6 +90,11 @@ def update_vehicle(
     if not vehicle:
         raise HTTPException(status_code=404, detail="Vehicle not found")
 
+    vehicle_class = (data.vehicle_class or "").strip() or None
+    changed = vehicle_class != vehicle.vehicle_class
+    vehicle.vehicle_class = vehicle_class
     db.commit()
+    if changed:
+        refresh_vehicle_routes(db, vehicle.vehicle_number)
     db.refresh(vehicle)
     return vehicle
@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 from app.database.session import SessionLocal
-from app.schemas.vendor import VendorCreate, VendorResponse
+from app.schemas.vendor import VendorCreate, VendorResponse, VendorSummary, VendorLedgerEntry
 from app.services.vendor_service import add_vendor, list_vendors
-from app.services.vendor_stats_service import vendor_summary
+from app.services.vendor_stats_service import (
+    LEDGER_PAGE_SIZE,
+    vendor_summary,
+    vendor_summaries,
+    vendor_ledger,
+)
 
 router = APIRouter(prefix="/vendors", tags=["Vendors"])
 
@@ -27,7 +32,29 @@ def get_vendors(category: str | None = Query(None), db: Session = Depends(get_db
     return list_vendors(db, category)
 
 
+@router.get("/summary", response_model=list[VendorSummary])
+def get_vendor_summaries(db: Session = Depends(get_db)):
+    return vendor_summaries(db)
+
+
 @router.get("/{vendor_id}/summary")
 def get_vendor_summary(vendor_id: int, db: Session = Depends(get_db)):
     summary = vendor_summary(db, vendor_id)
     return summary or {"error": "Vendor not found"}
+
+
+@router.get("/{vendor_id}/ledger", response_model=list[VendorLedgerEntry])
+def get_vendor_ledger(
+    vendor_id: int,
+    response: Response,
+    limit: int = Query(LEDGER_PAGE_SIZE, ge=1, le=500),
+    cursor: str | None = Query(None, description="X-Next-Cursor from the previous page"),
+    db: Session = Depends(get_db),
+):
+    result = vendor_ledger(db, vendor_id, limit, cursor)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Vendor not found")
+    entries, next_cursor = result
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return entries
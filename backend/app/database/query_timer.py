@@ -0,0 +1,37 @@
+"""
+One timer around every SQL statement, shared by the metrics and the
+slow-query log.
+
+The start time lives on the statement's execution context, which is
+dropped with it: a statement that raises (after_cursor_execute never
+fires) leaves nothing behind on the pooled connection.
+"""
+import time
+
+from sqlalchemy import event
+
+# Called as listener(conn, statement, parameters, executemany, seconds)
+_listeners = []
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    seconds = time.perf_counter() - started
+    for listener in _listeners:
+        listener(conn, statement, parameters, executemany, seconds)
+
+
+def on_statement(engine, listener):
+    """Call `listener` with the duration of every statement `engine` runs"""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    if listener not in _listeners:
+        _listeners.append(listener)
@@ -1,4 +1,4 @@
-from fastapi import FastAPI,Depends
+from fastapi import FastAPI,Depends, Header, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import inspect, text
 
@@ -21,6 +21,18 @@ from app.api.routes.vendor_payment_routes import router as vendor_payment_router
 from app.api.routes.driver_expense import router as driver_expense_router
 from app.api.routes.payment import router as payment_router
 from app.api.routes.driver_salary_routes import router as driver_salary_router
+from app.api.routes.payroll_routes import router as payroll_router
+from app.api.routes.availability import router as availability_router
+from app.api.routes.fleet import router as fleet_router
+from app.api.routes.anomalies import router as anomalies_router
+from app.api.routes.odometer import router as odometer_router
+from app.api.routes.reports import router as reports_router
+from app.api.routes.export import router as export_router
+from app.api.routes.invoices import router as invoices_router
+from app.api.routes.search import router as search_router
+from app.api.routes.route_stats import router as route_stats_router
+from app.api.routes.quotes import router as quotes_router
+from app.api.routes.admin import router as admin_router
 from app.api.routes.auth import router as auth_router
 from app.services.auth_service import get_current_user
 
@@ -31,12 +43,43 @@ from app.models import user  # noqa: F401
 from app.models import trip_pricing_item  # noqa: F401
 from app.models import trip_driver_change  # noqa: F401
 from app.models import dashboard_note  # noqa: F401
+from app.models import payroll_run  # noqa: F401
+from app.models import payroll_line  # noqa: F401
+from app.models import anomaly  # noqa: F401
+from app.models import odometer_finding  # noqa: F401
+from app.models import data_version  # noqa: F401
+from app.models import report_job  # noqa: F401
+from app.models import invoice_counter  # noqa: F401
+from app.models import search_entry  # noqa: F401
+from app.models import location  # noqa: F401
 
 app = FastAPI(
     title="Tour & Travel Management API",
     version="1.0.0",
 )
 
+# ===============================
+# Metrics (Prometheus)
+# ===============================
+from app.services.metrics_service import (
+    PrometheusMiddleware,
+    METRICS_TOKEN,
+    metrics_available,
+    register_metrics_listeners,
+    render_metrics,
+)
+
+if metrics_available():
+    register_metrics_listeners(engine)
+    app.add_middleware(PrometheusMiddleware)
+
+# ===============================
+# Slow Query Log
+# ===============================
+from app.services.slow_query_service import register_slow_query_listeners
+
+register_slow_query_listeners(engine)
+
 # ===============================
 # CORS CONFIG (React Frontend)
 # ===============================
@@ -51,32 +94,88 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Invoices-Rendered", "X-Invoices-Cached"],
 )
 
 # ===============================
 # Create DB Tables
 # ===============================
+if engine.dialect.name == "postgresql":
+    # Trigram search indexes need pg_trgm before the tables are created
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
 Base.metadata.create_all(bind=engine)
 
 
 def ensure_schema_updates():
     inspector = inspect(engine)
-    existing_tables = set(inspector.get_table_names())
-    if "maintenance" not in existing_tables:
-        return
 
-    maintenance_columns = {col["name"] for col in inspector.get_columns("maintenance")}
-    if "end_date" not in maintenance_columns:
+    # Nullable columns added to models after their tables were created
+    # (e.g. maintenance.end_date)
+    for table in Base.metadata.sorted_tables:
+        current_columns = {col["name"] for col in inspector.get_columns(table.name)}
+        missing = [col for col in table.columns if col.name not in current_columns]
+        if not missing:
+            continue
         with engine.begin() as conn:
-            conn.execute(text("ALTER TABLE maintenance ADD COLUMN end_date DATETIME"))
+            for column in missing:
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=engine.dialect)}"
+                for fk in column.foreign_keys:
+                    ddl += f" REFERENCES {fk.column.table.name} ({fk.column.name})"
+                conn.execute(text(ddl))
+
+    # create_all only indexes new tables; add indexes declared since then
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
 
 
 ensure_schema_updates()
 
 # ===============================
-# Create Default Users
+# Data Versions (report cache keys)
 # ===============================
 from sqlalchemy.orm import Session
+from app.services.data_version_service import register_data_version_listeners, seed_data_versions
+
+register_data_version_listeners()
+
+def create_data_versions():
+    db = Session(bind=engine)
+    try:
+        seed_data_versions(db)
+    finally:
+        db.close()
+
+create_data_versions()
+
+# ===============================
+# Search Index
+# ===============================
+from app.services.search_service import (
+    register_search_listeners,
+    ensure_search_backend,
+    backfill_search_index,
+)
+
+register_search_listeners()
+ensure_search_backend(engine)
+
+# Before the backfills below: their writes are synced into the index
+def create_search_index():
+    db = Session(bind=engine)
+    try:
+        backfill_search_index(db)
+    finally:
+        db.close()
+
+create_search_index()
+
+# ===============================
+# Create Default Users
+# ===============================
 from sqlalchemy.exc import IntegrityError
 from app.models.user import User
 
@@ -107,6 +206,66 @@ def create_default_users():
 
 create_default_users()
 
+# ===============================
+# Backfill Trip Booking Windows
+# ===============================
+from app.services.booking_service import backfill_busy_windows
+
+def backfill_booking_windows():
+    db = Session(bind=engine)
+    try:
+        backfill_busy_windows(db)
+    finally:
+        db.close()
+
+backfill_booking_windows()
+
+# ===============================
+# Link Vendor Names To Vendor Ids
+# ===============================
+from app.services.vendor_service import link_vendor_ids
+
+def backfill_vendor_ids():
+    db = Session(bind=engine)
+    try:
+        link_vendor_ids(db)
+        db.commit()
+    finally:
+        db.close()
+
+backfill_vendor_ids()
+
+# ===============================
+# Intern Trip Locations
+# ===============================
+from app.services.location_service import backfill_trip_locations
+
+def backfill_locations():
+    db = Session(bind=engine)
+    try:
+        backfill_trip_locations(db)
+        db.commit()
+    finally:
+        db.close()
+
+backfill_locations()
+
+# ===============================
+# Quote Index
+# ===============================
+# Built off the startup path; a quote arriving first builds it itself
+import threading
+from app.services.quote_service import build_quote_index
+
+def warm_quote_index():
+    db = Session(bind=engine)
+    try:
+        build_quote_index(db)
+    finally:
+        db.close()
+
+threading.Thread(target=warm_quote_index, name="quote-index", daemon=True).start()
+
 # ===============================
 # Register Routers (NO /api HERE)
 # ===============================
@@ -132,6 +291,18 @@ app.include_router(vendor_router, prefix="/api", dependencies=auth_dependency)
 app.include_router(vendor_payment_router, prefix="/api", dependencies=auth_dependency)
 app.include_router(driver_expense_router, prefix="/api", dependencies=auth_dependency)
 app.include_router(driver_salary_router, prefix="/api", dependencies=auth_dependency)
+app.include_router(payroll_router, prefix="/api", dependencies=auth_dependency)
+app.include_router(availability_router, prefix="/api", dependencies=auth_dependency)
+app.include_router(fleet_router, prefix="/api", dependencies=auth_dependency)
+app.include_router(anomalies_router, prefix="/api", dependencies=auth_dependency)
+app.include_router(odometer_router, prefix="/api", dependencies=auth_dependency)
+app.include_router(reports_router, prefix="/api", dependencies=auth_dependency)
+app.include_router(export_router, prefix="/api", dependencies=auth_dependency)
+app.include_router(invoices_router, prefix="/api", dependencies=auth_dependency)
+app.include_router(search_router, prefix="/api", dependencies=auth_dependency)
+app.include_router(route_stats_router, prefix="/api", dependencies=auth_dependency)
+app.include_router(quotes_router, prefix="/api", dependencies=auth_dependency)
+app.include_router(admin_router, prefix="/api", dependencies=auth_dependency)
 
 # ===============================
 # Health Check
@@ -140,6 +311,18 @@ app.include_router(driver_salary_router, prefix="/api", dependencies=auth_depend
 def health():
     return {"status": "ok"}
 
+# ===============================
+# Metrics
+# ===============================
+@app.get("/metrics", include_in_schema=False)
+def metrics(authorization: str | None = Header(None)):
+    if not metrics_available():
+        raise HTTPException(status_code=503, detail="Metrics need prometheus-client installed")
+    if METRICS_TOKEN and authorization != f"Bearer {METRICS_TOKEN}":
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
 # ===============================
 # Root
 # ===============================
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from app.database.base import Base
+
+
+class Anomaly(Base):
+    __tablename__ = "anomalies"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Flagged row: fuel / trip / driver_expense + its id
+    source = Column(String(20), nullable=False)
+    source_id = Column(Integer, nullable=False)
+    rule = Column(String(40), nullable=False)  # e.g. rate_outlier, repeat_fill_same_day
+    field = Column(String(40), nullable=False)
+
+    vehicle_number = Column(String, index=True)
+    driver_id = Column(Integer, index=True)
+    entry_date = Column(Date, index=True)
+
+    value = Column(Float)
+    expected = Column(Float)  # group median / limit the value was compared with
+    score = Column(Float)  # robust z-score, or count for repeat rules
+
+    detected_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("source", "source_id", "rule", name="uq_anomalies_source_rule"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float
+from sqlalchemy import Column, Integer, String, Float, Index
 from app.database.base import Base
 
 class Customer(Base):
@@ -12,3 +12,19 @@ class Customer(Base):
     total_trips = Column(Integer, default=0)
     total_billed = Column(Float, default=0)
     pending_balance = Column(Float, default=0)
+
+    __table_args__ = (
+        # Trigram indexes back substring/prefix search on Postgres (pg_trgm)
+        Index(
+            "ix_customers_name_trgm", "name",
+            postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_customers_phone_trgm", "phone",
+            postgresql_using="gin", postgresql_ops={"phone": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_customers_email_trgm", "email",
+            postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"},
+        ),
+    )
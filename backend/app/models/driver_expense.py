@@ -6,11 +6,11 @@ class DriverExpense(Base):
     __tablename__ = "driver_expenses"
 
     id = Column(Integer, primary_key=True, index=True)
-    trip_id = Column(Integer, ForeignKey("trips.id"), nullable=False)
-    driver_id = Column(Integer, ForeignKey("drivers.id"), nullable=False)
+    trip_id = Column(Integer, ForeignKey("trips.id"), nullable=False, index=True)
+    driver_id = Column(Integer, ForeignKey("drivers.id"), nullable=False, index=True)
     description = Column(String, nullable=False)  # e.g., "Police fine", "Road tax", "Toll"
     amount = Column(Float, nullable=False)
     notes = Column(Text)
     
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
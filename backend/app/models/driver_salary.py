@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, ForeignKey, Date, Text, DateTime
+from sqlalchemy import Column, Integer, Float, ForeignKey, Date, Text, DateTime, Index
 from sqlalchemy.sql import func
 from app.database.base import Base
 
@@ -14,3 +14,7 @@ class DriverSalary(Base):
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_driver_salaries_driver_paid_on", "driver_id", "paid_on"),
+    )
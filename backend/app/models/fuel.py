@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, String, Date, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, Float, String, Date, ForeignKey, DateTime, Index
 from sqlalchemy.sql import func
 from app.database.base import Base
 
@@ -14,7 +14,12 @@ class Fuel(Base):
     total_cost = Column(Float, nullable=False)
 
     vendor = Column(String)
+    vendor_id = Column(Integer, ForeignKey("vendors.id"), nullable=True, index=True)
 
     filled_date = Column(Date, nullable=False)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_fuel_entries_vehicle_filled", "vehicle_number", "filled_date"),
+    )
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.database.base import Base
+
+
+class InvoiceCounter(Base):
+    """Last invoice number issued per series and financial year"""
+    __tablename__ = "invoice_counters"
+
+    series = Column(String(10), primary_key=True)
+    fiscal_year = Column(String(7), primary_key=True)  # e.g. "2025-26"
+    last_value = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
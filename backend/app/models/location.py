@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.database.base import Base
+
+
+class Location(Base):
+    """
+    Place name dictionary for trip from / to. `key` is the normalized
+    spelling ("pune " and "Pune" share one row); a location merged into
+    another keeps its row so its spellings still resolve to the target.
+    """
+    __tablename__ = "locations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+    key = Column(String, nullable=False, unique=True)
+    merged_into_id = Column(Integer, ForeignKey("locations.id"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Float, Enum, Index
 from sqlalchemy.sql import func
 from app.database.base import Base
 import enum
@@ -21,3 +21,8 @@ class Maintenance(Base):
     end_date = Column(DateTime, nullable=True)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_maintenance_vehicle_start", "vehicle_number", "start_date"),
+        Index("ix_maintenance_type_end", "maintenance_type", "end_date"),
+    )
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.sql import func
+from app.database.base import Base
+
+
+class OdometerFinding(Base):
+    __tablename__ = "odometer_findings"
+
+    id = Column(Integer, primary_key=True, index=True)
+    vehicle_number = Column(String, nullable=False, index=True)
+    trip_id = Column(Integer, ForeignKey("trips.id", ondelete="CASCADE"), nullable=False, index=True)
+    # Previous trip of the vehicle the reading was compared with (gap / overlap)
+    prev_trip_id = Column(Integer, nullable=True)
+
+    kind = Column(String(20), nullable=False)  # gap / overlap / reversed / distance_mismatch
+    expected = Column(Float)
+    actual = Column(Float)
+    delta = Column(Float)  # actual - expected, in km
+
+    departure = Column(DateTime(timezone=True))
+    detected_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("trip_id", "kind", name="uq_odometer_findings_trip_kind"),
+    )
@@ -13,7 +13,8 @@ class Payment(Base):
     trip_id = Column(
         Integer,
         ForeignKey("trips.id", ondelete="CASCADE"),
-        nullable=False
+        nullable=False,
+        index=True
     )
 
     payment_date = Column(DateTime, nullable=False)
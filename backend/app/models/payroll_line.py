@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime, UniqueConstraint
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.database.base import Base
+
+
+class PayrollLine(Base):
+    __tablename__ = "payroll_lines"
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(Integer, ForeignKey("payroll_runs.id", ondelete="CASCADE"), nullable=False)
+    driver_id = Column(Integer, ForeignKey("drivers.id"), nullable=False, index=True)
+
+    payable_days = Column(Integer, default=0)  # days on staff in the month
+    base_salary = Column(Float, default=0)     # monthly_salary prorated from joining_date
+    bhatta = Column(Float, default=0)
+    expenses = Column(Float, default=0)
+    paid = Column(Float, default=0)
+    net_due = Column(Float, default=0)
+
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("run_id", "driver_id", name="uq_payroll_lines_run_driver"),
+    )
+
+    driver = relationship("Driver")
+
+    @property
+    def driver_name(self):
+        return self.driver.name if self.driver else None
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.database.base import Base
+
+
+class PayrollRun(Base):
+    __tablename__ = "payroll_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    month = Column(String(7), unique=True, nullable=False)  # YYYY-MM
+
+    driver_count = Column(Integer, default=0)
+    total_net_due = Column(Float, default=0)
+    changed_lines = Column(Integer, default=0)  # lines written by the last run
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    lines = relationship(
+        "PayrollLine",
+        cascade="all, delete-orphan",
+        order_by="PayrollLine.driver_id",
+    )
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy.sql import func
+from app.database.base import Base
+
+
+class ReportJob(Base):
+    __tablename__ = "report_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    report = Column(String(50), nullable=False)
+    format = Column(String(10), nullable=False)  # csv / xlsx
+    params = Column(Text)  # canonical JSON of the filters
+    # sha256 of (report, format, params, data versions of the source tables)
+    cache_key = Column(String(64), nullable=False, index=True)
+
+    status = Column(String(20), nullable=False, default="queued")  # queued / running / done / failed
+    file_path = Column(String)
+    row_count = Column(Integer)
+    file_size = Column(Integer)
+    error = Column(Text)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
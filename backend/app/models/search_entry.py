@@ -0,0 +1,41 @@
+from sqlalchemy import Column, Integer, String, Date, Text, Index
+from app.database.base import Base
+
+
+class SearchEntry(Base):
+    """
+    One row per searchable trip / customer / driver / vehicle / vendor.
+    search_text is lower-cased and denormalized (a trip carries its
+    customer and driver names); kept in sync by search_service on writes.
+    """
+    __tablename__ = "search_index"
+
+    id = Column(Integer, primary_key=True)
+    entity_type = Column(String(20), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    title = Column(String, nullable=False)
+    subtitle = Column(String)
+    search_text = Column(Text, nullable=False)
+    entry_date = Column(Date)  # trip date; null for the other types
+
+    __table_args__ = (
+        Index("ix_search_index_entity", "entity_type", "entity_id", unique=True),
+    )
+
+
+# Trigram indexes on Postgres (pg_trgm): GIN for substring matching, GiST
+# for nearest-first ordering by similarity distance. SQLite uses the FTS5
+# table created by search_service.ensure_search_backend
+Index(
+    "ix_search_index_text_trgm",
+    SearchEntry.search_text,
+    postgresql_using="gin",
+    postgresql_ops={"search_text": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+
+Index(
+    "ix_search_index_text_trgm_gist",
+    SearchEntry.search_text,
+    postgresql_using="gist",
+    postgresql_ops={"search_text": "gist_trgm_ops"},
+).ddl_if(dialect="postgresql")
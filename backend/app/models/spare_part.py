@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, Index
 from app.database.base import Base
 
 class SparePart(Base):
@@ -16,4 +16,10 @@ class SparePart(Base):
     cost = Column(Float, nullable=False)
     quantity = Column(Integer, default=1)
     vendor = Column(String)
+    vendor_id = Column(Integer, ForeignKey("vendors.id"), nullable=True, index=True)
     replaced_date = Column(Date, nullable=False)
+
+    __table_args__ = (
+        Index("ix_spare_parts_vehicle_replaced", "vehicle_number", "replaced_date"),
+        Index("ix_spare_parts_vehicle_part_replaced", "vehicle_number", "part_name", "replaced_date"),
+    )
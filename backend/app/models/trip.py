@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Date, Float, DateTime, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, Float, DateTime, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database.base import Base
@@ -8,16 +8,22 @@ class Trip(Base):
 
     id = Column(Integer, primary_key=True, index=True)
 
-    trip_date = Column(Date, nullable=False)
+    trip_date = Column(Date, nullable=False, index=True)
     departure_datetime = Column(DateTime(timezone=True))
     return_datetime = Column(DateTime(timezone=True))
+    # Normalized booking window (falls back to trip_date), used for overlap checks
+    busy_from = Column(DateTime(timezone=True))
+    busy_until = Column(DateTime(timezone=True))
     from_location = Column(String, nullable=False)
     to_location = Column(String, nullable=False)
+    # Interned from / to (locations dictionary), the keys route statistics group on
+    from_location_id = Column(Integer, ForeignKey("locations.id"), nullable=True)
+    to_location_id = Column(Integer, ForeignKey("locations.id"), nullable=True, index=True)
     route_details = Column(Text)
 
     vehicle_number = Column(String, ForeignKey("vehicles.vehicle_number"))
-    driver_id = Column(Integer, ForeignKey("drivers.id"))
-    customer_id = Column(Integer, ForeignKey("customers.id"))
+    driver_id = Column(Integer, ForeignKey("drivers.id"), index=True)
+    customer_id = Column(Integer, ForeignKey("customers.id"), index=True)
 
     start_km = Column(Float, default=0)
     end_km = Column(Float, default=0)
@@ -32,6 +38,7 @@ class Trip(Base):
     other_expenses = Column(Float, default=0)
     driver_bhatta = Column(Float, default=0)
     vendor = Column(String)
+    vendor_id = Column(Integer, ForeignKey("vendors.id"), nullable=True, index=True)
 
     # 🔥 CUSTOMER CHARGE FIELDS
     pricing_type = Column(String, default="per_km")  # per_km or package
@@ -65,6 +72,28 @@ class Trip(Base):
         lazy="selectin"
     )
 
+    # Read-only links for the trip document; loaded only when asked for
+    customer = relationship("Customer", viewonly=True)
+    driver = relationship("Driver", viewonly=True)
+    vehicle = relationship("Vehicle", viewonly=True)
+    payments = relationship("Payment", viewonly=True, order_by="Payment.payment_date")
+    driver_expenses = relationship("DriverExpense", viewonly=True, order_by="DriverExpense.created_at")
+
+    __table_args__ = (
+        Index("ix_trips_vehicle_busy", "vehicle_number", "busy_from"),
+        Index("ix_trips_vehicle_date", "vehicle_number", "trip_date"),
+        Index("ix_trips_driver_busy", "driver_id", "busy_from"),
+        Index("ix_trips_route", "from_location_id", "to_location_id"),
+    )
+
     def calculate_pending_amount(self):
         """Calculate and update pending amount"""
         self.pending_amount = max(0, (self.total_charged or 0) - (self.amount_received or 0))
+
+
+# GiST range index for booking overlap queries (Postgres only)
+Index(
+    "ix_trips_busy_range",
+    func.tstzrange(Trip.busy_from, Trip.busy_until),
+    postgresql_using="gist",
+).ddl_if(dialect="postgresql")
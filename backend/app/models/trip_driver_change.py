@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, String
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, String, Index
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database.base import Base
 
@@ -7,11 +8,28 @@ class TripDriverChange(Base):
     __tablename__ = "trip_driver_changes"
 
     id = Column(Integer, primary_key=True, index=True)
-    trip_id = Column(Integer, ForeignKey("trips.id", ondelete="CASCADE"), nullable=False)
-    driver_id = Column(Integer, ForeignKey("drivers.id"), nullable=False)
+    trip_id = Column(Integer, ForeignKey("trips.id", ondelete="CASCADE"), nullable=False, index=True)
+    driver_id = Column(Integer, ForeignKey("drivers.id"), nullable=False, index=True)
 
     start_time = Column(DateTime(timezone=True), nullable=True)
     end_time = Column(DateTime(timezone=True), nullable=True)
+    # Segment window, defaulting to the trip's busy window
+    busy_from = Column(DateTime(timezone=True), nullable=True)
+    busy_until = Column(DateTime(timezone=True), nullable=True)
     notes = Column(String, nullable=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    driver = relationship("Driver", viewonly=True)
+
+    __table_args__ = (
+        Index("ix_trip_driver_changes_driver_busy", "driver_id", "busy_from"),
+    )
+
+
+# GiST range index for booking overlap queries (Postgres only)
+Index(
+    "ix_trip_driver_changes_busy_range",
+    func.tstzrange(TripDriverChange.busy_from, TripDriverChange.busy_until),
+    postgresql_using="gist",
+).ddl_if(dialect="postgresql")
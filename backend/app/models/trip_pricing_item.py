@@ -7,7 +7,7 @@ class TripPricingItem(Base):
     __tablename__ = "trip_pricing_items"
 
     id = Column(Integer, primary_key=True, index=True)
-    trip_id = Column(Integer, ForeignKey("trips.id", ondelete="CASCADE"), nullable=False)
+    trip_id = Column(Integer, ForeignKey("trips.id", ondelete="CASCADE"), nullable=False, index=True)
 
     description = Column(String, nullable=False)
     quantity = Column(Float, default=1)
@@ -7,6 +7,7 @@ class Vehicle(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     vehicle_number = Column(String, unique=True, nullable=False)
+    vehicle_class = Column(String, nullable=True)  # e.g. Sedan, SUV, Tempo Traveller
 
     total_km = Column(Integer, default=0)
     total_trips = Column(Integer, default=0)
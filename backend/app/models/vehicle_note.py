@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Index
 from datetime import datetime
 from app.database.base import Base
 
@@ -13,3 +13,7 @@ class VehicleNote(Base):
     note_date = Column(Date, nullable=False)      # for filtering
     created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_vehicle_notes_vehicle_date", "vehicle_id", "note_date"),
+    )
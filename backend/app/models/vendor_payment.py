@@ -7,7 +7,7 @@ class VendorPayment(Base):
     __tablename__ = "vendor_payments"
 
     id = Column(Integer, primary_key=True, index=True)
-    vendor_id = Column(Integer, ForeignKey("vendors.id"), nullable=False)
+    vendor_id = Column(Integer, ForeignKey("vendors.id"), nullable=False, index=True)
     amount = Column(Float, nullable=False)
     paid_on = Column(Date, nullable=False)
     notes = Column(Text)
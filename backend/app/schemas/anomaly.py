@@ -0,0 +1,31 @@
+from datetime import date, datetime
+from pydantic import BaseModel
+from typing import Dict, Optional
+
+
+class AnomalyResponse(BaseModel):
+    id: int
+    source: str
+    source_id: int
+    rule: str
+    field: str
+    vehicle_number: Optional[str] = None
+    driver_id: Optional[int] = None
+    entry_date: Optional[date] = None
+    value: Optional[float] = None
+    expected: Optional[float] = None
+    score: Optional[float] = None
+    detected_at: datetime | None = None
+    updated_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
+
+
+class AnomalyScanResult(BaseModel):
+    scanned: Dict[str, int]
+    flagged: int
+    new: int
+    updated: int
+    resolved: int
+    seconds: float
@@ -0,0 +1,28 @@
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List
+
+
+class BusyVehicle(BaseModel):
+    vehicle_number: str
+    trip_ids: List[int]
+
+
+class FreeDriver(BaseModel):
+    id: int
+    name: str
+
+
+class BusyDriver(FreeDriver):
+    trip_ids: List[int]
+
+
+class AvailabilityResponse(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    from_: datetime = Field(alias="from")
+    to: datetime
+    free_vehicles: List[str]
+    busy_vehicles: List[BusyVehicle]
+    free_drivers: List[FreeDriver]
+    busy_drivers: List[BusyDriver]
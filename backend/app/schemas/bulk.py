@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+
+
+class BulkItemResult(BaseModel):
+    index: int  # position in the request array
+    id: int
+
+
+class BulkResult(BaseModel):
+    created: int
+    items: list[BulkItemResult]
@@ -1,3 +1,4 @@
+from datetime import date
 from pydantic import BaseModel
 from typing import List
 from app.schemas.trip import TripResponse
@@ -26,6 +27,14 @@ class CustomerResponse(BaseModel):
         orm_mode = True
 
 
+class CustomerListItem(CustomerResponse):
+    trip_count: int = 0
+    billed_amount: float = 0
+    received_amount: float = 0
+    pending_amount: float = 0
+    last_trip_date: date | None = None
+
+
 class CustomerWithTrips(BaseModel):
     customer: CustomerResponse
     trips: List[TripResponse]
@@ -1,6 +1,8 @@
-from datetime import date
+from datetime import date, datetime
 from pydantic import BaseModel
 
+from app.schemas.driver_salary import DriverSalaryResponse
+
 class DriverCreate(BaseModel):
     name: str
     phone: str | None = None
@@ -19,3 +21,45 @@ class DriverResponse(BaseModel):
 
     class Config:
         orm_mode = True
+
+
+class DriverTripStats(BaseModel):
+    count: int
+    relief_count: int  # trips driven only as a driver-change segment
+    revenue: float
+    km: float
+    bhatta: float
+
+
+class DriverTripExpenses(BaseModel):
+    trip_id: int
+    invoice_number: str | None
+    trip_date: date | None
+    from_location: str | None
+    to_location: str | None
+    items: int
+    total: float
+    last_entry_at: datetime | None
+
+
+class DriverExpenseStats(BaseModel):
+    count: int
+    total: float
+    month_total: float | None
+    by_trip: list[DriverTripExpenses]
+
+
+class DriverSalaryStats(BaseModel):
+    monthly_salary: float
+    paid: float
+    balance: float | None
+
+
+class DriverOverview(BaseModel):
+    driver: DriverResponse
+    month: str | None
+    trips: DriverTripStats
+    month_trips: DriverTripStats | None
+    expenses: DriverExpenseStats
+    salary: DriverSalaryStats
+    recent_salaries: list[DriverSalaryResponse]
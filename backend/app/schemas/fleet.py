@@ -0,0 +1,23 @@
+from datetime import date
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List
+
+
+class VehicleOccupancy(BaseModel):
+    vehicle_number: str
+    runs: List[List[int]]  # [day_offset, length] of occupied days
+    bitmap: str  # hex, bit i = day i after "from"
+    occupied_days: int
+    utilization: float
+    monthly_utilization: List[float]  # aligned with FleetCalendar.months
+
+
+class FleetCalendar(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    from_: date = Field(alias="from")
+    to: date
+    days: int
+    months: List[str]
+    fleet_utilization: float
+    vehicles: List[VehicleOccupancy]
@@ -1,7 +1,7 @@
 from datetime import date
-from typing import Optional
+from typing import Dict, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 
 class FuelCreate(BaseModel):
     vehicle_number: str
@@ -20,6 +20,42 @@ class FuelResponse(BaseModel):
     total_cost: float
     filled_date: date
     vendor: Optional[str]
+    vendor_id: Optional[int] = None
 
     class Config:
         from_attributes = True
+
+
+class FuelEfficiencyTotals(BaseModel):
+    km: float
+    litres: float
+    fuel_cost: float
+    km_per_litre: Optional[float] = None
+    cost_per_km: Optional[float] = None
+
+
+class FuelEfficiencyPeriod(FuelEfficiencyTotals):
+    month: str
+
+
+class VehicleFuelEfficiency(FuelEfficiencyTotals):
+    vehicle_number: str
+    # Share of the fleet (%) this vehicle does better than
+    km_per_litre_rank: Optional[float] = None
+    cost_per_km_rank: Optional[float] = None
+    periods: List[FuelEfficiencyPeriod]
+
+
+class FleetFuelEfficiency(FuelEfficiencyTotals):
+    vehicle_count: int
+    km_per_litre_percentiles: Dict[str, Optional[float]]
+    cost_per_km_percentiles: Dict[str, Optional[float]]
+
+
+class FuelEfficiencyResponse(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    from_: Optional[date] = Field(None, alias="from")
+    to: Optional[date] = None
+    fleet: FleetFuelEfficiency
+    vehicles: List[VehicleFuelEfficiency]
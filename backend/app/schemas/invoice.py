@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class InvoiceBatchRequest(BaseModel):
+    trip_ids: Optional[List[int]] = None
+
@@ -0,0 +1,37 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class LocationUsage(BaseModel):
+    id: int
+    name: str
+    trips: int
+
+
+class LocationMergeSuggestion(BaseModel):
+    source: LocationUsage  # merge this one ...
+    target: LocationUsage  # ... into this one (more trips)
+    similarity: float
+
+
+class LocationMerge(BaseModel):
+    source_id: int
+    target_id: int
+
+
+class LocationMergeResult(BaseModel):
+    source_id: int
+    target_id: int
+    trips_updated: int
+
+
+class RouteStats(BaseModel):
+    from_location_id: int
+    from_location: str
+    to_location_id: int
+    to_location: str
+    trips: int
+    median_distance_km: Optional[float] = None
+    revenue_per_km: Optional[float] = None
+    avg_toll: float
+    revenue: float
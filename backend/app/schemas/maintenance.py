@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from datetime import datetime
+from datetime import date, datetime
 from enum import Enum
 from typing import Optional
 
@@ -48,3 +48,27 @@ class MaintenanceResponse(MaintenanceCreate):
     model_config = {
         "from_attributes": True
     }
+
+
+# ===============================
+# UPCOMING RENEWALS
+# ===============================
+class UpcomingMaintenanceItem(BaseModel):
+    maintenance_id: int
+    maintenance_type: MaintenanceType
+    description: Optional[str] = None
+    amount: float
+    start_date: datetime
+    due_date: date
+    derived: bool  # no end_date: insurance +1 year, tax +90 days, EMI next instalment
+    days_left: int
+    status: str  # due / overdue
+
+
+class UpcomingMaintenance(BaseModel):
+    vehicle_number: str
+    next_due_date: date
+    next_due_type: MaintenanceType
+    days_left: int
+    overdue: int
+    items: list[UpcomingMaintenanceItem]
@@ -0,0 +1,37 @@
+from datetime import datetime
+from pydantic import BaseModel
+from typing import Optional
+
+
+class OdometerFindingResponse(BaseModel):
+    id: int
+    vehicle_number: str
+    trip_id: int
+    prev_trip_id: Optional[int] = None
+    kind: str
+    expected: Optional[float] = None
+    actual: Optional[float] = None
+    delta: Optional[float] = None
+    departure: datetime | None = None
+    detected_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
+
+
+class VehicleOdometerSummary(BaseModel):
+    vehicle_number: str
+    total: int
+    gap: int
+    overlap: int
+    reversed: int
+    distance_mismatch: int
+    gap_km: float  # km driven between trips that no trip accounts for
+
+
+class OdometerAuditResult(BaseModel):
+    trips_scanned: int
+    findings: int
+    written: int
+    resolved: int
+    seconds: float
@@ -0,0 +1,35 @@
+from datetime import datetime
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class PayrollLineResponse(BaseModel):
+    driver_id: int
+    driver_name: Optional[str] = None
+    payable_days: int
+    base_salary: float
+    bhatta: float
+    expenses: float
+    paid: float
+    net_due: float
+    computed_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
+
+
+class PayrollRunSummary(BaseModel):
+    id: int
+    month: str
+    driver_count: int
+    total_net_due: float
+    changed_lines: int
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
+
+
+class PayrollRunResponse(PayrollRunSummary):
+    lines: List[PayrollLineResponse] = []
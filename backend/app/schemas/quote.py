@@ -0,0 +1,48 @@
+from datetime import date, datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class QuoteRequest(BaseModel):
+    from_location: str
+    to_location: str
+    vehicle_number: Optional[str] = None
+    vehicle_class: Optional[str] = None  # defaults to the vehicle's class
+    trip_date: Optional[date] = None
+    departure_datetime: Optional[datetime] = None
+    return_datetime: Optional[datetime] = None
+    pricing_type: str = "per_km"  # per_km or package
+
+
+class QuoteRange(BaseModel):
+    p25: float
+    median: float
+    p75: float
+    samples: int
+
+
+class QuoteResponse(BaseModel):
+    from_location: str
+    to_location: str
+    from_location_id: Optional[int] = None
+    to_location_id: Optional[int] = None
+    vehicle_class: Optional[str] = None
+    pricing_type: str
+    # route_class / route / reverse_route_class / reverse_route; None = no history
+    basis: Optional[str] = None
+    sample_size: int
+    days: int
+
+    # Suggested values (medians of the matched trips)
+    distance_km: Optional[float] = None
+    cost_per_km: Optional[float] = None
+    package_amount: Optional[float] = None
+    toll_amount: Optional[float] = None
+    parking_amount: Optional[float] = None
+    charged_toll_amount: float
+    charged_parking_amount: float
+    driver_bhatta: Optional[float] = None
+    estimated_total: Optional[float] = None
+
+    ranges: dict[str, QuoteRange]
@@ -0,0 +1,59 @@
+from datetime import date, datetime
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Any, Dict, List, Optional
+
+
+class ReportFilters(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    from_: Optional[date] = Field(None, alias="from")
+    to: Optional[date] = None
+    vehicle_number: Optional[str] = None
+    driver_id: Optional[int] = None
+    customer_id: Optional[int] = None
+    pricing_type: Optional[str] = None
+
+
+class ReportQuery(BaseModel):
+    dimensions: List[str] = []  # month, vehicle, driver, customer, route, pricing_type
+    metrics: List[str]  # trips, km, income, cost, fuel, spares, maintenance, dues, profit
+    filters: ReportFilters = ReportFilters()
+    sort: Optional[str] = None  # dimension or metric, "-" prefix for descending
+    limit: Optional[int] = Field(None, ge=1)
+
+
+class ReportResult(BaseModel):
+    dimensions: List[str]
+    metrics: List[str]
+    row_count: int
+    group_count: int  # groups before limit
+    columns: Dict[str, List[Any]]  # one aligned list per dimension and metric
+    labels: Dict[str, Dict[str, str]]  # names for id dimensions (driver, customer)
+    totals: Dict[str, float]
+
+
+class ReportJobCreate(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    report: str  # any /export entity: trips, payments, fuel, ...
+    format: str = "csv"  # csv / xlsx
+    from_: Optional[date] = Field(None, alias="from")
+    to: Optional[date] = None
+    vehicle_number: Optional[str] = None
+
+
+class ReportJobResponse(BaseModel):
+    id: int
+    report: str
+    format: str
+    params: Optional[str] = None
+    status: str
+    row_count: Optional[int] = None
+    file_size: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
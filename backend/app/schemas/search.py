@@ -0,0 +1,17 @@
+from datetime import date
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class SearchResult(BaseModel):
+    type: str  # trip / customer / driver / vehicle / vendor
+    id: int
+    title: str
+    subtitle: Optional[str] = None
+    trip_date: Optional[date] = None
+    score: float
+
+
+class SearchIndexRebuild(BaseModel):
+    entries: int
@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+
+class SlowQuery(BaseModel):
+    recorded_at: datetime
+    duration_ms: float
+    statement: str
+    parameters: Any = None  # redacted: text and bytes show only their length
+    batch_size: Optional[int] = None  # executemany: parameters are the first set
+    caller: Optional[str] = None  # module:function:line
+    plan: Optional[str] = None
+
+
+class SlowQueryLog(BaseModel):
+    threshold_ms: float
+    log_threshold_ms: float
+    explain: Optional[str] = None
+    buffer_size: int
+    recorded: int
+    entries: list[SlowQuery]
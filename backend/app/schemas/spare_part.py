@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import date
-from typing import Optional
+from typing import Dict, List, Optional
 
 
 class SparePartCreate(BaseModel):
@@ -19,7 +19,47 @@ class SparePartResponse(BaseModel):
     cost: float
     quantity: int
     vendor: Optional[str]
+    vendor_id: Optional[int] = None
     replaced_date: date
 
     class Config:
         from_attributes = True
+
+
+class PartIntervals(BaseModel):
+    part: str  # normalized part name
+    vehicles: int
+    replacements: int
+    intervals: int
+    days_percentiles: Dict[str, Optional[float]]
+    km_percentiles: Dict[str, Optional[float]]
+
+
+class VehiclePartIntervals(BaseModel):
+    vehicle_number: str
+    part: str
+    replacements: int
+    quantity: int
+    cost: float
+    median_days: Optional[float] = None
+    median_km: Optional[float] = None
+    last_replaced: date
+    early_replacements: int
+
+
+class EarlyReplacement(BaseModel):
+    vehicle_number: str
+    part: str
+    replaced_date: date
+    previous_date: date
+    days: int
+    km: Optional[float] = None
+    cost: float
+    fleet_median_days: Optional[float] = None
+    fleet_median_km: Optional[float] = None
+
+
+class ReplacementIntervalsResponse(BaseModel):
+    parts: List[PartIntervals]
+    vehicles: List[VehiclePartIntervals]
+    outliers: List[EarlyReplacement]
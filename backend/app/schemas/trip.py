@@ -77,8 +77,9 @@ class TripCreate(BaseModel):
     driver_bhatta: float = 0
     vendor: str | None = None
     
-    # INVOICE NUMBER
-    invoice_number: str  # Required field
+    # INVOICE NUMBER (allocated from the series counter when left blank)
+    invoice_number: Optional[str] = None
+    invoice_series: Optional[str] = None
 
     # MULTI-ENTRY SUPPORT
     pricing_items: List[TripPricingItemCreate] = []
@@ -138,6 +139,8 @@ class TripResponse(BaseModel):
     return_datetime: datetime | None
     from_location: str
     to_location: str
+    from_location_id: int | None = None
+    to_location_id: int | None = None
     route_details: str | None
     vehicle_number: str
     driver_id: int
@@ -158,6 +161,7 @@ class TripResponse(BaseModel):
     other_expenses: float
     driver_bhatta: float
     vendor: str | None
+    vendor_id: int | None = None
     total_cost: float
 
     # CUSTOMER CHARGES
@@ -177,3 +181,26 @@ class TripResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+# ======================
+# PROFITABILITY
+# ======================
+class TripProfitability(BaseModel):
+    trip_id: int
+    invoice_number: str | None
+    trip_date: date
+    vehicle_number: str | None
+    driver_id: int | None
+    customer_id: int | None
+    from_location: str
+    to_location: str
+    revenue: float
+    direct_cost: float
+    driver_expenses: float
+    received: float
+    payments_total: float
+    payment_count: int
+    outstanding: float
+    margin: float
+    margin_pct: float | None
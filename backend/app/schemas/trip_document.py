@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import List, Optional
+
+from app.schemas.trip import TripResponse, TripDriverChangeResponse
+from app.schemas.customer import CustomerResponse
+from app.schemas.driver import DriverResponse
+from app.schemas.vehicle import VehicleResponse
+from app.schemas.payment import PaymentResponse
+from app.schemas.driver_expense import DriverExpenseResponse
+
+
+class TripDocumentDriverChange(TripDriverChangeResponse):
+    busy_from: Optional[datetime] = None
+    busy_until: Optional[datetime] = None
+    driver: Optional[DriverResponse] = None
+
+
+class TripDocument(TripResponse):
+    """Everything the trip details and invoice screens show, in one response"""
+    driver_changes: List[TripDocumentDriverChange] = []
+    customer: Optional[CustomerResponse] = None
+    driver: Optional[DriverResponse] = None
+    vehicle: Optional[VehicleResponse] = None
+    payments: List[PaymentResponse] = []
+    driver_expenses: List[DriverExpenseResponse] = []
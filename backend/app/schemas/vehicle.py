@@ -1,11 +1,17 @@
+from datetime import date
 from pydantic import BaseModel
+from typing import Optional
 
 class VehicleBase(BaseModel):
     vehicle_number: str
+    vehicle_class: Optional[str] = None
 
 class VehicleCreate(VehicleBase):
     pass
 
+class VehicleUpdate(BaseModel):
+    vehicle_class: Optional[str] = None
+
 class VehicleResponse(VehicleBase):
     id: int
     total_km: int
@@ -13,3 +19,13 @@ class VehicleResponse(VehicleBase):
 
     class Config:
         from_attributes = True
+
+
+class TimelineEvent(BaseModel):
+    type: str  # trip, fuel, spare_part, maintenance, note
+    id: int
+    event_date: date
+    title: Optional[str] = None
+    detail: Optional[str] = None  # invoice number, vendor or description
+    amount: Optional[float] = None
+    quantity: Optional[float] = None  # km, litres or parts
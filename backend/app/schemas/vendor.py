@@ -1,3 +1,4 @@
+from datetime import date
 from pydantic import BaseModel
 from typing import Optional
 
@@ -14,3 +15,28 @@ class VendorResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class VendorSummary(BaseModel):
+    vendor_id: int
+    vendor_name: str
+    category: Optional[str] = None
+    fuel_total: float
+    spare_total: float
+    trip_fuel_total: float
+    total_owed: float
+    paid_total: float
+    pending: float
+
+
+class VendorLedgerEntry(BaseModel):
+    seq: int
+    entry_date: date
+    kind: str  # fuel / spare / trip / payment
+    ref_id: int
+    vehicle_number: Optional[str] = None
+    description: Optional[str] = None
+    quantity: Optional[float] = None
+    debit: float
+    credit: float
+    balance: float
@@ -0,0 +1,318 @@
+import os
+import time
+
+import numpy as np
+from sqlalchemy.orm import Session
+from sqlalchemy import delete, insert, select, update
+
+from app.models.anomaly import Anomaly
+from app.models.fuel import Fuel
+from app.models.trip import Trip
+from app.models.driver_expense import DriverExpense
+from app.utils.pagination import decode_cursor, encode_cursor
+
+CHUNK_SIZE = 5000
+# Iglewicz-Hoaglin cut-off for the modified z-score
+Z_THRESHOLD = 3.5
+# Groups smaller than this have no reliable median/MAD and are not scored
+MIN_GROUP_SIZE = 5
+# No tank size is stored per vehicle; fills above this are flagged
+FUEL_TANK_LITRES = float(os.getenv("FUEL_TANK_LITRES", "100"))
+
+# Trip expense columns and the key their distribution is grouped by
+TRIP_EXPENSE_FIELDS = {
+    "toll_amount": "vehicle",
+    "parking_amount": "vehicle",
+    "other_expenses": "vehicle",
+    "driver_bhatta": "driver",
+}
+
+
+# ===============================
+# LOADING
+# ===============================
+
+def _stream(db: Session, stmt, dtypes: dict):
+    """
+    Run a select in chunks of CHUNK_SIZE rows and collect each column into
+    a NumPy array of the given dtype (None becomes NaN for float columns).
+    """
+    buffers = {name: [] for name in dtypes}
+    # Core connection: plain tuples, no ORM row processing
+    result = db.connection().execute(stmt.execution_options(yield_per=CHUNK_SIZE))
+    for chunk in result.partitions():
+        columns = list(zip(*chunk))
+        for (name, dtype), values in zip(dtypes.items(), columns):
+            buffers[name].append(np.array(values, dtype=dtype))
+
+    return {
+        name: np.concatenate(parts) if parts else np.array([], dtype=dtypes[name])
+        for name, parts in buffers.items()
+    }
+
+
+def _codes(values):
+    """Integer code per distinct value (None gets its own code)"""
+    _, codes = np.unique(values.astype(str), return_inverse=True)
+    return codes
+
+
+# ===============================
+# VECTORIZED STATISTICS
+# ===============================
+
+def _robust_z(values, groups):
+    """
+    Modified z-score of every value against its group's median and MAD,
+    computed for all groups at once on a (group, value) sort.
+
+    Returns (z, median); z is NaN for missing values, groups smaller than
+    MIN_GROUP_SIZE and groups with no spread.
+    """
+    z = np.full(len(values), np.nan)
+    median = np.full(len(values), np.nan)
+
+    rows = np.nonzero(~np.isnan(values))[0]
+    if not len(rows):
+        return z, median
+
+    order = np.lexsort((values[rows], groups[rows]))
+    rows = rows[order]
+    v = values[rows]
+    g = groups[rows]
+
+    starts = np.r_[0, np.nonzero(np.diff(g))[0] + 1]
+    counts = np.diff(np.r_[starts, len(v)])
+    group_of = np.repeat(np.arange(len(starts)), counts)
+
+    lower, upper = starts + (counts - 1) // 2, starts + counts // 2
+    medians = (v[lower] + v[upper]) / 2
+
+    deviation = np.abs(v - medians[group_of])
+    deviation_sorted = deviation[np.lexsort((deviation, group_of))]
+    mad = (deviation_sorted[lower] + deviation_sorted[upper]) / 2
+    mean_ad = np.add.reduceat(deviation, starts) / counts
+
+    # MAD / 0.6745 estimates sigma; fall back to the mean absolute
+    # deviation when more than half of a group shares one value
+    scale = np.where(mad > 0, mad / 0.6745, mean_ad * 1.2533)
+    scored = (counts >= MIN_GROUP_SIZE) & (scale > 0)
+
+    safe_scale = np.where(scale > 0, scale, 1.0)
+    z[rows] = np.where(scored[group_of], (v - medians[group_of]) / safe_scale[group_of], np.nan)
+    median[rows] = medians[group_of]
+    return z, median
+
+
+def _repeat_counts(*keys):
+    """How many rows share each row's combination of keys"""
+    stacked = np.stack([np.asarray(key, dtype=float) for key in keys], axis=1)
+    _, inverse, counts = np.unique(stacked, axis=0, return_inverse=True, return_counts=True)
+    return counts[inverse.ravel()]
+
+
+# ===============================
+# FLAGGING
+# ===============================
+
+def _collect(flags, source, data, mask, rule, field, value, expected, score):
+    for i in np.nonzero(mask)[0]:
+        flags[(source, int(data["id"][i]), rule)] = {
+            "field": field,
+            "vehicle_number": data["vehicle_number"][i],
+            "driver_id": None if np.isnan(data["driver_id"][i]) else int(data["driver_id"][i]),
+            "entry_date": data["entry_date"][i].astype(object),
+            "value": float(value[i]),
+            "expected": None if np.isnan(expected[i]) else round(float(expected[i]), 2),
+            "score": round(float(score[i]), 2),
+        }
+
+
+def _fuel_flags(db: Session, flags):
+    data = _stream(
+        db,
+        select(
+            Fuel.id, Fuel.vehicle_number, Fuel.fuel_type, Fuel.filled_date, Fuel.quantity, Fuel.rate_per_litre
+        ).order_by(Fuel.id),
+        {
+            "id": np.int64, "vehicle_number": object, "fuel_type": object,
+            "entry_date": "datetime64[D]", "quantity": float, "rate": float,
+        },
+    )
+    if not len(data["id"]):
+        return 0
+    data["driver_id"] = np.full(len(data["id"]), np.nan)
+
+    vehicle = _codes(data["vehicle_number"])
+    fuel_type = _codes(data["fuel_type"])
+    month = data["entry_date"].astype("datetime64[M]").astype(np.int64)
+
+    # Market rate: same fuel type in the same month, else same fuel type overall
+    z_month, median_month = _robust_z(data["rate"], fuel_type * 100000 + month)
+    z_type, median_type = _robust_z(data["rate"], fuel_type)
+    use_month = ~np.isnan(z_month)
+    rate_z = np.where(use_month, z_month, z_type)
+    rate_median = np.where(use_month, median_month, median_type)
+    _collect(flags, "fuel", data, np.abs(np.nan_to_num(rate_z)) > Z_THRESHOLD,
+             "rate_outlier", "rate_per_litre", data["rate"], rate_median, rate_z)
+
+    tank = np.full(len(data["id"]), FUEL_TANK_LITRES)
+    _collect(flags, "fuel", data, data["quantity"] > FUEL_TANK_LITRES,
+             "quantity_above_tank", "quantity", data["quantity"], tank, data["quantity"] / FUEL_TANK_LITRES)
+
+    quantity_z, quantity_median = _robust_z(data["quantity"], vehicle)
+    _collect(flags, "fuel", data, np.nan_to_num(quantity_z) > Z_THRESHOLD,
+             "quantity_outlier", "quantity", data["quantity"], quantity_median, quantity_z)
+
+    repeats = _repeat_counts(vehicle, data["entry_date"].astype(np.int64))
+    _collect(flags, "fuel", data, repeats > 1,
+             "repeat_fill_same_day", "filled_date", data["quantity"], np.full(len(repeats), np.nan), repeats)
+
+    return len(data["id"])
+
+
+def _trip_flags(db: Session, flags):
+    data = _stream(
+        db,
+        select(
+            Trip.id, Trip.vehicle_number, Trip.driver_id, Trip.trip_date,
+            *(getattr(Trip, field) for field in TRIP_EXPENSE_FIELDS),
+        ).order_by(Trip.id),
+        {
+            "id": np.int64, "vehicle_number": object, "driver_id": float, "entry_date": "datetime64[D]",
+            **{field: float for field in TRIP_EXPENSE_FIELDS},
+        },
+    )
+    if not len(data["id"]):
+        return 0
+
+    groups = {"vehicle": _codes(data["vehicle_number"]), "driver": _codes(data["driver_id"])}
+    for field, group in TRIP_EXPENSE_FIELDS.items():
+        # Zero means the expense did not apply; only inflated amounts are flagged
+        values = np.where(data[field] > 0, data[field], np.nan)
+        z, median = _robust_z(values, groups[group])
+        _collect(flags, "trip", data, np.nan_to_num(z) > Z_THRESHOLD,
+                 f"{field}_outlier", field, values, median, z)
+
+    return len(data["id"])
+
+
+def _driver_expense_flags(db: Session, flags):
+    data = _stream(
+        db,
+        select(
+            DriverExpense.id, Trip.vehicle_number, DriverExpense.driver_id, DriverExpense.created_at,
+            DriverExpense.trip_id, DriverExpense.description, DriverExpense.amount,
+        )
+        .join(Trip, Trip.id == DriverExpense.trip_id)
+        .order_by(DriverExpense.id),
+        {
+            "id": np.int64, "vehicle_number": object, "driver_id": float, "created_at": object,
+            "trip_id": np.int64, "description": object, "amount": float,
+        },
+    )
+    if not len(data["id"]):
+        return 0
+    data["entry_date"] = np.array(
+        [value.date() if value is not None else None for value in data["created_at"]], dtype="datetime64[D]"
+    )
+
+    driver = _codes(data["driver_id"])
+    z, median = _robust_z(np.where(data["amount"] > 0, data["amount"], np.nan), driver)
+    _collect(flags, "driver_expense", data, np.nan_to_num(z) > Z_THRESHOLD,
+             "amount_outlier", "amount", data["amount"], median, z)
+
+    description = _codes(np.char.lower(np.char.strip(data["description"].astype(str))))
+    repeats = _repeat_counts(driver, data["trip_id"], data["amount"], description)
+    _collect(flags, "driver_expense", data, repeats > 1,
+             "duplicate_expense", "amount", data["amount"], np.full(len(repeats), np.nan), repeats)
+
+    return len(data["id"])
+
+
+# ===============================
+# SCAN + PERSIST
+# ===============================
+
+def run_anomaly_scan(db: Session):
+    """
+    Scan the full history and sync the anomalies table with the result:
+    new flags are inserted, changed ones updated and flags whose row no
+    longer trips a rule are removed.
+    """
+    started = time.perf_counter()
+    flags = {}
+    scanned = {
+        "fuel": _fuel_flags(db, flags),
+        "trip": _trip_flags(db, flags),
+        "driver_expense": _driver_expense_flags(db, flags),
+    }
+
+    existing = {
+        (row.source, row.source_id, row.rule): row
+        for row in db.query(
+            Anomaly.id, Anomaly.source, Anomaly.source_id, Anomaly.rule,
+            Anomaly.value, Anomaly.expected, Anomaly.score,
+        )
+    }
+
+    new_rows, changed_rows = [], []
+    for key, flag in flags.items():
+        row = existing.pop(key, None)
+        if row is None:
+            source, source_id, rule = key
+            new_rows.append({"source": source, "source_id": source_id, "rule": rule, **flag})
+        elif (row.value, row.expected, row.score) != (flag["value"], flag["expected"], flag["score"]):
+            changed_rows.append({"id": row.id, **flag})
+
+    if new_rows:
+        db.execute(insert(Anomaly), new_rows)
+    if changed_rows:
+        db.execute(update(Anomaly), changed_rows)
+    if existing:
+        db.execute(delete(Anomaly).where(Anomaly.id.in_([row.id for row in existing.values()])))
+    db.commit()
+
+    return {
+        "scanned": scanned,
+        "flagged": len(flags),
+        "new": len(new_rows),
+        "updated": len(changed_rows),
+        "resolved": len(existing),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def list_anomalies(
+    db: Session,
+    source: str | None = None,
+    rule: str | None = None,
+    vehicle_number: str | None = None,
+    driver_id: int | None = None,
+    limit: int = 100,
+    cursor: str | None = None,
+):
+    """
+    Most recently flagged first. Returns (anomalies, next_cursor);
+    next_cursor is None on the last page.
+    """
+    query = db.query(Anomaly)
+    if source:
+        query = query.filter(Anomaly.source == source)
+    if rule:
+        query = query.filter(Anomaly.rule == rule)
+    if vehicle_number:
+        query = query.filter(Anomaly.vehicle_number == vehicle_number)
+    if driver_id:
+        query = query.filter(Anomaly.driver_id == driver_id)
+    if cursor:
+        (last_id,) = decode_cursor(cursor, int)
+        query = query.filter(Anomaly.id < last_id)
+
+    anomalies = query.order_by(Anomaly.id.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(anomalies) > limit:
+        anomalies = anomalies[:limit]
+        next_cursor = encode_cursor(anomalies[-1].id)
+    return anomalies, next_cursor
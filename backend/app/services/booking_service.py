@@ -0,0 +1,342 @@
+import os
+import threading
+from collections import defaultdict
+from datetime import datetime, time, timedelta, timezone
+
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, func, true, update
+from fastapi import HTTPException
+
+from app.models.trip import Trip
+from app.models.trip_driver_change import TripDriverChange
+from app.models.vehicle import Vehicle
+from app.models.driver import Driver
+from app.utils.intervals import IntervalIndex
+
+# Trips without both departure and return times get a whole-day window for
+# ordering and calendars, but only take part in overlap checks when this is set
+BOOKING_UNTIMED_WHOLE_DAY = os.getenv("BOOKING_UNTIMED_WHOLE_DAY", "").lower() in ("1", "true", "yes")
+
+
+# ===============================
+# BOOKING WINDOWS
+# ===============================
+
+def _utc(value: datetime | None):
+    """
+    Windows are aware UTC datetimes, so timestamptz columns store the same
+    instant whatever the session timezone. Naive values are taken as UTC
+    (SQLite also returns stored windows naive).
+    """
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def is_timed(departure: datetime | None, return_: datetime | None) -> bool:
+    """Whether a trip's window is checked for double-booking"""
+    return BOOKING_UNTIMED_WHOLE_DAY or (departure is not None and return_ is not None)
+
+
+def _timed_trips():
+    if BOOKING_UNTIMED_WHOLE_DAY:
+        return true()
+    return and_(Trip.departure_datetime.isnot(None), Trip.return_datetime.isnot(None))
+
+
+def busy_window(trip_date, departure: datetime | None, return_: datetime | None):
+    """
+    [start, end) window a trip keeps its vehicle and driver busy.
+    Missing times fall back to the trip_date (or departure day) as a whole day;
+    such trips are not checked for overlaps (see is_timed).
+    """
+    departure, return_ = _utc(departure), _utc(return_)
+    if departure and return_ and return_ < departure:
+        raise HTTPException(400, "Return date/time cannot be before departure")
+
+    start = departure or datetime.combine(trip_date, time.min, timezone.utc)
+    end = return_ or datetime.combine(start.date() + timedelta(days=1), time.min, timezone.utc)
+    if end <= start:
+        end = start + timedelta(minutes=1)
+    return start, end
+
+
+def segment_window(trip_window, start_time: datetime | None, end_time: datetime | None):
+    """Window of a driver-change segment, defaulting to the trip window"""
+    start = _utc(start_time) or trip_window[0]
+    end = _utc(end_time) or trip_window[1]
+    if end < start:
+        raise HTTPException(400, "Driver change end time cannot be before start time")
+    if end == start:
+        end = start + timedelta(minutes=1)
+    return start, end
+
+
+def _overlaps(db: Session, from_column, until_column, start, end):
+    if db.bind.dialect.name == "postgresql":
+        # Matches the GiST expression index on tstzrange(busy_from, busy_until)
+        return func.tstzrange(from_column, until_column).op("&&")(func.tstzrange(start, end))
+    return and_(from_column < end, until_column > start)
+
+
+# ===============================
+# DOUBLE-BOOKING CHECK
+# ===============================
+
+def assert_available(
+    db: Session,
+    vehicle_number: str,
+    driver_id: int,
+    window,
+    change_windows=(),
+    exclude_trip_id: int | None = None,
+    timed: bool = True,
+):
+    """
+    Raise 409 if the vehicle or any driver on the trip is already booked
+    on another timed trip in an overlapping window. Untimed trips (see
+    is_timed) are never checked.
+    change_windows: [(driver_id, (start, end)), ...] for driver-change segments
+    """
+    if not timed:
+        return
+
+    not_self = Trip.id != exclude_trip_id if exclude_trip_id else true()
+
+    clash = (
+        db.query(Trip.invoice_number)
+        .filter(
+            Trip.vehicle_number == vehicle_number,
+            _overlaps(db, Trip.busy_from, Trip.busy_until, *window),
+            _timed_trips(),
+            not_self,
+        )
+        .first()
+    )
+    if clash:
+        raise HTTPException(
+            409, f"Vehicle {vehicle_number} is already booked on trip {clash.invoice_number}"
+        )
+
+    for check_driver_id, (start, end) in [(driver_id, window), *change_windows]:
+        clash = (
+            db.query(Trip.invoice_number)
+            .filter(
+                Trip.driver_id == check_driver_id,
+                _overlaps(db, Trip.busy_from, Trip.busy_until, start, end),
+                _timed_trips(),
+                not_self,
+            )
+            .first()
+        ) or (
+            db.query(Trip.invoice_number)
+            .join(TripDriverChange, TripDriverChange.trip_id == Trip.id)
+            .filter(
+                TripDriverChange.driver_id == check_driver_id,
+                _overlaps(db, TripDriverChange.busy_from, TripDriverChange.busy_until, start, end),
+                _timed_trips(),
+                not_self,
+            )
+            .first()
+        )
+        if clash:
+            raise HTTPException(
+                409, f"Driver {check_driver_id} is already booked on trip {clash.invoice_number}"
+            )
+
+
+# ===============================
+# IN-MEMORY INTERVAL INDEX (NON-POSTGRES BACKENDS)
+# ===============================
+
+_index_lock = threading.Lock()
+_index_cache = {"fingerprint": None, "vehicles": {}, "drivers": {}}
+
+
+def invalidate_booking_index():
+    _index_cache["fingerprint"] = None
+
+
+def _fingerprint(db: Session):
+    # Changes whenever a trip or driver change is added, edited or removed
+    trips = db.query(func.count(Trip.id), func.max(Trip.id), func.max(Trip.updated_at)).one()
+    changes = db.query(func.count(TripDriverChange.id), func.max(TripDriverChange.id)).one()
+    return (*trips, *changes)
+
+
+def _booking_index(db: Session):
+    fingerprint = _fingerprint(db)
+    with _index_lock:
+        if _index_cache["fingerprint"] == fingerprint:
+            return _index_cache
+
+        vehicles = defaultdict(list)
+        drivers = defaultdict(list)
+
+        # Ordered scans over the (vehicle_number, busy_from) / (driver_id, busy_from) indexes
+        trip_rows = (
+            db.query(Trip.id, Trip.vehicle_number, Trip.busy_from, Trip.busy_until)
+            .filter(Trip.busy_from.isnot(None), _timed_trips())
+            .order_by(Trip.vehicle_number, Trip.busy_from)
+        )
+        for row in trip_rows:
+            vehicles[row.vehicle_number].append((_utc(row.busy_from), _utc(row.busy_until), row.id))
+
+        driver_rows = (
+            db.query(Trip.id, Trip.driver_id, Trip.busy_from, Trip.busy_until)
+            .filter(Trip.busy_from.isnot(None), _timed_trips())
+            .order_by(Trip.driver_id, Trip.busy_from)
+        )
+        for row in driver_rows:
+            drivers[row.driver_id].append((_utc(row.busy_from), _utc(row.busy_until), row.id))
+
+        change_rows = (
+            db.query(
+                TripDriverChange.trip_id,
+                TripDriverChange.driver_id,
+                TripDriverChange.busy_from,
+                TripDriverChange.busy_until,
+            )
+            .join(Trip, Trip.id == TripDriverChange.trip_id)
+            .filter(TripDriverChange.busy_from.isnot(None), _timed_trips())
+            .order_by(TripDriverChange.driver_id, TripDriverChange.busy_from)
+        )
+        for row in change_rows:
+            drivers[row.driver_id].append((_utc(row.busy_from), _utc(row.busy_until), row.trip_id))
+
+        _index_cache["vehicles"] = {key: IntervalIndex(items) for key, items in vehicles.items()}
+        _index_cache["drivers"] = {key: IntervalIndex(items) for key, items in drivers.items()}
+        _index_cache["fingerprint"] = fingerprint
+        return _index_cache
+
+
+# ===============================
+# AVAILABILITY
+# ===============================
+
+def _busy_trips(db: Session, start, end):
+    """({vehicle_number: [trip_id]}, {driver_id: [trip_id]}) booked in [start, end)"""
+    if db.bind.dialect.name == "postgresql":
+        busy_vehicles = defaultdict(list)
+        busy_drivers = defaultdict(list)
+        trip_rows = (
+            db.query(Trip.id, Trip.vehicle_number, Trip.driver_id)
+            .filter(_overlaps(db, Trip.busy_from, Trip.busy_until, start, end), _timed_trips())
+            .order_by(Trip.busy_from)
+        )
+        for row in trip_rows:
+            busy_vehicles[row.vehicle_number].append(row.id)
+            busy_drivers[row.driver_id].append(row.id)
+
+        change_rows = (
+            db.query(TripDriverChange.trip_id, TripDriverChange.driver_id)
+            .join(Trip, Trip.id == TripDriverChange.trip_id)
+            .filter(
+                _overlaps(db, TripDriverChange.busy_from, TripDriverChange.busy_until, start, end),
+                _timed_trips(),
+            )
+            .order_by(TripDriverChange.busy_from)
+        )
+        for row in change_rows:
+            if row.trip_id not in busy_drivers[row.driver_id]:
+                busy_drivers[row.driver_id].append(row.trip_id)
+        return busy_vehicles, busy_drivers
+
+    index = _booking_index(db)
+    busy_vehicles = {
+        vehicle_number: tree.overlapping(start, end)
+        for vehicle_number, tree in index["vehicles"].items()
+        if tree.overlaps(start, end)
+    }
+    busy_drivers = {
+        driver_id: list(dict.fromkeys(tree.overlapping(start, end)))
+        for driver_id, tree in index["drivers"].items()
+        if tree.overlaps(start, end)
+    }
+    return busy_vehicles, busy_drivers
+
+
+def availability(db: Session, start: datetime, end: datetime):
+    start, end = _utc(start), _utc(end)
+    if end <= start:
+        raise HTTPException(400, "'to' must be after 'from'")
+
+    busy_vehicles, busy_drivers = _busy_trips(db, start, end)
+
+    vehicles = (
+        db.query(Vehicle.vehicle_number)
+        .filter(Vehicle.is_deleted == False)  # noqa: E712
+        .order_by(Vehicle.vehicle_number)
+        .all()
+    )
+    drivers = db.query(Driver.id, Driver.name).order_by(Driver.name).all()
+
+    return {
+        "from": start,
+        "to": end,
+        "free_vehicles": [v.vehicle_number for v in vehicles if v.vehicle_number not in busy_vehicles],
+        "busy_vehicles": [
+            {"vehicle_number": v.vehicle_number, "trip_ids": busy_vehicles[v.vehicle_number]}
+            for v in vehicles
+            if v.vehicle_number in busy_vehicles
+        ],
+        "free_drivers": [{"id": d.id, "name": d.name} for d in drivers if d.id not in busy_drivers],
+        "busy_drivers": [
+            {"id": d.id, "name": d.name, "trip_ids": busy_drivers[d.id]}
+            for d in drivers
+            if d.id in busy_drivers
+        ],
+    }
+
+
+# ===============================
+# BACKFILL
+# ===============================
+
+def backfill_busy_windows(db: Session):
+    """Fill busy_from/busy_until on rows written before they existed"""
+    trips = (
+        db.query(Trip.id, Trip.trip_date, Trip.departure_datetime, Trip.return_datetime)
+        .filter(Trip.busy_from.is_(None))
+        .all()
+    )
+    windows = {}
+    trip_updates = []
+    for row in trips:
+        try:
+            start, end = busy_window(row.trip_date, row.departure_datetime, row.return_datetime)
+        except HTTPException:
+            # Legacy rows with return before departure: book the departure day
+            start, end = busy_window(row.trip_date, row.departure_datetime, None)
+        windows[row.id] = (start, end)
+        trip_updates.append({"id": row.id, "busy_from": start, "busy_until": end})
+    if trip_updates:
+        db.execute(update(Trip), trip_updates)
+
+    changes = (
+        db.query(
+            TripDriverChange.id,
+            TripDriverChange.start_time,
+            TripDriverChange.end_time,
+            Trip.busy_from,
+            Trip.busy_until,
+            Trip.id.label("trip_id"),
+        )
+        .join(Trip, Trip.id == TripDriverChange.trip_id)
+        .filter(TripDriverChange.busy_from.is_(None))
+        .all()
+    )
+    change_updates = []
+    for row in changes:
+        trip_window = windows.get(row.trip_id) or (row.busy_from, row.busy_until)
+        try:
+            start, end = segment_window(trip_window, row.start_time, row.end_time)
+        except HTTPException:
+            start, end = trip_window
+        change_updates.append({"id": row.id, "busy_from": start, "busy_until": end})
+    if change_updates:
+        db.execute(update(TripDriverChange), change_updates)
+
+    db.commit()
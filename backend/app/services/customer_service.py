@@ -1,7 +1,22 @@
+from datetime import date
+
+from sqlalchemy import Date, exists, func, literal, or_
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from app.models.customer import Customer
 from app.models.trip import Trip
+from app.utils.pagination import after_cursor, decode_cursor, encode_cursor, like_pattern
+
+# Sort keys accepted by get_customers; everything but name sorts highest first
+CUSTOMER_SORTS = ("name", "total_billed", "pending_balance", "trip_count", "last_trip_date")
+# Type of each sort key as it comes back in a cursor
+CURSOR_TYPES = {
+    "name": str,
+    "total_billed": float,
+    "pending_balance": float,
+    "trip_count": int,
+    "last_trip_date": date,
+}
 
 def create_customer(db: Session, name: str, phone: str | None = None, email: str | None = None):
     existing = db.query(Customer).filter(Customer.name == name).first()
@@ -13,8 +28,129 @@ def create_customer(db: Session, name: str, phone: str | None = None, email: str
     db.refresh(customer)
     return customer
 
-def get_customers(db: Session):
-    return db.query(Customer).all()
+def _trip_totals(db: Session):
+    """Per-customer trip aggregates, grouped once over trips.customer_id"""
+    return (
+        db.query(
+            Trip.customer_id.label("customer_id"),
+            func.count(Trip.id).label("trip_count"),
+            func.sum(Trip.total_charged).label("billed"),
+            func.sum(Trip.amount_received).label("received"),
+            func.sum(Trip.pending_amount).label("pending"),
+            func.max(Trip.trip_date).label("last_trip_date"),
+        )
+        .group_by(Trip.customer_id)
+        .subquery()
+    )
+
+
+def get_customers(
+    db: Session,
+    q: str | None = None,
+    match: str = "substring",
+    invoice: str | None = None,
+    sort: str = "name",
+    limit: int | None = None,
+    cursor: str | None = None,
+):
+    """
+    List customers with trip aggregates from a single grouped join.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    if sort not in CUSTOMER_SORTS:
+        raise HTTPException(status_code=400, detail="Invalid sort")
+
+    totals = _trip_totals(db)
+    trip_count = func.coalesce(totals.c.trip_count, 0)
+    billed = func.coalesce(totals.c.billed, 0.0)
+    received = func.coalesce(totals.c.received, 0.0)
+    pending = func.coalesce(totals.c.pending, 0.0)
+    # Customers without trips sort last when ordering by most recent trip
+    last_trip = func.coalesce(totals.c.last_trip_date, literal(date.min, Date))
+
+    query = (
+        db.query(
+            Customer,
+            trip_count.label("trip_count"),
+            billed.label("billed"),
+            received.label("received"),
+            pending.label("pending"),
+            totals.c.last_trip_date,
+        )
+        .outerjoin(totals, totals.c.customer_id == Customer.id)
+    )
+
+    if q and q.strip():
+        pattern = like_pattern(q.strip(), prefix=(match == "prefix"))
+        query = query.filter(
+            or_(
+                Customer.name.ilike(pattern, escape="\\"),
+                Customer.phone.ilike(pattern, escape="\\"),
+                Customer.email.ilike(pattern, escape="\\"),
+            )
+        )
+
+    if invoice and invoice.strip():
+        query = query.filter(
+            exists().where(
+                Trip.customer_id == Customer.id,
+                Trip.invoice_number.ilike(like_pattern(invoice.strip()), escape="\\"),
+            )
+        )
+
+    sort_column = {
+        "name": Customer.name,
+        "total_billed": billed,
+        "pending_balance": pending,
+        "trip_count": trip_count,
+        "last_trip_date": last_trip,
+    }[sort]
+    descending = sort != "name"
+
+    if cursor:
+        value, last_id = decode_cursor(cursor, CURSOR_TYPES[sort], int)
+        query = query.filter(after_cursor(sort_column, Customer.id, value, last_id, descending))
+
+    if descending:
+        query = query.order_by(sort_column.desc(), Customer.id.desc())
+    else:
+        query = query.order_by(sort_column.asc(), Customer.id.asc())
+
+    if limit:
+        query = query.limit(limit + 1)
+    rows = query.all()
+
+    next_cursor = None
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        last_value = {
+            "name": last.Customer.name,
+            "total_billed": last.billed,
+            "pending_balance": last.pending,
+            "trip_count": last.trip_count,
+            "last_trip_date": last.last_trip_date or date.min,
+        }[sort]
+        next_cursor = encode_cursor(last_value, last.Customer.id)
+
+    customers = [
+        {
+            "id": row.Customer.id,
+            "name": row.Customer.name,
+            "phone": row.Customer.phone,
+            "email": row.Customer.email,
+            "total_trips": row.Customer.total_trips,
+            "total_billed": row.Customer.total_billed,
+            "pending_balance": row.Customer.pending_balance,
+            "trip_count": row.trip_count,
+            "billed_amount": float(row.billed or 0),
+            "received_amount": float(row.received or 0),
+            "pending_amount": float(row.pending or 0),
+            "last_trip_date": row.last_trip_date,
+        }
+        for row in rows
+    ]
+    return customers, next_cursor
 
 def get_customer(db: Session, customer_id: int):
     return db.query(Customer).filter(Customer.id == customer_id).first()
@@ -0,0 +1,127 @@
+import logging
+import threading
+
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+
+from app.database.base import Base
+from app.models.data_version import DataVersion
+
+# Bookkeeping tables whose writes must not bump versions
+UNTRACKED_TABLES = {"data_versions", "report_jobs", "invoice_counters", "search_index"}
+
+_logger = logging.getLogger("app.data_versions")
+
+# Tables whose bump failed after their write committed; retried by the
+# next commit or version read of this worker
+_unbumped: set[str] = set()
+_unbumped_lock = threading.Lock()
+
+
+def _record(session: Session, tables):
+    # Bumped once the transaction commits; nothing is locked while it runs
+    tables = set(tables) - UNTRACKED_TABLES
+    if tables:
+        session.info.setdefault("written_tables", set()).update(tables)
+
+
+def _after_flush(session: Session, flush_context):
+    written = [*session.new, *session.deleted]
+    written += [obj for obj in session.dirty if session.is_modified(obj)]
+    _record(session, {obj.__table__.name for obj in written if hasattr(obj, "__table__")})
+
+
+def _on_orm_execute(orm_execute_state):
+    # Bulk insert/update/delete statements bypass the flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None:
+            _record(orm_execute_state.session, {table.name})
+
+
+def _bump(bind, tables):
+    with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for table in sorted(tables):
+            conn.execute(
+                update(DataVersion)
+                .where(DataVersion.table_name == table)
+                .values(version=DataVersion.version + 1)
+            )
+
+
+def _after_commit(session: Session):
+    """
+    Bump the versions of the tables the transaction wrote, each in its own
+    autocommit statement: a row lock lasts one UPDATE, so writers never
+    queue behind each other's transactions or deadlock on the counters.
+    Readers key caches on versions read before their rows, so a bump that
+    lands just after the commit can only make a cache entry look older
+    than its data, never newer.
+
+    The write is durable by now, so a failed bump is logged rather than
+    raised; its tables are retried with the next commit or version read
+    of this worker, which never returns versions older than its writes.
+    """
+    tables = session.info.pop("written_tables", None) or set()
+    session.info["committed_tables"] = set()
+    with _unbumped_lock:
+        tables |= _unbumped
+        _unbumped.clear()
+    if not tables:
+        return
+    try:
+        _bump(session.get_bind(), tables)
+    except Exception:
+        _logger.exception("data_versions bump failed for %s", ", ".join(sorted(tables)))
+        with _unbumped_lock:
+            _unbumped.update(tables)
+        return
+    session.info["committed_tables"] = tables
+
+
+def _after_rollback(session: Session):
+    session.info.pop("written_tables", None)
+
+
+def register_data_version_listeners():
+    """Bump data_versions after every committed ORM write, on all sessions"""
+    if not event.contains(Session, "after_flush", _after_flush):
+        event.listen(Session, "after_flush", _after_flush)
+        event.listen(Session, "do_orm_execute", _on_orm_execute)
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_rollback", _after_rollback)
+
+
+def seed_data_versions(db: Session):
+    """One counter row per tracked table; versions are only ever incremented"""
+    existing = {row.table_name for row in db.query(DataVersion.table_name)}
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing and table.name not in UNTRACKED_TABLES:
+            db.add(DataVersion(table_name=table.name, version=0))
+    db.commit()
+
+
+def committed_tables(db: Session) -> set:
+    """Tables whose versions the session's last commit bumped (once each)"""
+    return db.info.get("committed_tables") or set()
+
+
+def data_versions(db: Session, tables) -> dict:
+    if _unbumped:
+        # Bumps that failed after a commit land first; if they fail again
+        # the read fails too, rather than key a cache on versions that
+        # predate this worker's writes
+        with _unbumped_lock:
+            pending = set(_unbumped)
+            _unbumped.clear()
+        try:
+            _bump(db.get_bind(), pending)
+        except Exception:
+            with _unbumped_lock:
+                _unbumped.update(pending)
+            raise
+    rows = db.execute(
+        select(DataVersion.table_name, DataVersion.version).where(DataVersion.table_name.in_(tables))
+    )
+    versions = {name: version for name, version in rows}
+    return {name: versions.get(name, 0) for name in sorted(tables)}
@@ -1,6 +1,9 @@
 from sqlalchemy.orm import Session
+from app.models.driver import Driver
 from app.models.driver_expense import DriverExpense
+from app.models.trip import Trip
 from app.schemas.driver_expense import DriverExpenseCreate, DriverExpenseUpdate
+from app.utils.bulk import bulk_insert, bulk_results, check_bulk_size, raise_item_errors
 from typing import List, Optional
 
 class DriverExpenseService:
@@ -14,6 +17,36 @@ class DriverExpenseService:
         self.db.refresh(db_expense)
         return db_expense
 
+    def create_expenses_bulk(self, expenses: List[DriverExpenseCreate]) -> dict:
+        """
+        Many expenses at once: trips and drivers checked in one query each,
+        one INSERT, one commit. Nothing is written when any item is invalid.
+        """
+        check_bulk_size(expenses)
+
+        trip_ids = {
+            trip_id for (trip_id,) in
+            self.db.query(Trip.id).filter(Trip.id.in_({e.trip_id for e in expenses}))
+        }
+        driver_ids = {
+            driver_id for (driver_id,) in
+            self.db.query(Driver.id).filter(Driver.id.in_({e.driver_id for e in expenses}))
+        }
+
+        errors = []
+        for index, expense in enumerate(expenses):
+            if expense.trip_id not in trip_ids:
+                errors.append((index, f"Trip {expense.trip_id} not found"))
+            elif expense.driver_id not in driver_ids:
+                errors.append((index, f"Driver {expense.driver_id} not found"))
+            elif expense.amount <= 0:
+                errors.append((index, "Amount must be positive"))
+        raise_item_errors(errors)
+
+        ids = bulk_insert(self.db, DriverExpense, [expense.dict() for expense in expenses])
+        self.db.commit()
+        return bulk_results(ids)
+
     def get_expenses_by_trip(self, trip_id: int) -> List[DriverExpense]:
         return self.db.query(DriverExpense).filter(DriverExpense.trip_id == trip_id).all()
 
@@ -1,6 +1,8 @@
 from sqlalchemy.orm import Session
+from app.models.driver import Driver
 from app.models.driver_salary import DriverSalary
 from app.schemas.driver_salary import DriverSalaryCreate
+from app.utils.bulk import bulk_insert, bulk_results, check_bulk_size, raise_item_errors
 
 
 def list_salaries_by_driver(db: Session, driver_id: int):
@@ -20,6 +22,31 @@ def create_salary(db: Session, data: DriverSalaryCreate):
     return salary
 
 
+def create_salaries_bulk(db: Session, items: list[DriverSalaryCreate]):
+    """
+    A month of salary payments at once: drivers checked in one query,
+    one INSERT, one commit. Nothing is written when any item is invalid.
+    """
+    check_bulk_size(items)
+
+    driver_ids = {
+        driver_id for (driver_id,) in
+        db.query(Driver.id).filter(Driver.id.in_({item.driver_id for item in items}))
+    }
+
+    errors = []
+    for index, item in enumerate(items):
+        if item.driver_id not in driver_ids:
+            errors.append((index, f"Driver {item.driver_id} not found"))
+        elif item.amount <= 0:
+            errors.append((index, "Amount must be positive"))
+    raise_item_errors(errors)
+
+    ids = bulk_insert(db, DriverSalary, [item.dict() for item in items])
+    db.commit()
+    return bulk_results(ids)
+
+
 def delete_salary(db: Session, salary_id: int):
     salary = db.query(DriverSalary).filter(DriverSalary.id == salary_id).first()
     if salary:
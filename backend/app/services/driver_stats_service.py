@@ -0,0 +1,150 @@
+from datetime import datetime, time, timedelta
+
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, case, false, func, or_, select
+
+from app.models.driver import Driver
+from app.models.trip import Trip
+from app.models.trip_driver_change import TripDriverChange
+from app.models.driver_expense import DriverExpense
+from app.models.driver_salary import DriverSalary
+from app.utils.dates import month_bounds
+
+
+def _sum_if(condition, column):
+    return func.coalesce(func.sum(case((condition, column), else_=0)), 0)
+
+
+def driver_overview(db: Session, driver_id: int, month: str | None = None, recent: int = 5):
+    driver = db.query(Driver).filter(Driver.id == driver_id).first()
+    if not driver:
+        return None  # handled in route with 404
+
+    if month:
+        start_date, end_date = month_bounds(month)
+        start_dt = datetime.combine(start_date, time.min)
+        end_dt = datetime.combine(end_date + timedelta(days=1), time.min)
+        trip_in_month = Trip.trip_date.between(start_date, end_date)
+        expense_in_month = and_(DriverExpense.created_at >= start_dt, DriverExpense.created_at < end_dt)
+    else:
+        trip_in_month = expense_in_month = false()
+
+    # -------- TRIPS (PRIMARY DRIVER OR DRIVER-CHANGE SEGMENT) --------
+    changed_trip_ids = select(TripDriverChange.trip_id).where(
+        TripDriverChange.driver_id == driver_id
+    )
+    is_primary = Trip.driver_id == driver_id
+
+    trips = (
+        db.query(
+            func.count(Trip.id).label("count"),
+            _sum_if(~is_primary, 1).label("relief_count"),
+            func.coalesce(func.sum(Trip.total_charged), 0).label("revenue"),
+            func.coalesce(func.sum(Trip.distance_km), 0).label("km"),
+            _sum_if(is_primary, Trip.driver_bhatta).label("bhatta"),
+            _sum_if(trip_in_month, 1).label("month_count"),
+            _sum_if(and_(trip_in_month, ~is_primary), 1).label("month_relief_count"),
+            _sum_if(trip_in_month, Trip.total_charged).label("month_revenue"),
+            _sum_if(trip_in_month, Trip.distance_km).label("month_km"),
+            _sum_if(and_(trip_in_month, is_primary), Trip.driver_bhatta).label("month_bhatta"),
+        )
+        .filter(or_(is_primary, Trip.id.in_(changed_trip_ids)))
+        .one()
+    )
+
+    # -------- EXPENSES GROUPED BY TRIP --------
+    expense_totals = (
+        db.query(
+            func.count(DriverExpense.id).label("count"),
+            func.coalesce(func.sum(DriverExpense.amount), 0).label("total"),
+            _sum_if(expense_in_month, DriverExpense.amount).label("month_total"),
+        )
+        .filter(DriverExpense.driver_id == driver_id)
+        .one()
+    )
+
+    expenses_by_trip = (
+        db.query(
+            DriverExpense.trip_id,
+            Trip.invoice_number,
+            Trip.trip_date,
+            Trip.from_location,
+            Trip.to_location,
+            func.count(DriverExpense.id).label("items"),
+            func.sum(DriverExpense.amount).label("total"),
+            func.max(DriverExpense.created_at).label("last_entry_at"),
+        )
+        .join(Trip, Trip.id == DriverExpense.trip_id)
+        .filter(DriverExpense.driver_id == driver_id)
+        .group_by(
+            DriverExpense.trip_id,
+            Trip.invoice_number,
+            Trip.trip_date,
+            Trip.from_location,
+            Trip.to_location,
+        )
+        .order_by(func.max(DriverExpense.created_at).desc())
+        .all()
+    )
+
+    # -------- SALARY --------
+    salary_query = db.query(func.coalesce(func.sum(DriverSalary.amount), 0)).filter(
+        DriverSalary.driver_id == driver_id
+    )
+    if month:
+        salary_query = salary_query.filter(DriverSalary.paid_on.between(start_date, end_date))
+    salary_paid = float(salary_query.scalar() or 0)
+
+    recent_salaries = (
+        db.query(DriverSalary)
+        .filter(DriverSalary.driver_id == driver_id)
+        .order_by(DriverSalary.paid_on.desc(), DriverSalary.id.desc())
+        .limit(recent)
+        .all()
+    )
+
+    monthly_salary = float(driver.monthly_salary or 0)
+
+    return {
+        "driver": driver,
+        "month": month,
+        "trips": {
+            "count": trips.count,
+            "relief_count": int(trips.relief_count),
+            "revenue": float(trips.revenue),
+            "km": float(trips.km),
+            "bhatta": float(trips.bhatta),
+        },
+        "month_trips": {
+            "count": int(trips.month_count),
+            "relief_count": int(trips.month_relief_count),
+            "revenue": float(trips.month_revenue),
+            "km": float(trips.month_km),
+            "bhatta": float(trips.month_bhatta),
+        } if month else None,
+        "expenses": {
+            "count": expense_totals.count,
+            "total": float(expense_totals.total),
+            "month_total": float(expense_totals.month_total) if month else None,
+            "by_trip": [
+                {
+                    "trip_id": row.trip_id,
+                    "invoice_number": row.invoice_number,
+                    "trip_date": row.trip_date,
+                    "from_location": row.from_location,
+                    "to_location": row.to_location,
+                    "items": row.items,
+                    "total": float(row.total or 0),
+                    "last_entry_at": row.last_entry_at,
+                }
+                for row in expenses_by_trip
+            ],
+        },
+        "salary": {
+            "monthly_salary": monthly_salary,
+            "paid": salary_paid,
+            # Only meaningful for a single month
+            "balance": monthly_salary - salary_paid if month else None,
+        },
+        "recent_salaries": recent_salaries,
+    }
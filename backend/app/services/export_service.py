@@ -0,0 +1,257 @@
+import csv
+import io
+import json
+from datetime import date, datetime, timedelta
+
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from app.database.session import SessionLocal
+from app.models.trip import Trip
+from app.models.payment import Payment
+from app.models.fuel import Fuel
+from app.models.spare_part import SparePart
+from app.models.maintenance import Maintenance
+from app.models.driver_expense import DriverExpense
+from app.models.vendor_payment import VendorPayment
+from app.models.vendor import Vendor
+from app.models.driver import Driver
+from app.models.customer import Customer
+
+# Rows fetched per round trip from the server-side cursor, and per chunk sent
+EXPORT_BATCH_SIZE = 1000
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _trips():
+    return (
+        select(
+            Trip.id,
+            Trip.invoice_number,
+            Trip.trip_date,
+            Trip.departure_datetime,
+            Trip.return_datetime,
+            Trip.from_location,
+            Trip.to_location,
+            Trip.vehicle_number,
+            Driver.name.label("driver"),
+            Customer.name.label("customer"),
+            Trip.pricing_type,
+            Trip.start_km,
+            Trip.end_km,
+            Trip.distance_km,
+            Trip.total_charged,
+            Trip.amount_received,
+            Trip.pending_amount,
+            Trip.total_cost,
+            Trip.diesel_used,
+            Trip.petrol_used,
+            Trip.toll_amount,
+            Trip.parking_amount,
+            Trip.other_expenses,
+            Trip.driver_bhatta,
+            Trip.vendor,
+        )
+        .outerjoin(Driver, Driver.id == Trip.driver_id)
+        .outerjoin(Customer, Customer.id == Trip.customer_id)
+    )
+
+
+def _payments():
+    return (
+        select(
+            Payment.id,
+            Payment.invoice_number,
+            Payment.trip_id,
+            Trip.vehicle_number,
+            Payment.payment_date,
+            Payment.payment_mode,
+            Payment.amount,
+            Payment.notes,
+        )
+        .join(Trip, Trip.id == Payment.trip_id)
+    )
+
+
+def _fuel():
+    return select(
+        Fuel.id,
+        Fuel.filled_date,
+        Fuel.vehicle_number,
+        Fuel.fuel_type,
+        Fuel.quantity,
+        Fuel.rate_per_litre,
+        Fuel.total_cost,
+        Fuel.vendor,
+    )
+
+
+def _spare_parts():
+    return select(
+        SparePart.id,
+        SparePart.replaced_date,
+        SparePart.vehicle_number,
+        SparePart.part_name,
+        SparePart.cost,
+        SparePart.quantity,
+        (SparePart.cost * SparePart.quantity).label("total"),
+        SparePart.vendor,
+    )
+
+
+def _maintenance():
+    return select(
+        Maintenance.id,
+        Maintenance.vehicle_number,
+        Maintenance.maintenance_type,
+        Maintenance.description,
+        Maintenance.amount,
+        Maintenance.start_date,
+        Maintenance.end_date,
+    )
+
+
+def _driver_expenses():
+    return (
+        select(
+            DriverExpense.id,
+            DriverExpense.created_at,
+            DriverExpense.trip_id,
+            Trip.invoice_number,
+            Trip.vehicle_number,
+            DriverExpense.driver_id,
+            Driver.name.label("driver"),
+            DriverExpense.description,
+            DriverExpense.amount,
+            DriverExpense.notes,
+        )
+        .join(Trip, Trip.id == DriverExpense.trip_id)
+        .outerjoin(Driver, Driver.id == DriverExpense.driver_id)
+    )
+
+
+def _vendor_payments():
+    return (
+        select(
+            VendorPayment.id,
+            VendorPayment.paid_on,
+            VendorPayment.vendor_id,
+            Vendor.name.label("vendor"),
+            VendorPayment.amount,
+            VendorPayment.notes,
+        )
+        .outerjoin(Vendor, Vendor.id == VendorPayment.vendor_id)
+    )
+
+
+# entity -> row select, the date and vehicle columns it is filtered on,
+# the primary key it is ordered by and the tables its rows come from
+EXPORTS = {
+    "trips": {
+        "query": _trips, "date": Trip.trip_date, "vehicle": Trip.vehicle_number,
+        "order": Trip.id, "tables": ("trips", "drivers", "customers"),
+    },
+    "payments": {
+        "query": _payments, "date": Payment.payment_date, "vehicle": Trip.vehicle_number,
+        "order": Payment.id, "tables": ("payments", "trips"),
+    },
+    "fuel": {
+        "query": _fuel, "date": Fuel.filled_date, "vehicle": Fuel.vehicle_number,
+        "order": Fuel.id, "tables": ("fuel_entries",),
+    },
+    "spare_parts": {
+        "query": _spare_parts, "date": SparePart.replaced_date, "vehicle": SparePart.vehicle_number,
+        "order": SparePart.id, "tables": ("spare_parts",),
+    },
+    "maintenance": {
+        "query": _maintenance, "date": Maintenance.start_date, "vehicle": Maintenance.vehicle_number,
+        "order": Maintenance.id, "tables": ("maintenance",),
+    },
+    "driver_expenses": {
+        "query": _driver_expenses, "date": DriverExpense.created_at, "vehicle": Trip.vehicle_number,
+        "order": DriverExpense.id, "tables": ("driver_expenses", "trips", "drivers"),
+    },
+    "vendor_payments": {
+        "query": _vendor_payments, "date": VendorPayment.paid_on, "vehicle": None,
+        "order": VendorPayment.id, "tables": ("vendor_payments", "vendors"),
+    },
+}
+
+
+def export_select(entity: str, date_from=None, date_to=None, vehicle_number: str | None = None):
+    """Rows of an export entity in primary key order, filtered to [date_from, date_to]"""
+    export = EXPORTS[entity]
+    stmt = export["query"]()
+    if date_from:
+        stmt = stmt.where(export["date"] >= date_from)
+    if date_to:
+        # Exclusive upper bound also covers datetime columns on the last day
+        stmt = stmt.where(export["date"] < date_to + timedelta(days=1))
+    if vehicle_number:
+        if export["vehicle"] is None:
+            raise HTTPException(status_code=400, detail=f"{entity} cannot be filtered by vehicle")
+        stmt = stmt.where(export["vehicle"] == vehicle_number)
+    return stmt.order_by(export["order"])
+
+
+# ===============================
+# STREAMING
+# ===============================
+
+def _json_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if hasattr(value, "value"):  # enums
+        return value.value
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _ndjson_chunks(keys, batches):
+    for batch in batches:
+        yield "".join(
+            json.dumps(dict(zip(keys, row)), default=_json_value, ensure_ascii=False) + "\n"
+            for row in batch
+        ).encode()
+
+
+def _csv_chunks(keys, batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(keys)
+    for batch in batches:
+        writer.writerows(
+            [getattr(value, "value", value) for value in row] for row in batch
+        )
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+ENCODERS = {"ndjson": _ndjson_chunks, "csv": _csv_chunks}
+
+
+def _counted(batches, stats):
+    for batch in batches:
+        stats["rows"] += len(batch)
+        yield batch
+
+
+def stream_export(stmt, fmt: str, stats: dict | None = None):
+    """
+    Encoded chunks of an export, one per EXPORT_BATCH_SIZE rows.
+
+    Runs on its own session, which stays open for as long as the response
+    streams; rows come from a server-side cursor (yield_per), so memory
+    holds one batch regardless of table size. `stats["rows"]` is counted
+    up as batches are read, when given.
+    """
+    db = SessionLocal()
+    try:
+        result = db.connection().execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        batches = result.partitions()
+        if stats is not None:
+            batches = _counted(batches, stats)
+        yield from ENCODERS[fmt](list(result.keys()), batches)
+    finally:
+        db.close()
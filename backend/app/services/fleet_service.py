@@ -0,0 +1,110 @@
+from datetime import date, datetime, time, timedelta, timezone
+
+from sqlalchemy.orm import Session
+
+from app.models.trip import Trip
+from app.models.vehicle import Vehicle
+from app.utils.dates import month_bounds
+
+
+def _day_runs(rows, period_start: date, days: int):
+    """
+    Merge (busy_from, busy_until) windows, already ordered by busy_from,
+    into [first_day_offset, length] runs of occupied days in the period.
+    """
+    runs = []
+    for busy_from, busy_until in rows:
+        # Days are UTC days, like the windows; SQLite returns them naive (UTC)
+        busy_from, busy_until = (
+            value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+            for value in (busy_from, busy_until)
+        )
+        # busy_until is exclusive: a trip ending at midnight does not occupy that day
+        first = max((busy_from.date() - period_start).days, 0)
+        last = min(((busy_until - timedelta(microseconds=1)).date() - period_start).days, days - 1)
+        if last < first:
+            continue
+        if runs and first <= runs[-1][0] + runs[-1][1]:
+            runs[-1][1] = max(runs[-1][1], last - runs[-1][0] + 1)
+        else:
+            runs.append([first, last - first + 1])
+    return runs
+
+
+def _runs_to_bits(runs) -> int:
+    bits = 0
+    for first, length in runs:
+        bits |= ((1 << length) - 1) << first
+    return bits
+
+
+def _month_masks(period_start: date, period_end: date):
+    """[(YYYY-MM, bitmask of its days, day count)] covering the period"""
+    masks = []
+    cursor = period_start
+    while cursor <= period_end:
+        first, last = month_bounds(f"{cursor.year:04d}-{cursor.month:02d}")
+        first, last = max(first, period_start), min(last, period_end)
+        length = (last - first).days + 1
+        offset = (first - period_start).days
+        masks.append((f"{first.year:04d}-{first.month:02d}", ((1 << length) - 1) << offset, length))
+        cursor = last + timedelta(days=1)
+    return masks
+
+
+def _percent(part, whole):
+    return round(part * 100 / whole, 2) if whole else 0.0
+
+
+def fleet_calendar(db: Session, period_start: date, period_end: date):
+    """
+    Vehicles x days occupancy for a period, encoded per vehicle as
+    run-length [day_offset, length] pairs and a hex bitmap (bit i = day i
+    after `from`), with utilization derived from the same bits.
+    """
+    days = (period_end - period_start).days + 1
+    start_dt = datetime.combine(period_start, time.min, timezone.utc)
+    end_dt = datetime.combine(period_end + timedelta(days=1), time.min, timezone.utc)
+
+    # Single ordered scan over the (vehicle_number, busy_from) index
+    rows = (
+        db.query(Trip.vehicle_number, Trip.busy_from, Trip.busy_until)
+        .filter(Trip.vehicle_number.isnot(None), Trip.busy_from < end_dt, Trip.busy_until > start_dt)
+        .order_by(Trip.vehicle_number, Trip.busy_from)
+    )
+
+    windows = {}
+    for row in rows:
+        windows.setdefault(row.vehicle_number, []).append((row.busy_from, row.busy_until))
+
+    active = [
+        v.vehicle_number
+        for v in db.query(Vehicle.vehicle_number).filter(Vehicle.is_deleted == False)  # noqa: E712
+    ]
+    vehicle_numbers = sorted(set(active) | set(windows))
+
+    months = _month_masks(period_start, period_end)
+    vehicles = []
+    occupied_total = 0
+    for vehicle_number in vehicle_numbers:
+        runs = _day_runs(windows.get(vehicle_number, ()), period_start, days)
+        bits = _runs_to_bits(runs)
+        occupied = bits.bit_count()
+        occupied_total += occupied
+        vehicles.append({
+            "vehicle_number": vehicle_number,
+            "runs": runs,
+            "bitmap": format(bits, "x"),
+            "occupied_days": occupied,
+            "utilization": _percent(occupied, days),
+            "monthly_utilization": [_percent((bits & mask).bit_count(), length) for _, mask, length in months],
+        })
+
+    return {
+        "from": period_start,
+        "to": period_end,
+        "days": days,
+        "months": [month for month, _, _ in months],
+        "fleet_utilization": _percent(occupied_total, days * len(vehicles)),
+        "vehicles": vehicles,
+    }
@@ -0,0 +1,189 @@
+from collections import defaultdict
+from datetime import date
+
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, func, select, union_all
+
+from app.models.fuel import Fuel
+from app.models.trip import Trip
+
+# Fleet-wide percentiles reported for km/l and cost/km
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def _fill_intervals():
+    """
+    Fuel taken on by each vehicle per day (fuel entries plus fuel bought on
+    trips), with the date of the vehicle's next fill from LEAD() over
+    fill_date. The fuel of one fill is burnt over the km driven until the next.
+    """
+    fills = union_all(
+        select(
+            Fuel.vehicle_number.label("vehicle_number"),
+            Fuel.filled_date.label("fill_date"),
+            Fuel.quantity.label("litres"),
+            Fuel.total_cost.label("cost"),
+        ),
+        select(
+            Trip.vehicle_number,
+            Trip.trip_date,
+            Trip.fuel_litres,
+            func.coalesce(Trip.diesel_used, 0) + func.coalesce(Trip.petrol_used, 0),
+        ).where(Trip.fuel_litres > 0),
+    ).subquery()
+
+    # Several fills on one day count as one, so no interval is empty
+    daily = (
+        select(
+            fills.c.vehicle_number,
+            fills.c.fill_date,
+            func.sum(fills.c.litres).label("litres"),
+            func.sum(fills.c.cost).label("cost"),
+        )
+        .group_by(fills.c.vehicle_number, fills.c.fill_date)
+        .subquery()
+    )
+
+    return select(
+        daily,
+        func.lead(daily.c.fill_date)
+        .over(partition_by=daily.c.vehicle_number, order_by=daily.c.fill_date)
+        .label("next_fill"),
+    ).subquery()
+
+
+def _ratio(numerator, denominator, digits=2):
+    return round(numerator / denominator, digits) if denominator else None
+
+
+def _percentile(values, pct):
+    """Linear-interpolated percentile of a sorted list"""
+    if not values:
+        return None
+    position = (len(values) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return round(values[lower] + (values[upper] - values[lower]) * (position - lower), 2)
+
+
+def _percentile_rank(values, value):
+    """Share of the fleet (in %) with a strictly lower value"""
+    if value is None or not values:
+        return None
+    return round(sum(1 for v in values if v < value) * 100 / len(values), 1)
+
+
+def _totals(km, litres, cost):
+    return {
+        "km": round(km, 1),
+        "litres": round(litres, 2),
+        "fuel_cost": round(cost, 2),
+        "km_per_litre": _ratio(km, litres),
+        "cost_per_km": _ratio(cost, km),
+    }
+
+
+def fuel_efficiency(
+    db: Session,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    vehicle_number: str | None = None,
+):
+    """
+    km per litre and fuel cost per km per vehicle and month, from the fill
+    intervals that start in [date_from, date_to].
+
+    km for an interval comes from trip odometer readings in it
+    (max end_km - min start_km), falling back to the sum of distance_km
+    when trips have no readings. The open interval after each vehicle's
+    latest fill is skipped. Everything is one grouped query for the fleet;
+    `vehicle_number` only narrows the vehicles returned, percentiles stay
+    fleet-wide.
+    """
+    intervals = _fill_intervals()
+
+    conditions = [intervals.c.next_fill.isnot(None)]
+    if date_from:
+        conditions.append(intervals.c.fill_date >= date_from)
+    if date_to:
+        conditions.append(intervals.c.fill_date <= date_to)
+
+    rows = (
+        db.query(
+            intervals.c.vehicle_number,
+            intervals.c.fill_date,
+            intervals.c.litres,
+            intervals.c.cost,
+            func.min(func.nullif(Trip.start_km, 0)).label("first_odometer"),
+            func.max(func.nullif(Trip.end_km, 0)).label("last_odometer"),
+            func.sum(Trip.distance_km).label("distance"),
+        )
+        .select_from(intervals)
+        .outerjoin(
+            Trip,
+            and_(
+                Trip.vehicle_number == intervals.c.vehicle_number,
+                Trip.trip_date >= intervals.c.fill_date,
+                Trip.trip_date < intervals.c.next_fill,
+            ),
+        )
+        .filter(*conditions)
+        .group_by(
+            intervals.c.vehicle_number,
+            intervals.c.fill_date,
+            intervals.c.litres,
+            intervals.c.cost,
+        )
+        .order_by(intervals.c.vehicle_number, intervals.c.fill_date)
+        .all()
+    )
+
+    # vehicle -> month -> [km, litres, cost]
+    by_month = defaultdict(lambda: defaultdict(lambda: [0.0, 0.0, 0.0]))
+    for row in rows:
+        odometer_km = (row.last_odometer or 0) - (row.first_odometer or 0)
+        km = odometer_km if row.first_odometer and odometer_km > 0 else float(row.distance or 0)
+
+        bucket = by_month[row.vehicle_number][f"{row.fill_date.year:04d}-{row.fill_date.month:02d}"]
+        bucket[0] += km
+        bucket[1] += float(row.litres or 0)
+        bucket[2] += float(row.cost or 0)
+
+    vehicles = []
+    for vehicle, months in sorted(by_month.items()):
+        km = sum(m[0] for m in months.values())
+        litres = sum(m[1] for m in months.values())
+        cost = sum(m[2] for m in months.values())
+        vehicles.append({
+            "vehicle_number": vehicle,
+            **_totals(km, litres, cost),
+            "periods": [
+                {"month": month, **_totals(*values)}
+                for month, values in sorted(months.items())
+            ],
+        })
+
+    km_per_litre = sorted(v["km_per_litre"] for v in vehicles if v["km_per_litre"] is not None)
+    cost_per_km = sorted(v["cost_per_km"] for v in vehicles if v["cost_per_km"] is not None)
+
+    for v in vehicles:
+        v["km_per_litre_rank"] = _percentile_rank(km_per_litre, v["km_per_litre"])
+        # Lower cost per km is better, so rank by how many vehicles cost more
+        v["cost_per_km_rank"] = (
+            _percentile_rank([-c for c in cost_per_km], -v["cost_per_km"])
+            if v["cost_per_km"] is not None else None
+        )
+
+    fleet = _totals(
+        sum(v["km"] for v in vehicles),
+        sum(v["litres"] for v in vehicles),
+        sum(v["fuel_cost"] for v in vehicles),
+    )
+    fleet["vehicle_count"] = len(vehicles)
+    fleet["km_per_litre_percentiles"] = {f"p{p}": _percentile(km_per_litre, p) for p in PERCENTILES}
+    fleet["cost_per_km_percentiles"] = {f"p{p}": _percentile(cost_per_km, p) for p in PERCENTILES}
+
+    if vehicle_number:
+        vehicles = [v for v in vehicles if v["vehicle_number"] == vehicle_number]
+
+    return {"from": date_from, "to": date_to, "fleet": fleet, "vehicles": vehicles}
@@ -4,6 +4,8 @@ from fastapi import HTTPException
 from app.models.fuel import Fuel
 from app.models.vehicle import Vehicle
 from app.schemas.fuel import FuelCreate
+from app.services.vendor_service import resolve_vendor_id, resolve_vendor_ids, vendor_id_for
+from app.utils.bulk import bulk_insert, bulk_results, check_bulk_size, raise_item_errors
 
 def add_fuel(db: Session, data: FuelCreate):
     vehicle = db.query(Vehicle).filter(
@@ -22,7 +24,8 @@ def add_fuel(db: Session, data: FuelCreate):
         rate_per_litre=data.rate_per_litre,
         total_cost=total_cost,
         filled_date=data.filled_date,
-        vendor=data.vendor
+        vendor=data.vendor,
+        vendor_id=resolve_vendor_id(db, data.vendor)
     )
 
     db.add(fuel)
@@ -31,6 +34,46 @@ def add_fuel(db: Session, data: FuelCreate):
     return fuel
 
 
+def add_fuel_bulk(db: Session, items: list[FuelCreate]):
+    """
+    Many fills at once (e.g. a fuel card statement): validated together,
+    one vehicle and one vendor lookup, one INSERT, one commit.
+    Nothing is written when any item is invalid.
+    """
+    check_bulk_size(items)
+
+    numbers = {item.vehicle_number for item in items}
+    known = {
+        number for (number,) in
+        db.query(Vehicle.vehicle_number).filter(Vehicle.vehicle_number.in_(numbers))
+    }
+
+    errors = []
+    for index, item in enumerate(items):
+        if item.vehicle_number not in known:
+            errors.append((index, f"Vehicle {item.vehicle_number} not found"))
+        elif item.quantity <= 0 or item.rate_per_litre <= 0:
+            errors.append((index, "Quantity and rate must be positive"))
+    raise_item_errors(errors)
+
+    vendor_ids = resolve_vendor_ids(db, (item.vendor for item in items))
+    ids = bulk_insert(db, Fuel, [
+        {
+            "vehicle_number": item.vehicle_number,
+            "fuel_type": item.fuel_type,
+            "quantity": item.quantity,
+            "rate_per_litre": item.rate_per_litre,
+            "total_cost": item.quantity * item.rate_per_litre,
+            "filled_date": item.filled_date,
+            "vendor": item.vendor,
+            "vendor_id": vendor_id_for(vendor_ids, item.vendor),
+        }
+        for item in items
+    ])
+    db.commit()
+    return bulk_results(ids)
+
+
 def fuel_history_by_vehicle(db: Session, vehicle_number: str):
     return db.query(Fuel).filter(
         Fuel.vehicle_number == vehicle_number
@@ -63,6 +106,7 @@ def update_fuel(db: Session, fuel_id: int, data):
     fuel.total_cost = data.quantity * data.rate_per_litre
     fuel.filled_date = data.filled_date
     fuel.vendor = data.vendor
+    fuel.vendor_id = resolve_vendor_id(db, data.vendor)
 
     db.commit()
     db.refresh(fuel)
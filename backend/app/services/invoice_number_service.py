@@ -0,0 +1,209 @@
+import os
+import re
+import string
+from datetime import date
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from sqlalchemy import case, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.models.trip import Trip
+from app.models.invoice_counter import InvoiceCounter
+
+DEFAULT_SERIES = os.getenv("INVOICE_SERIES", "INV")
+# Financial year runs April-March
+FY_START_MONTH = 4
+# {series}, {fy} and {seq}; the sequence must come last (see _highest_issued)
+INVOICE_NUMBER_FORMAT = os.getenv("INVOICE_NUMBER_FORMAT", "{series}-{fy}-{seq:05d}")
+
+SERIES_PATTERN = re.compile(r"^[A-Z0-9]{1,10}$")
+
+_UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+_FIELD_PATTERNS = {"series": r"[A-Z0-9]{1,10}", "fy": r"\d{4}-\d{2}", "seq": r"\d+"}
+
+
+def _number_pattern(fmt: str):
+    """Regex matching numbers made by INVOICE_NUMBER_FORMAT, capturing its fields"""
+    parts = []
+    for literal, field, _, _ in string.Formatter().parse(fmt):
+        parts.append(re.escape(literal))
+        if field:
+            parts.append(f"(?P<{field}>{_FIELD_PATTERNS[field]})")
+    return re.compile("^" + "".join(parts) + "$")
+
+
+NUMBER_PATTERN = _number_pattern(INVOICE_NUMBER_FORMAT)
+
+
+def _upsert(db: Session):
+    """INSERT ... ON CONFLICT for the counters, or None where the database has none"""
+    upsert = _UPSERTS.get(db.bind.dialect.name)
+    return upsert(InvoiceCounter) if upsert else None
+
+
+def _create_counter(db: Session, series: str, fy: str, value: int) -> bool:
+    """
+    Plain insert of a counter in a savepoint, for databases without ON
+    CONFLICT; False when a concurrent request created it first.
+    """
+    try:
+        with db.begin_nested():
+            db.execute(insert(InvoiceCounter).values(series=series, fiscal_year=fy, last_value=value))
+    except IntegrityError:
+        return False
+    return True
+
+
+def fiscal_year(day: date) -> str:
+    start = day.year if day.month >= FY_START_MONTH else day.year - 1
+    return f"{start}-{(start + 1) % 100:02d}"
+
+
+def format_invoice_number(series: str, fy: str, seq: int) -> str:
+    return INVOICE_NUMBER_FORMAT.format(series=series, fy=fy, seq=seq)
+
+
+def _highest_issued(db: Session, series: str, fy: str) -> int:
+    """
+    Highest sequence already on a trip for (series, fy), so a counter
+    created next to hand-entered numbers in the same format starts above them.
+    """
+    prefix = INVOICE_NUMBER_FORMAT.split("{seq")[0].format(series=series, fy=fy)
+    numbers = db.execute(
+        select(Trip.invoice_number).where(Trip.invoice_number.like(f"{prefix}%"))
+    ).scalars()
+    return max(
+        (int(n[len(prefix):]) for n in numbers if n[len(prefix):].isdigit()),
+        default=0,
+    )
+
+
+def _raise_counter(db: Session, series: str, fy: str, floor: int):
+    """Move the (series, fy) counter up to at least `floor`, creating it if needed"""
+    raise_to_floor = (
+        update(InvoiceCounter)
+        .where(InvoiceCounter.series == series, InvoiceCounter.fiscal_year == fy)
+        .values(last_value=case((InvoiceCounter.last_value < floor, floor), else_=InvoiceCounter.last_value))
+    )
+    if db.execute(raise_to_floor).rowcount:
+        return
+
+    value = max(floor, _highest_issued(db, series, fy))
+    upsert = _upsert(db)
+    if upsert is None:
+        if not _create_counter(db, series, fy, value):
+            # Created meanwhile: it exists now
+            db.execute(raise_to_floor)
+        return
+    db.execute(
+        upsert.values(series=series, fiscal_year=fy, last_value=value)
+        .on_conflict_do_update(
+            index_elements=[InvoiceCounter.series, InvoiceCounter.fiscal_year],
+            set_={
+                "last_value": case(
+                    (InvoiceCounter.last_value < floor, floor), else_=InvoiceCounter.last_value
+                )
+            },
+        )
+    )
+
+
+def _issued(db: Session, invoice_number: str) -> bool:
+    return db.execute(
+        select(Trip.id).where(Trip.invoice_number == invoice_number).limit(1)
+    ).first() is not None
+
+
+def _increment(db: Session, series: str, fy: str) -> int:
+    """
+    Add one to the (series, fy) counter, creating it on first use; returns
+    the new value. The row stays locked until the caller commits.
+    """
+    counter = (InvoiceCounter.series == series, InvoiceCounter.fiscal_year == fy)
+    upsert = _upsert(db)
+    if upsert is not None:
+        # Usual case: the year's counter exists
+        seq = db.execute(
+            update(InvoiceCounter)
+            .where(*counter)
+            .values(last_value=InvoiceCounter.last_value + 1)
+            .returning(InvoiceCounter.last_value)
+        ).scalar()
+        if seq is None:
+            seq = db.execute(
+                upsert.values(series=series, fiscal_year=fy, last_value=_highest_issued(db, series, fy) + 1)
+                .on_conflict_do_update(
+                    index_elements=[InvoiceCounter.series, InvoiceCounter.fiscal_year],
+                    set_={"last_value": InvoiceCounter.last_value + 1},
+                )
+                .returning(InvoiceCounter.last_value)
+            ).scalar()
+        return seq
+
+    # Other databases (e.g. MySQL: no RETURNING, no ON CONFLICT): lock the
+    # row with SELECT ... FOR UPDATE, then write it
+    locked = select(InvoiceCounter.last_value).where(*counter).with_for_update()
+    last = db.execute(locked).scalar()
+    if last is None:
+        seq = _highest_issued(db, series, fy) + 1
+        if _create_counter(db, series, fy, seq):
+            return seq
+        last = db.execute(locked).scalar()
+    db.execute(update(InvoiceCounter).where(*counter).values(last_value=last + 1))
+    return last + 1
+
+
+def allocate_invoice_number(db: Session, trip_date: date, series: str | None = None) -> str:
+    """
+    Next invoice number for the trip's financial year, in the caller's
+    transaction.
+
+    The counter row is incremented with a single UPDATE ... RETURNING, which
+    row-locks it until the caller commits or rolls back: concurrent bookings
+    in the same series queue on that lock instead of colliding, and a rolled
+    back trip rolls its number back too, so numbers stay gap-free. The first
+    allocation of a year inserts the row with ON CONFLICT DO UPDATE, which
+    is just as safe when two requests race to create it. Databases without
+    RETURNING / ON CONFLICT lock the row with SELECT ... FOR UPDATE instead.
+    Hand-entered numbers in the same format move the counter past them
+    (reserve_invoice_number); should one still be ahead of the counter,
+    e.g. saved before that existed, the counter skips to the highest
+    number issued instead of failing every later booking.
+    Allocate as late as possible before commit to keep the lock short.
+    """
+    series = (series or DEFAULT_SERIES).strip().upper()
+    if not SERIES_PATTERN.match(series):
+        raise HTTPException(400, "Invoice series must be 1-10 letters or digits")
+    fy = fiscal_year(trip_date)
+
+    seq = _increment(db, series, fy)
+
+    if _issued(db, format_invoice_number(series, fy, seq)):
+        # Still holding the row lock, so no one else can take this value
+        seq = _highest_issued(db, series, fy) + 1
+        db.execute(
+            update(InvoiceCounter)
+            .where(InvoiceCounter.series == series, InvoiceCounter.fiscal_year == fy)
+            .values(last_value=seq)
+        )
+
+    return format_invoice_number(series, fy, seq)
+
+
+def reserve_invoice_number(db: Session, invoice_number: str):
+    """
+    For a hand-entered number in the automatic format, move its counter
+    past it in the caller's transaction, so allocation never hands it out.
+    Other numbers are left alone.
+    """
+    match = NUMBER_PATTERN.match(invoice_number)
+    if match:
+        _raise_counter(db, match["series"], match["fy"], int(match["seq"]))
+
+
+def get_trip_by_invoice(db: Session, invoice_number: str):
+    # Served by the unique index on trips.invoice_number
+    return db.query(Trip).filter(Trip.invoice_number == invoice_number.strip()).first()
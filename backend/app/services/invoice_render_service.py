@@ -0,0 +1,239 @@
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import re
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session, joinedload
+
+from app.models.trip import Trip
+from app.services.invoice_templates import TEMPLATE_VERSION, pdf_available, render_to_file
+from app.utils.dates import month_bounds
+
+INVOICE_CACHE_DIR = Path(
+    os.getenv("INVOICE_CACHE_DIR", Path(__file__).resolve().parents[2] / "generated_reports" / "invoices")
+)
+INVOICE_RENDER_WORKERS = int(os.getenv("INVOICE_RENDER_WORKERS", str(os.cpu_count() or 2)))
+# Cache bounds: files unused for longer than the max age are removed, then
+# the least recently used ones until the directory fits the size cap
+INVOICE_CACHE_MAX_MB = int(os.getenv("INVOICE_CACHE_MAX_MB", "500"))
+INVOICE_CACHE_MAX_AGE_DAYS = int(os.getenv("INVOICE_CACHE_MAX_AGE_DAYS", "30"))
+# A process scans the cache directory at most this often (seconds)
+PRUNE_INTERVAL = 600
+# Files used more recently than this are never pruned, so a batch being
+# zipped keeps its invoices
+PRUNE_MIN_AGE = 300
+# Below this many cache misses the pool's overhead outweighs the parallelism
+POOL_THRESHOLD = 8
+# HTML is plain string formatting, cheaper than shipping the context to a
+# worker; only PDF rendering is heavy enough to go to the pool by default
+POOL_FORMATS = ("pdf",)
+
+FORMATS = ("html", "pdf")
+
+_pool = None
+_prune_lock = threading.Lock()
+_last_prune = {"at": None}
+
+
+def _render_pool():
+    global _pool
+    if _pool is None:
+        # spawn: workers import only invoice_templates, not the server's threads and sockets
+        _pool = ProcessPoolExecutor(
+            max_workers=INVOICE_RENDER_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pool
+
+
+def _context(trip: Trip) -> dict:
+    """Everything an invoice shows, as plain values (hashable and picklable)"""
+    customer = trip.customer
+    return {
+        "id": trip.id,
+        "invoice_number": trip.invoice_number or f"INV-{trip.id:04d}",
+        "trip_date": trip.trip_date.isoformat(),
+        "from_location": trip.from_location,
+        "to_location": trip.to_location,
+        "vehicle_number": trip.vehicle_number,
+        "driver_name": trip.driver.name if trip.driver else None,
+        "customer": {
+            "name": customer.name, "email": customer.email, "phone": customer.phone,
+        } if customer else None,
+        "distance_km": trip.distance_km,
+        "pricing_type": trip.pricing_type,
+        "package_amount": trip.package_amount or 0,
+        "cost_per_km": trip.cost_per_km or 0,
+        "charged_toll_amount": trip.charged_toll_amount or 0,
+        "charged_parking_amount": trip.charged_parking_amount or 0,
+        "other_expenses": trip.other_expenses or 0,
+        "discount_amount": trip.discount_amount or 0,
+        "total_charged": trip.total_charged or 0,
+        "amount_received": trip.amount_received or 0,
+        "pending_amount": trip.pending_amount or 0,
+        "items": [
+            {
+                "description": item.description, "quantity": item.quantity, "rate": item.rate,
+                "amount": item.amount, "item_type": item.item_type,
+            }
+            for item in sorted(trip.pricing_items, key=lambda i: i.id)
+        ],
+        "updated_at": trip.updated_at.isoformat() if trip.updated_at else None,
+    }
+
+
+def _content_hash(ctx: dict, fmt: str) -> str:
+    payload = json.dumps([TEMPLATE_VERSION, fmt, ctx], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _file_name(ctx: dict, fmt: str) -> str:
+    return f"{re.sub(r'[^A-Za-z0-9._-]+', '_', ctx['invoice_number'])}.{fmt}"
+
+
+def _touch(path: str):
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
+
+
+def _load_trips(db: Session, month: str | None, trip_ids: list[int] | None):
+    query = db.query(Trip).options(joinedload(Trip.customer), joinedload(Trip.driver))
+    if month:
+        start, end = month_bounds(month)
+        query = query.filter(Trip.trip_date.between(start, end))
+    else:
+        query = query.filter(Trip.id.in_(trip_ids))
+    return query.order_by(Trip.trip_date, Trip.id).all()
+
+
+def prune_invoice_cache(now: float | None = None):
+    """
+    Remove cache files unused for INVOICE_CACHE_MAX_AGE_DAYS, then the least
+    recently used ones until the cache fits INVOICE_CACHE_MAX_MB. A file's
+    mtime is its last use: cache hits touch it. Returns the number removed.
+    """
+    now = now or time.time()
+    max_age = INVOICE_CACHE_MAX_AGE_DAYS * 86400
+    files, total = [], 0
+    for entry in os.scandir(INVOICE_CACHE_DIR):
+        try:
+            if not entry.is_file():
+                continue
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue
+        total += stat.st_size
+        if now - stat.st_mtime >= PRUNE_MIN_AGE:
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+    budget = INVOICE_CACHE_MAX_MB * 1024 * 1024
+
+    removed = 0
+    for mtime, size, path in sorted(files):
+        if now - mtime < max_age and total <= budget:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+    return removed
+
+
+def _maybe_prune():
+    with _prune_lock:
+        if _last_prune["at"] is not None and time.monotonic() - _last_prune["at"] < PRUNE_INTERVAL:
+            return
+        _last_prune["at"] = time.monotonic()
+    prune_invoice_cache()
+
+
+def _render_missing(jobs, use_pool: bool):
+    """Render (ctx, fmt, path) jobs, in the process pool when asked and there are enough"""
+    if use_pool and len(jobs) >= POOL_THRESHOLD:
+        pool = _render_pool()
+        chunk = max(1, len(jobs) // (INVOICE_RENDER_WORKERS * 4))
+        list(pool.map(render_to_file, *zip(*jobs), chunksize=chunk))
+    else:
+        for ctx, fmt, path in jobs:
+            render_to_file(ctx, fmt, path)
+
+
+def render_invoice_batch(
+    db: Session,
+    month: str | None = None,
+    trip_ids: list[int] | None = None,
+    fmt: str = "html",
+    use_cache: bool = True,
+    use_pool: bool | None = None,
+):
+    """
+    Render the invoices of a month (or of the given trips) into a zip.
+
+    Each invoice is cached under a hash of its content (trip fields,
+    customer, driver, items, updated_at) and the template version, so
+    only new or changed invoices are rendered. `use_pool` forces the
+    process pool on or off; by default only POOL_FORMATS use it.
+    Returns (zip bytes, stats).
+    """
+    if bool(month) == bool(trip_ids):
+        raise HTTPException(status_code=400, detail="Pass either month or trip_ids")
+    if fmt not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format: {fmt}")
+    if fmt == "pdf" and not pdf_available():
+        raise HTTPException(status_code=400, detail="PDF rendering needs weasyprint installed")
+
+    started = time.perf_counter()
+    trips = _load_trips(db, month, trip_ids)
+    if not trips:
+        raise HTTPException(status_code=404, detail="No trips to invoice")
+
+    INVOICE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    entries, missing = [], []
+    for trip in trips:
+        ctx = _context(trip)
+        path = str(INVOICE_CACHE_DIR / f"{_content_hash(ctx, fmt)}.{fmt}")
+        entries.append((_file_name(ctx, fmt), ctx, path))
+        if not use_cache or not os.path.exists(path):
+            missing.append((ctx, fmt, path))
+        else:
+            _touch(path)
+
+    render_started = time.perf_counter()
+    _render_missing(missing, fmt in POOL_FORMATS if use_pool is None else use_pool)
+    render_seconds = time.perf_counter() - render_started
+
+    buffer = io.BytesIO()
+    # PDFs are already compressed
+    compression = zipfile.ZIP_STORED if fmt == "pdf" else zipfile.ZIP_DEFLATED
+    with zipfile.ZipFile(buffer, "w", compression) as archive:
+        for name, ctx, path in entries:
+            try:
+                archive.write(path, arcname=name)
+            except FileNotFoundError:
+                # Pruned by another worker since it was checked
+                render_to_file(ctx, fmt, path)
+                archive.write(path, arcname=name)
+
+    _maybe_prune()
+
+    seconds = time.perf_counter() - started
+    stats = {
+        "invoices": len(entries),
+        "rendered": len(missing),
+        "cached": len(entries) - len(missing),
+        "render_seconds": round(render_seconds, 3),
+        "seconds": round(seconds, 3),
+        "invoices_per_sec": round(len(entries) / seconds, 1) if seconds else None,
+    }
+    return buffer.getvalue(), stats
+
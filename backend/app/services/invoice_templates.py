@@ -0,0 +1,149 @@
+"""
+Invoice rendering from plain context dicts.
+
+Kept free of database imports so process-pool workers only load this
+module and the optional PDF renderer.
+"""
+import os
+from html import escape
+
+try:
+    from weasyprint import HTML
+except ImportError:  # PDF output is optional
+    HTML = None
+
+COMPANY_NAME = "Nathkrupa Travels"
+COMPANY_ADDRESS = "Pune, Maharashtra"
+COMPANY_CONTACT = "Contact Number: __________"
+
+# Part of every cache key: bump when the template output changes
+TEMPLATE_VERSION = "1"
+
+STYLE = """
+body { font-family: Helvetica, Arial, sans-serif; color: #111; margin: 32px; font-size: 13px; }
+h1 { margin: 0; font-size: 26px; }
+.muted { color: #555; }
+.row { display: flex; justify-content: space-between; margin-bottom: 20px; }
+.box { border: 1px solid #ccc; border-radius: 4px; padding: 12px; margin-bottom: 20px; }
+.grid { display: grid; grid-template-columns: 1fr 1fr; gap: 8px 24px; }
+.label { font-size: 11px; color: #555; }
+table { width: 100%; border-collapse: collapse; margin-bottom: 20px; }
+th { background: #e5e7eb; text-align: left; padding: 6px; }
+td { border-top: 1px solid #ddd; padding: 6px; }
+.num { text-align: right; }
+.total td { border-top: 2px solid #999; font-weight: bold; background: #f9fafb; }
+.footer { border-top: 1px solid #ddd; padding-top: 12px; text-align: center; font-size: 11px; color: #555; }
+"""
+
+
+def pdf_available() -> bool:
+    return HTML is not None
+
+
+def _money(value) -> str:
+    return f"₹ {float(value or 0):,.2f}"
+
+
+def _date(value) -> str:
+    # context dates are ISO strings; invoices show DD-MM-YYYY like the app
+    if not value:
+        return ""
+    year, month, day = value[:10].split("-")
+    return f"{day}-{month}-{year}"
+
+
+def _item_amount(item):
+    return item["amount"] or (item["quantity"] or 1) * (item["rate"] or 0)
+
+
+def _charge_lines(ctx):
+    """Lines adding up to total_charged, in the order the trip form prices them"""
+    pricing = [i for i in ctx["items"] if i["item_type"] != "charge"]
+    charges = [i for i in ctx["items"] if i["item_type"] == "charge"]
+
+    lines = []
+    if pricing:
+        lines += [(i["description"], _item_amount(i)) for i in pricing]
+    elif ctx["pricing_type"] == "package":
+        lines.append(("Package Fare", ctx["package_amount"]))
+    else:
+        distance = ctx["distance_km"] or 0
+        rate = ctx["cost_per_km"] or 0
+        lines.append((f"Base Fare ({distance} km × ₹{rate:g})", distance * rate))
+
+    if ctx["charged_toll_amount"]:
+        lines.append(("Toll Charges", ctx["charged_toll_amount"]))
+    if ctx["charged_parking_amount"]:
+        lines.append(("Parking Charges", ctx["charged_parking_amount"]))
+    lines += [(i["description"], _item_amount(i)) for i in charges]
+    if ctx["other_expenses"]:
+        lines.append(("Other Charges", ctx["other_expenses"]))
+    if ctx["discount_amount"]:
+        lines.append(("Discount", -ctx["discount_amount"]))
+    return lines
+
+
+def render_html(ctx: dict) -> str:
+    rows = "".join(
+        f'<tr><td>{escape(description)}</td><td class="num">{_money(amount)}</td></tr>'
+        for description, amount in _charge_lines(ctx)
+    )
+    customer = ctx["customer"] or {}
+    details = [
+        ("From", ctx["from_location"]),
+        ("To", ctx["to_location"]),
+        ("Vehicle", ctx["vehicle_number"]),
+        ("Driver", ctx["driver_name"] or "N/A"),
+        ("Distance", f'{ctx["distance_km"] or 0} km'),
+        ("Date", _date(ctx["trip_date"])),
+    ]
+    detail_cells = "".join(
+        f'<div><div class="label">{label}</div><b>{escape(str(value or ""))}</b></div>'
+        for label, value in details
+    )
+
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{escape(ctx["invoice_number"])}</title>
+<style>{STYLE}</style></head>
+<body>
+<div class="row">
+  <div><h1>INVOICE</h1><div class="muted">{escape(ctx["invoice_number"])}</div></div>
+  <div style="text-align:right"><div class="label">Invoice Date</div><b>{_date(ctx["trip_date"])}</b></div>
+</div>
+<div class="row">
+  <div><div class="label">FROM</div><b>{COMPANY_NAME}</b>
+    <div class="muted">{COMPANY_ADDRESS}</div><div class="muted">{COMPANY_CONTACT}</div></div>
+  <div><div class="label">BILL TO</div><b>{escape(customer.get("name") or "")}</b>
+    <div>{escape(customer.get("email") or "")}</div><div>{escape(customer.get("phone") or "")}</div></div>
+</div>
+<div class="box"><b>Trip Details</b><div class="grid" style="margin-top:8px">{detail_cells}</div></div>
+<table>
+  <tr><th>Description</th><th class="num">Amount</th></tr>
+  {rows}
+  <tr class="total"><td>Total Charged</td><td class="num">{_money(ctx["total_charged"])}</td></tr>
+</table>
+<table>
+  <tr><th>Amount Charged</th><th>Amount Paid</th><th>Amount Due</th></tr>
+  <tr><td>{_money(ctx["total_charged"])}</td><td>{_money(ctx["amount_received"])}</td>
+      <td>{_money(ctx["pending_amount"])}</td></tr>
+</table>
+<div class="footer"><p>Thank you for your business!</p><p>This is a computer-generated document.</p></div>
+</body></html>
+"""
+
+
+def render_invoice(ctx: dict, fmt: str) -> bytes:
+    """Rendered invoice bytes; runs in the render process pool"""
+    html = render_html(ctx)
+    if fmt == "pdf":
+        return HTML(string=html).write_pdf()
+    return html.encode("utf-8")
+
+
+def render_to_file(ctx: dict, fmt: str, path: str) -> str:
+    """Render into the cache file at `path` (written atomically)"""
+    partial = f"{path}.{os.getpid()}.part"
+    with open(partial, "wb") as f:
+        f.write(render_invoice(ctx, fmt))
+    os.replace(partial, path)
+    return path
@@ -0,0 +1,220 @@
+import re
+from difflib import SequenceMatcher
+
+from fastapi import HTTPException
+from sqlalchemy import func, insert, or_, select, union_all, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.location import Location
+from app.models.trip import Trip
+
+# Lowest similarity (0-1) between two location keys reported as a likely duplicate
+MERGE_SIMILARITY = 0.75
+BACKFILL_CHUNK_SIZE = 5000
+
+_UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _create(db: Session, name: str, key: str):
+    """
+    Id of a new location, or None when a concurrent booking created the
+    same place first: ON CONFLICT DO NOTHING where the database has it,
+    else a plain insert in a savepoint, its unique key violation being
+    the conflict.
+    """
+    upsert = _UPSERTS.get(db.bind.dialect.name)
+    if upsert is not None:
+        return db.execute(
+            upsert(Location)
+            .values(name=name, key=key)
+            .on_conflict_do_nothing(index_elements=[Location.key])
+            .returning(Location.id)
+        ).scalar()
+    try:
+        with db.begin_nested():
+            result = db.execute(insert(Location).values(name=name, key=key))
+    except IntegrityError:
+        return None
+    return result.inserted_primary_key[0]
+
+
+def _location_cache(db: Session) -> dict:
+    """
+    key -> location id (merges followed) for this session. Kept per session
+    rather than per process: a merge committed by another worker is seen
+    by the next request, and a backfill still looks each spelling up once.
+    """
+    return db.info.setdefault("location_ids", {})
+
+
+def location_key(name: str | None) -> str:
+    """Normalized spelling: lower case, punctuation dropped, single spaces"""
+    if not name:
+        return ""
+    return " ".join(re.sub(r"[^\w\s]", " ", name.lower()).split())
+
+
+def _resolve(db: Session, key: str):
+    row = db.execute(
+        select(Location.id, Location.merged_into_id).where(Location.key == key)
+    ).first()
+    if row is None:
+        return None
+    return row.merged_into_id or row.id
+
+
+def find_location_id(db: Session, name: str | None):
+    """Location id for a place name, or None when it was never used"""
+    key = location_key(name)
+    if not key:
+        return None
+    cache = _location_cache(db)
+    if key not in cache:
+        location_id = _resolve(db, key)
+        if location_id is None:
+            return None
+        cache[key] = location_id
+    return cache[key]
+
+
+def intern_location(db: Session, name: str | None):
+    """
+    Location id for a free-text place name, creating the location on first
+    use. Served from the session's cache after the first lookup.
+    Does not commit.
+    """
+    key = location_key(name)
+    if not key:
+        return None
+    cache = _location_cache(db)
+    if key in cache:
+        return cache[key]
+
+    # Locations this session created are not cached: they vanish on rollback
+    created = db.info.setdefault("created_location_ids", set())
+    location_id = _resolve(db, key)
+    if location_id is None:
+        # A concurrent booking may be creating the same place: on conflict, read it
+        location_id = _create(db, " ".join(name.split()), key)
+        if location_id is not None:
+            created.add(location_id)
+            return location_id
+        location_id = _resolve(db, key)
+
+    if location_id not in created:
+        cache[key] = location_id
+    return location_id
+
+
+def backfill_trip_locations(db: Session):
+    """
+    Intern from / to of trips that have no location ids yet (trips created
+    before the locations dictionary). Does not commit.
+    """
+    last_id = 0
+    while True:
+        rows = db.execute(
+            select(Trip.id, Trip.from_location, Trip.to_location, Trip.from_location_id, Trip.to_location_id)
+            .where(Trip.id > last_id, or_(Trip.from_location_id.is_(None), Trip.to_location_id.is_(None)))
+            .order_by(Trip.id)
+            .limit(BACKFILL_CHUNK_SIZE)
+        ).all()
+        if not rows:
+            return
+        db.execute(
+            update(Trip),
+            [
+                {
+                    "id": row.id,
+                    "from_location_id": row.from_location_id or intern_location(db, row.from_location),
+                    "to_location_id": row.to_location_id or intern_location(db, row.to_location),
+                }
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+
+def _location_usage(db: Session):
+    """Active locations with the number of trips starting or ending at them"""
+    ends = union_all(
+        select(Trip.from_location_id.label("location_id")),
+        select(Trip.to_location_id.label("location_id")),
+    ).subquery()
+    counts = (
+        select(ends.c.location_id, func.count().label("trips"))
+        .group_by(ends.c.location_id)
+        .subquery()
+    )
+    return db.execute(
+        select(Location.id, Location.name, Location.key, func.coalesce(counts.c.trips, 0).label("trips"))
+        .outerjoin(counts, counts.c.location_id == Location.id)
+        .where(Location.merged_into_id.is_(None))
+        .order_by(Location.id)
+    ).all()
+
+
+def location_merge_suggestions(db: Session, threshold: float = MERGE_SIMILARITY, limit: int = 100):
+    """
+    Pairs of locations whose keys look like spelling variants ("shirdi" /
+    "shirdee"), most similar first. The location with more trips is
+    proposed as the one to keep.
+    """
+    locations = _location_usage(db)
+    pairs = []
+    for i, a in enumerate(locations):
+        for b in locations[i + 1:]:
+            matcher = SequenceMatcher(None, a.key, b.key)
+            # Cheap upper bounds first; ratio() is the expensive one
+            if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+                continue
+            similarity = matcher.ratio()
+            if similarity < threshold:
+                continue
+            source, target = (a, b) if (a.trips, -a.id) < (b.trips, -b.id) else (b, a)
+            pairs.append({
+                "source": {"id": source.id, "name": source.name, "trips": source.trips},
+                "target": {"id": target.id, "name": target.name, "trips": target.trips},
+                "similarity": round(similarity, 3),
+            })
+    pairs.sort(key=lambda p: (-p["similarity"], -p["target"]["trips"]))
+    return pairs[:limit]
+
+
+def merge_locations(db: Session, source_id: int, target_id: int):
+    """
+    Fold `source` into `target`: trips are re-pointed and the source's
+    spellings resolve to the target from now on.
+    """
+    if source_id == target_id:
+        raise HTTPException(status_code=400, detail="Cannot merge a location into itself")
+    source = db.query(Location).filter(Location.id == source_id).first()
+    target = db.query(Location).filter(Location.id == target_id).first()
+    if not source or not target:
+        raise HTTPException(status_code=404, detail="Location not found")
+    if source.merged_into_id or target.merged_into_id:
+        raise HTTPException(status_code=400, detail="Location was already merged")
+
+    source.merged_into_id = target.id
+    # Earlier merges into the source follow it, keeping every chain one hop long
+    db.execute(
+        update(Location).where(Location.merged_into_id == source.id).values(merged_into_id=target.id)
+    )
+    updated = db.execute(
+        select(func.count(Trip.id)).where(
+            or_(Trip.from_location_id == source.id, Trip.to_location_id == source.id)
+        )
+    ).scalar()
+    for column in (Trip.from_location_id, Trip.to_location_id):
+        db.execute(
+            update(Trip)
+            .where(column == source.id)
+            .values({column: target.id})
+            .execution_options(synchronize_session=False)
+        )
+    db.commit()
+    _location_cache(db).clear()
+
+    return {"source_id": source.id, "target_id": target.id, "trips_updated": updated}
@@ -1,11 +1,14 @@
+import calendar
+import threading
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
 from fastapi import HTTPException
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
 from app.models.spare_part import SparePart
 from app.models.vehicle import Vehicle
 from app.models.maintenance import Maintenance, MaintenanceType
+from app.services.data_version_service import data_versions
 
 
 # ===============================
@@ -171,3 +174,132 @@ def calculate_monthly_maintenance_cost(
                 total_cost += maintenance.amount / 3
 
     return total_cost
+
+
+# ===============================
+# UPCOMING RENEWALS
+# ===============================
+
+# Cover of a record without an end_date (tax matches the monthly cost split)
+TAX_TERM = timedelta(days=90)
+INSURANCE_TERM_YEARS = 1
+
+# Fleet summary, recomputed when maintenance or vehicles change (or the day does)
+_upcoming_lock = threading.Lock()
+_upcoming_cache = {"key": None, "items": []}
+
+
+def _add_months(day: date, months: int) -> date:
+    month = day.month - 1 + months
+    year = day.year + month // 12
+    month = month % 12 + 1
+    return day.replace(year=year, month=month, day=min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def _due(row, today: date):
+    """(due date, derived) for the latest record of a vehicle and type; None when nothing is due"""
+    start = row.start_date.date()
+    end = row.end_date.date() if row.end_date else None
+
+    if row.maintenance_type == MaintenanceType.EMI:
+        # Next monthly instalment on the start day, until the loan ends
+        months = max(0, (today.year - start.year) * 12 + today.month - start.month)
+        due = _add_months(start, months)
+        if due < today:
+            due = _add_months(start, months + 1)
+        if end and due > end:
+            return None
+        return due, True
+
+    if end:
+        return end, False
+    if row.maintenance_type == MaintenanceType.INSURANCE:
+        return _add_months(start, 12 * INSURANCE_TERM_YEARS), True
+    return start + TAX_TERM, True
+
+
+def _latest_per_vehicle_and_type(db: Session):
+    """One query: the newest record per (vehicle, type) of every active vehicle"""
+    ranked = (
+        select(
+            Maintenance.id,
+            Maintenance.vehicle_number,
+            Maintenance.maintenance_type,
+            Maintenance.description,
+            Maintenance.amount,
+            Maintenance.start_date,
+            Maintenance.end_date,
+            func.row_number().over(
+                partition_by=(Maintenance.vehicle_number, Maintenance.maintenance_type),
+                order_by=(Maintenance.start_date.desc(), Maintenance.id.desc()),
+            ).label("position"),
+        )
+        .join(Vehicle, Vehicle.vehicle_number == Maintenance.vehicle_number)
+        .where(Vehicle.is_deleted.isnot(True))
+        .subquery()
+    )
+    return db.execute(select(ranked).where(ranked.c.position == 1)).all()
+
+
+def _upcoming_items(db: Session, today: date):
+    key = (tuple(data_versions(db, ("maintenance", "vehicles")).items()), today)
+    with _upcoming_lock:
+        if _upcoming_cache["key"] == key:
+            return _upcoming_cache["items"]
+
+        items = []
+        for row in _latest_per_vehicle_and_type(db):
+            due = _due(row, today)
+            if due is None:
+                continue
+            due_date, derived = due
+            items.append({
+                "maintenance_id": row.id,
+                "vehicle_number": row.vehicle_number,
+                "maintenance_type": MaintenanceType(row.maintenance_type).value,
+                "description": row.description,
+                "amount": row.amount,
+                "start_date": row.start_date,
+                "due_date": due_date,
+                "derived": derived,
+                "days_left": (due_date - today).days,
+            })
+        items.sort(key=lambda item: (item["due_date"], item["vehicle_number"]))
+
+        _upcoming_cache["key"] = key
+        _upcoming_cache["items"] = items
+        return items
+
+
+def upcoming_maintenance(db: Session, within_days: int = 30, maintenance_type: MaintenanceType = None):
+    """
+    Renewals and instalments falling due across the fleet, per vehicle.
+
+    Only the latest record of each vehicle and type counts: an insurance
+    renewed since is not due. Records without an end_date expire a term
+    after they start (insurance a year, tax 90 days); EMIs are due on
+    their next monthly instalment. Lapsed covers are returned as overdue.
+    Vehicles are ordered by their next due date.
+    """
+    today = date.today()
+    horizon = today + timedelta(days=within_days)
+
+    vehicles = {}
+    for item in _upcoming_items(db, today):
+        if item["due_date"] > horizon:
+            break
+        if maintenance_type and item["maintenance_type"] != maintenance_type.value:
+            continue
+        summary = vehicles.setdefault(item["vehicle_number"], {
+            "vehicle_number": item["vehicle_number"],
+            "next_due_date": item["due_date"],
+            "next_due_type": item["maintenance_type"],
+            "days_left": item["days_left"],
+            "overdue": 0,
+            "items": [],
+        })
+        summary["items"].append({**item, "status": "overdue" if item["days_left"] < 0 else "due"})
+        if item["days_left"] < 0:
+            summary["overdue"] += 1
+
+    return list(vehicles.values())
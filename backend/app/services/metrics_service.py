@@ -0,0 +1,180 @@
+"""
+Prometheus metrics: per-route HTTP traffic, SQL statements and time per
+request, and connection pool usage.
+
+With PROMETHEUS_MULTIPROC_DIR set (gunicorn, see gunicorn.conf.py) every
+worker writes its samples there and /metrics aggregates all of them.
+"""
+import os
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+from app.database.query_timer import on_statement
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST,
+        REGISTRY,
+        CollectorRegistry,
+        Counter,
+        Gauge,
+        Histogram,
+        generate_latest,
+        multiprocess,
+    )
+except ImportError:  # metrics are optional
+    Counter = None
+
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+# When set, /metrics requires "Authorization: Bearer <token>"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 500)
+
+# Requests that matched no route share one label, so scans cannot grow the series
+UNMATCHED = "unmatched"
+
+
+def metrics_available() -> bool:
+    return Counter is not None
+
+
+if metrics_available():
+    REQUESTS = Counter(
+        "http_requests_total", "HTTP requests", ("method", "route", "status")
+    )
+    LATENCY = Histogram(
+        "http_request_duration_seconds", "HTTP request latency", ("method", "route"),
+        buckets=LATENCY_BUCKETS,
+    )
+    RESPONSE_SIZE = Histogram(
+        "http_response_size_bytes", "HTTP response body size", ("method", "route"),
+        buckets=SIZE_BUCKETS,
+    )
+    DB_STATEMENTS = Histogram(
+        "db_statements_per_request", "SQL statements executed per request", ("route",),
+        buckets=STATEMENT_BUCKETS,
+    )
+    DB_TIME = Histogram(
+        "db_time_per_request_seconds", "Time spent in SQL per request", ("route",),
+        buckets=LATENCY_BUCKETS,
+    )
+    POOL_CHECKOUT = Histogram(
+        "db_pool_checkout_seconds", "Time to get a connection from the pool (waiting or connecting)",
+        buckets=LATENCY_BUCKETS,
+    )
+    # livesum: totals over the workers that are still running
+    POOL_SIZE = Gauge("db_pool_size", "Configured pool size", multiprocess_mode="livesum")
+    POOL_IN_USE = Gauge("db_pool_connections_in_use", "Connections checked out", multiprocess_mode="livesum")
+    POOL_OVERFLOW = Gauge("db_pool_overflow_in_use", "Connections open beyond the pool size", multiprocess_mode="livesum")
+
+
+# [statements, seconds] of the current request; handlers run in a threadpool
+# with a copy of the context, so the list itself is shared and mutated
+_request_sql: ContextVar[list | None] = ContextVar("request_sql", default=None)
+_registered_engines = set()
+
+
+# ===============================
+# SQL
+# ===============================
+
+def _count_statement(conn, statement, parameters, executemany, seconds):
+    totals = _request_sql.get()
+    if totals is not None:
+        totals[0] += 1
+        totals[1] += seconds
+
+
+def _pool_usage(pool):
+    size = pool.size() if hasattr(pool, "size") else 0
+    in_use = pool.checkedout() if hasattr(pool, "checkedout") else 0
+    POOL_SIZE.set(size)
+    POOL_IN_USE.set(in_use)
+    POOL_OVERFLOW.set(max(in_use - size, 0))
+
+
+def register_metrics_listeners(engine):
+    """Count SQL per request and track pool usage and checkout time"""
+    if not metrics_available() or engine in _registered_engines:
+        return
+    _registered_engines.add(engine)
+    on_statement(engine, _count_statement)
+
+    pool = engine.pool
+    event.listen(pool, "checkout", lambda *args: _pool_usage(pool))
+    event.listen(pool, "checkin", lambda *args: _pool_usage(pool))
+    _pool_usage(pool)
+
+    # Every Connection gets its DBAPI connection through raw_connection()
+    raw_connection = engine.raw_connection
+
+    def timed_raw_connection():
+        started = time.perf_counter()
+        try:
+            return raw_connection()
+        finally:
+            POOL_CHECKOUT.observe(time.perf_counter() - started)
+
+    engine.raw_connection = timed_raw_connection
+
+
+# ===============================
+# HTTP
+# ===============================
+
+class PrometheusMiddleware:
+    """
+    ASGI middleware recording count, latency and response size per
+    (method, route template, status), plus SQL statements and time per
+    request. Labels use the route template ("/api/trips/{trip_id}"),
+    never the raw path.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        response = {"status": 500, "size": 0}
+        sql = [0, 0.0]
+        token = _request_sql.set(sql)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["size"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_sql.reset(token)
+            route = scope.get("route")
+            template = getattr(route, "path", None) or UNMATCHED
+            method = scope["method"]
+
+            REQUESTS.labels(method, template, str(response["status"])).inc()
+            LATENCY.labels(method, template).observe(time.perf_counter() - started)
+            RESPONSE_SIZE.labels(method, template).observe(response["size"])
+            DB_STATEMENTS.labels(template).observe(sql[0])
+            DB_TIME.labels(template).observe(sql[1])
+
+
+def render_metrics():
+    """(body, content type) of the Prometheus text exposition"""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,216 @@
+import time
+
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, case, delete, func, insert, or_, select
+
+from app.models.trip import Trip
+from app.models.odometer_finding import OdometerFinding
+
+AUDIT_CHUNK_SIZE = 5000
+# Readings may differ by this much before they are reported
+ODOMETER_TOLERANCE_KM = 1.0
+
+FINDING_KINDS = ("gap", "overlap", "reversed", "distance_mismatch")
+
+
+def _continuity_rows(vehicle_number: str | None = None, lower=None, upper=None):
+    """
+    Trips with odometer readings, each with the previous trip of the same
+    vehicle (LAG over the vehicle's trips ordered by departure).
+    Optionally limited to one vehicle and a busy_from range.
+    """
+    trips = select(
+        Trip.id, Trip.vehicle_number, Trip.busy_from, Trip.start_km, Trip.end_km, Trip.distance_km
+    ).where(Trip.end_km > 0)
+    if vehicle_number is not None:
+        trips = trips.where(Trip.vehicle_number == vehicle_number)
+    if lower is not None:
+        trips = trips.where(Trip.busy_from >= lower)
+    if upper is not None:
+        trips = trips.where(Trip.busy_from <= upper)
+    trips = trips.subquery()
+
+    window = {"partition_by": trips.c.vehicle_number, "order_by": (trips.c.busy_from, trips.c.id)}
+    return select(
+        trips,
+        func.lag(trips.c.id).over(**window).label("prev_trip_id"),
+        func.lag(trips.c.end_km).over(**window).label("prev_end_km"),
+    ).order_by(trips.c.vehicle_number, trips.c.busy_from, trips.c.id)
+
+
+def _findings(row):
+    """Continuity findings for one row of _continuity_rows"""
+    found = []
+
+    def add(kind, expected, actual, prev_trip_id=None):
+        found.append({
+            "vehicle_number": row.vehicle_number,
+            "trip_id": row.id,
+            "prev_trip_id": prev_trip_id,
+            "kind": kind,
+            "expected": expected,
+            "actual": actual,
+            "delta": round(actual - expected, 1),
+            "departure": row.busy_from,
+        })
+
+    start_km, end_km = row.start_km or 0, row.end_km or 0
+
+    if row.prev_end_km and start_km:
+        if start_km - row.prev_end_km > ODOMETER_TOLERANCE_KM:
+            add("gap", row.prev_end_km, start_km, row.prev_trip_id)
+        elif row.prev_end_km - start_km > ODOMETER_TOLERANCE_KM:
+            add("overlap", row.prev_end_km, start_km, row.prev_trip_id)
+
+    if start_km and end_km < start_km:
+        add("reversed", start_km, end_km)
+    elif start_km and row.distance_km and abs(row.distance_km - (end_km - start_km)) > ODOMETER_TOLERANCE_KM:
+        add("distance_mismatch", end_km - start_km, float(row.distance_km))
+
+    return found
+
+
+def _neighbour(db: Session, vehicle_number: str, busy_from, trip_id: int, after: bool):
+    """Nearest trip with readings before/after (busy_from, trip_id) on the vehicle index"""
+    if after:
+        position = or_(Trip.busy_from > busy_from, and_(Trip.busy_from == busy_from, Trip.id > trip_id))
+        order = (Trip.busy_from.asc(), Trip.id.asc())
+    else:
+        position = or_(Trip.busy_from < busy_from, and_(Trip.busy_from == busy_from, Trip.id < trip_id))
+        order = (Trip.busy_from.desc(), Trip.id.desc())
+
+    return (
+        db.query(Trip.id, Trip.busy_from)
+        .filter(Trip.vehicle_number == vehicle_number, Trip.end_km > 0, position)
+        .order_by(*order)
+        .first()
+    )
+
+
+def clear_trip_findings(db: Session, trip_id: int):
+    """Drop a trip's findings before it is deleted. Does not commit."""
+    db.execute(delete(OdometerFinding).where(OdometerFinding.trip_id == trip_id))
+
+
+def check_trip_continuity(db: Session, vehicle_number: str | None, busy_from, trip_id: int):
+    """
+    Incremental check after a trip is written at (vehicle_number, busy_from):
+    re-evaluates that trip and the next trip of the vehicle, whose previous
+    reading may have changed. Only the neighbouring rows are read.
+
+    Call once for the trip's new position and, when a trip moves or is
+    deleted, once for its old position.
+    """
+    if not vehicle_number or busy_from is None:
+        return
+
+    prev = _neighbour(db, vehicle_number, busy_from, trip_id, after=False)
+    following = _neighbour(db, vehicle_number, busy_from, trip_id, after=True)
+
+    targets = {trip_id}
+    if following:
+        targets.add(following.id)
+
+    rows = db.execute(
+        _continuity_rows(
+            vehicle_number,
+            lower=prev.busy_from if prev else busy_from,
+            upper=following.busy_from if following else busy_from,
+        )
+    ).all()
+
+    found = [finding for row in rows if row.id in targets for finding in _findings(row)]
+
+    db.execute(delete(OdometerFinding).where(OdometerFinding.trip_id.in_(targets)))
+    if found:
+        db.execute(insert(OdometerFinding), found)
+    db.commit()
+
+
+def run_odometer_audit(db: Session):
+    """
+    Full audit: stream every vehicle's trips through the LAG query and
+    sync the findings table (rewrite changed findings, drop resolved ones).
+    """
+    started = time.perf_counter()
+
+    found = {}
+    scanned = 0
+    result = db.connection().execute(_continuity_rows().execution_options(yield_per=AUDIT_CHUNK_SIZE))
+    for chunk in result.partitions():
+        scanned += len(chunk)
+        for row in chunk:
+            for finding in _findings(row):
+                found[(finding["trip_id"], finding["kind"])] = finding
+
+    existing = {
+        (row.trip_id, row.kind): row
+        for row in db.query(
+            OdometerFinding.id, OdometerFinding.trip_id, OdometerFinding.kind,
+            OdometerFinding.prev_trip_id, OdometerFinding.expected, OdometerFinding.actual,
+        )
+    }
+
+    replaced_ids = []
+    new_rows = []
+    for key, finding in found.items():
+        row = existing.pop(key, None)
+        if row is not None:
+            if (row.prev_trip_id, row.expected, row.actual) == (
+                finding["prev_trip_id"], finding["expected"], finding["actual"]
+            ):
+                continue
+            replaced_ids.append(row.id)
+        new_rows.append(finding)
+    resolved_ids = [row.id for row in existing.values()]
+
+    if replaced_ids or resolved_ids:
+        db.execute(delete(OdometerFinding).where(OdometerFinding.id.in_(replaced_ids + resolved_ids)))
+    if new_rows:
+        db.execute(insert(OdometerFinding), new_rows)
+    db.commit()
+
+    return {
+        "trips_scanned": scanned,
+        "findings": len(found),
+        "written": len(new_rows),
+        "resolved": len(resolved_ids),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def odometer_summary(db: Session):
+    """Finding counts and unaccounted km per vehicle"""
+    counts = [
+        func.sum(case((OdometerFinding.kind == kind, 1), else_=0)).label(kind)
+        for kind in FINDING_KINDS
+    ]
+    rows = (
+        db.query(
+            OdometerFinding.vehicle_number,
+            func.count(OdometerFinding.id).label("total"),
+            *counts,
+            func.coalesce(
+                func.sum(case((OdometerFinding.kind == "gap", OdometerFinding.delta), else_=0)), 0
+            ).label("gap_km"),
+        )
+        .group_by(OdometerFinding.vehicle_number)
+        .order_by(OdometerFinding.vehicle_number)
+        .all()
+    )
+    return [
+        {
+            "vehicle_number": row.vehicle_number,
+            "total": row.total,
+            **{kind: int(getattr(row, kind) or 0) for kind in FINDING_KINDS},
+            "gap_km": float(row.gap_km or 0),
+        }
+        for row in rows
+    ]
+
+
+def vehicle_findings(db: Session, vehicle_number: str, kind: str | None = None):
+    query = db.query(OdometerFinding).filter(OdometerFinding.vehicle_number == vehicle_number)
+    if kind:
+        query = query.filter(OdometerFinding.kind == kind)
+    return query.order_by(OdometerFinding.departure.desc(), OdometerFinding.id.desc()).all()
@@ -0,0 +1,278 @@
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import exists, extract, func
+
+from app.models.driver import Driver
+from app.models.trip import Trip
+from app.models.trip_driver_change import TripDriverChange
+from app.models.driver_expense import DriverExpense
+from app.models.driver_salary import DriverSalary
+from app.models.payroll_run import PayrollRun
+from app.models.payroll_line import PayrollLine
+from app.utils.dates import month_bounds
+
+# Components stored on a payroll line, in the order they are compared
+PAYROLL_FIELDS = ("payable_days", "base_salary", "bhatta", "expenses", "paid", "net_due")
+
+
+def _month_key(year, month) -> str:
+    return f"{int(year):04d}-{int(month):02d}"
+
+
+def _prorated_salary(driver, first_day: date, last_day: date):
+    """
+    (payable_days, base_salary) for a driver in one month.
+    Drivers who join mid-month are paid for the days from joining_date.
+    """
+    days_in_month = (last_day - first_day).days + 1
+    joining = driver.joining_date
+    if joining and joining > last_day:
+        return 0, 0.0
+
+    payable_days = days_in_month
+    if joining and joining > first_day:
+        payable_days = (last_day - joining).days + 1
+
+    base = (driver.monthly_salary or 0) * payable_days / days_in_month
+    return payable_days, base
+
+
+def _split_bhatta(trip, changes):
+    """
+    Share a trip's driver_bhatta between the primary driver and the
+    drivers in its driver-change segments.
+
+    With timed segments each relief driver earns the fraction of the trip
+    they drove and the primary driver keeps the rest; otherwise the
+    bhatta is split equally between everyone on the trip.
+    """
+    total = trip.driver_bhatta or 0
+    shares = defaultdict(float)
+
+    start, end = trip.departure_datetime, trip.return_datetime
+    span = (end - start).total_seconds() if start and end else 0
+    timed = span > 0 and all(c.start_time and c.end_time for c in changes)
+
+    if timed:
+        for change in changes:
+            seg_start = max(change.start_time, start)
+            seg_end = min(change.end_time, end)
+            seconds = max((seg_end - seg_start).total_seconds(), 0)
+            shares[change.driver_id] += total * seconds / span
+
+        relief_total = sum(shares.values())
+        if relief_total > total:
+            # Overlapping segments: scale relief shares back to the trip total
+            for driver_id in shares:
+                shares[driver_id] *= total / relief_total
+            relief_total = total
+        shares[trip.driver_id] += total - relief_total
+    else:
+        drivers = {trip.driver_id, *(c.driver_id for c in changes)}
+        for driver_id in drivers:
+            shares[driver_id] += total / len(drivers)
+
+    return shares
+
+
+def compute_payroll(db: Session, months: list[str]):
+    """
+    Compute payroll components for every driver and each month.
+
+    Each component is one grouped query over the whole period (bucketed by
+    year/month), so the cost does not grow with the number of drivers.
+    Returns {(month, driver_id): {field: value}}.
+    """
+    bounds = {month: month_bounds(month) for month in months}
+    period_start = min(first for first, _ in bounds.values())
+    period_end = max(last for _, last in bounds.values())
+    start_dt = datetime.combine(period_start, time.min)
+    end_dt = datetime.combine(period_end + timedelta(days=1), time.min)
+
+    components = defaultdict(lambda: dict.fromkeys(PAYROLL_FIELDS, 0))
+
+    # -------- BHATTA (TRIPS WITHOUT DRIVER CHANGES) --------
+    has_changes = exists().where(TripDriverChange.trip_id == Trip.id)
+    trip_year = extract("year", Trip.trip_date)
+    trip_month = extract("month", Trip.trip_date)
+
+    bhatta_rows = (
+        db.query(
+            Trip.driver_id,
+            trip_year.label("year"),
+            trip_month.label("month"),
+            func.sum(Trip.driver_bhatta).label("bhatta"),
+        )
+        .filter(
+            Trip.trip_date.between(period_start, period_end),
+            Trip.driver_id.isnot(None),
+            ~has_changes,
+        )
+        .group_by(Trip.driver_id, trip_year, trip_month)
+        .all()
+    )
+    for row in bhatta_rows:
+        components[(_month_key(row.year, row.month), row.driver_id)]["bhatta"] += row.bhatta or 0
+
+    # -------- BHATTA (TRIPS SPLIT BY DRIVER-CHANGE SEGMENTS) --------
+    split_rows = (
+        db.query(
+            Trip.id,
+            Trip.trip_date,
+            Trip.driver_id,
+            Trip.driver_bhatta,
+            Trip.departure_datetime,
+            Trip.return_datetime,
+            TripDriverChange.driver_id.label("change_driver_id"),
+            TripDriverChange.start_time,
+            TripDriverChange.end_time,
+        )
+        .join(TripDriverChange, TripDriverChange.trip_id == Trip.id)
+        .filter(
+            Trip.trip_date.between(period_start, period_end),
+            Trip.driver_bhatta > 0,
+        )
+        .order_by(Trip.id)
+        .all()
+    )
+    split_trips = {}
+    for row in split_rows:
+        trip, changes = split_trips.setdefault(row.id, (row, []))
+        changes.append(
+            SimpleNamespace(driver_id=row.change_driver_id, start_time=row.start_time, end_time=row.end_time)
+        )
+    for trip, changes in split_trips.values():
+        month = _month_key(trip.trip_date.year, trip.trip_date.month)
+        for driver_id, share in _split_bhatta(trip, changes).items():
+            if driver_id is not None:
+                components[(month, driver_id)]["bhatta"] += share
+
+    # -------- REIMBURSABLE EXPENSES --------
+    expense_year = extract("year", DriverExpense.created_at)
+    expense_month = extract("month", DriverExpense.created_at)
+    expense_rows = (
+        db.query(
+            DriverExpense.driver_id,
+            expense_year.label("year"),
+            expense_month.label("month"),
+            func.sum(DriverExpense.amount).label("amount"),
+        )
+        .filter(DriverExpense.created_at >= start_dt, DriverExpense.created_at < end_dt)
+        .group_by(DriverExpense.driver_id, expense_year, expense_month)
+        .all()
+    )
+    for row in expense_rows:
+        components[(_month_key(row.year, row.month), row.driver_id)]["expenses"] += row.amount or 0
+
+    # -------- ALREADY PAID --------
+    paid_year = extract("year", DriverSalary.paid_on)
+    paid_month = extract("month", DriverSalary.paid_on)
+    paid_rows = (
+        db.query(
+            DriverSalary.driver_id,
+            paid_year.label("year"),
+            paid_month.label("month"),
+            func.sum(DriverSalary.amount).label("amount"),
+        )
+        .filter(DriverSalary.paid_on.between(period_start, period_end))
+        .group_by(DriverSalary.driver_id, paid_year, paid_month)
+        .all()
+    )
+    for row in paid_rows:
+        components[(_month_key(row.year, row.month), row.driver_id)]["paid"] += row.amount or 0
+
+    # -------- BASE SALARY --------
+    drivers = db.query(Driver).all()
+    known = {driver.id for driver in drivers}
+    for month, (first_day, last_day) in bounds.items():
+        for driver in drivers:
+            days, base = _prorated_salary(driver, first_day, last_day)
+            if days or (month, driver.id) in components:
+                line = components[(month, driver.id)]
+                line["payable_days"] = days
+                line["base_salary"] = base
+
+    result = {}
+    for (month, driver_id), line in components.items():
+        if month not in bounds or driver_id not in known:
+            continue
+        line["net_due"] = line["base_salary"] + line["bhatta"] + line["expenses"] - line["paid"]
+        result[(month, driver_id)] = {
+            field: (value if field == "payable_days" else round(value, 2))
+            for field, value in line.items()
+        }
+    return result
+
+
+def run_payroll(db: Session, months: list[str]):
+    """
+    Compute and store payroll runs for the given months.
+
+    Re-running a month only rewrites the lines whose inputs changed since
+    the last run; unchanged lines are left as they are.
+    """
+    computed = compute_payroll(db, months)
+
+    runs = {run.month: run for run in db.query(PayrollRun).filter(PayrollRun.month.in_(months)).all()}
+    for month in months:
+        if month not in runs:
+            runs[month] = PayrollRun(month=month)
+            db.add(runs[month])
+    db.flush()
+
+    run_months = {run.id: run.month for run in runs.values()}
+    existing = {
+        (run_months[line.run_id], line.driver_id): line
+        for line in db.query(PayrollLine).filter(PayrollLine.run_id.in_(run_months))
+    }
+
+    changed = defaultdict(int)
+    for key, values in computed.items():
+        month, driver_id = key
+        line = existing.pop(key, None)
+        if line is None:
+            db.add(PayrollLine(run_id=runs[month].id, driver_id=driver_id, **values))
+            changed[month] += 1
+        elif any(getattr(line, field) != values[field] for field in PAYROLL_FIELDS):
+            for field in PAYROLL_FIELDS:
+                setattr(line, field, values[field])
+            changed[month] += 1
+
+    # Drivers that no longer have anything due in a month
+    for (month, _driver_id), line in existing.items():
+        db.delete(line)
+        changed[month] += 1
+
+    totals = defaultdict(lambda: [0, 0.0])
+    for (month, _driver_id), values in computed.items():
+        totals[month][0] += 1
+        totals[month][1] += values["net_due"]
+
+    for month, run in runs.items():
+        run.driver_count, total = totals[month]
+        run.total_net_due = round(total, 2)
+        run.changed_lines = changed[month]
+        run.updated_at = func.now()
+
+    db.commit()
+    return [runs[month] for month in months]
+
+
+def year_months(year: int) -> list[str]:
+    return [_month_key(year, month) for month in range(1, 13)]
+
+
+def list_payroll_runs(db: Session):
+    return db.query(PayrollRun).order_by(PayrollRun.month.desc()).all()
+
+
+def get_payroll_run(db: Session, month: str):
+    return (
+        db.query(PayrollRun)
+        .options(selectinload(PayrollRun.lines).joinedload(PayrollLine.driver))
+        .filter(PayrollRun.month == month)
+        .first()
+    )
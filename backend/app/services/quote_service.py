@@ -0,0 +1,331 @@
+import math
+import threading
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+
+from app.database.session import SessionLocal
+from app.models.trip import Trip
+from app.models.vehicle import Vehicle
+from app.services.booking_service import busy_window
+from app.services.data_version_service import committed_tables, data_versions
+from app.services.location_service import find_location_id
+
+# Trips older than this do not inform quotes
+QUOTE_HISTORY_DAYS = 730
+# Most recent trips kept per (route, vehicle class)
+QUOTE_SAMPLE_SIZE = 200
+# Fewer samples than this and the next, broader level is tried
+QUOTE_MIN_SAMPLES = 3
+# Background rebuild after this long, so trips age out of the history window
+QUOTE_INDEX_MAX_AGE = 6 * 3600
+# A write to any of these, by any worker, makes the next quote rebuild the index
+QUOTE_TABLES = ("trips", "locations", "vehicles")
+
+ALL_CLASSES = "*"
+
+METRICS = (
+    "distance_km", "cost_per_km", "package_amount", "toll_amount", "parking_amount",
+    "charged_toll_amount", "charged_parking_amount", "bhatta_per_day", "days",
+)
+
+# Broadest last: the reverse route is usually a similar trip
+LEVELS = (
+    ("route_class", False, True),
+    ("route", False, False),
+    ("reverse_route_class", True, True),
+    ("reverse_route", True, False),
+)
+
+
+# ===============================
+# INDEX
+# ===============================
+#
+# {(from_location_id, to_location_id): {vehicle_class or "*": summary}}
+# where a summary holds p25 / median / p75 of every metric over the
+# group's most recent trips. Lookups are dict reads.
+#
+# Each worker holds its own index. The worker handling a trip write
+# refreshes the affected routes at once; the others see the write through
+# data_versions of QUOTE_TABLES and rebuild in the background, serving the
+# previous index meanwhile.
+
+# One full build at a time; lookups and route refreshes only take _swap_lock
+_build_lock = threading.Lock()
+_swap_lock = threading.Lock()
+_quote_index = {"built_at": None, "versions": None, "routes": {}, "rebuilding": False}
+
+
+def _days(busy_from, busy_until) -> int:
+    if not busy_from or not busy_until:
+        return 1
+    return max(1, math.ceil((busy_until - busy_from).total_seconds() / 86400))
+
+
+def _positive(value):
+    return value if value and value > 0 else None
+
+
+def _sample(row) -> dict:
+    days = _days(row.busy_from, row.busy_until)
+    package = row.pricing_type == "package"
+    return {
+        "distance_km": _positive(row.distance_km),
+        "cost_per_km": None if package else _positive(row.cost_per_km),
+        "package_amount": _positive(row.package_amount) if package else None,
+        "toll_amount": row.toll_amount or 0,
+        "parking_amount": row.parking_amount or 0,
+        "charged_toll_amount": row.charged_toll_amount or 0,
+        "charged_parking_amount": row.charged_parking_amount or 0,
+        "bhatta_per_day": (row.driver_bhatta or 0) / days,
+        "days": days,
+    }
+
+
+def _quantile(values, q: float):
+    """Linear interpolation between closest ranks of sorted values"""
+    position = (len(values) - 1) * q
+    low = math.floor(position)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (position - low)
+
+
+def _summarize(samples) -> dict:
+    metrics = {}
+    for metric in METRICS:
+        values = sorted(s[metric] for s in samples if s[metric] is not None)
+        metrics[metric] = {
+            "p25": round(_quantile(values, 0.25), 2),
+            "median": round(_quantile(values, 0.5), 2),
+            "p75": round(_quantile(values, 0.75), 2),
+            "samples": len(values),
+        } if values else None
+    return {"samples": len(samples), "metrics": metrics}
+
+
+def _history(routes=None):
+    stmt = (
+        select(
+            Trip.from_location_id, Trip.to_location_id, Trip.busy_from, Trip.busy_until,
+            Trip.pricing_type, Trip.distance_km, Trip.cost_per_km, Trip.package_amount,
+            Trip.toll_amount, Trip.parking_amount, Trip.charged_toll_amount,
+            Trip.charged_parking_amount, Trip.driver_bhatta, Vehicle.vehicle_class,
+        )
+        .outerjoin(Vehicle, Vehicle.vehicle_number == Trip.vehicle_number)
+        .where(
+            Trip.trip_date >= date.today() - timedelta(days=QUOTE_HISTORY_DAYS),
+            Trip.from_location_id.isnot(None),
+            Trip.to_location_id.isnot(None),
+        )
+        .order_by(Trip.trip_date.desc(), Trip.id.desc())
+    )
+    if routes is not None:
+        stmt = stmt.where(or_(*(
+            and_(Trip.from_location_id == from_id, Trip.to_location_id == to_id)
+            for from_id, to_id in routes
+        )))
+    return stmt
+
+
+def _collect(rows) -> dict:
+    """Newest-first rows -> route summaries, QUOTE_SAMPLE_SIZE trips per group"""
+    samples = defaultdict(lambda: defaultdict(list))
+    for row in rows:
+        groups = samples[(row.from_location_id, row.to_location_id)]
+        sample = None
+        for vehicle_class in (ALL_CLASSES, row.vehicle_class):
+            if vehicle_class is None or len(groups[vehicle_class]) >= QUOTE_SAMPLE_SIZE:
+                continue
+            sample = sample or _sample(row)
+            groups[vehicle_class].append(sample)
+    return {
+        route: {vehicle_class: _summarize(group) for vehicle_class, group in groups.items()}
+        for route, groups in samples.items()
+    }
+
+
+def build_quote_index(db: Session, force: bool = False):
+    """Full build from trip history (startup, then in the background when stale)"""
+    with _build_lock:
+        built_at = _quote_index["built_at"]
+        if not force and built_at is not None and time.monotonic() - built_at < QUOTE_INDEX_MAX_AGE:
+            return
+        started = time.monotonic()
+        # Read before the trips, so a write landing mid-build triggers another one
+        versions = data_versions(db, QUOTE_TABLES)
+        routes = _collect(db.execute(_history()))
+        with _swap_lock:
+            _quote_index["routes"] = routes
+            _quote_index["versions"] = versions
+            _quote_index["built_at"] = started
+
+
+def _rebuild_in_background():
+    with _swap_lock:
+        if _quote_index["rebuilding"]:
+            return
+        _quote_index["rebuilding"] = True
+
+    def rebuild():
+        db = SessionLocal()
+        try:
+            build_quote_index(db, force=True)
+        finally:
+            db.close()
+            with _swap_lock:
+                _quote_index["rebuilding"] = False
+
+    threading.Thread(target=rebuild, name="quote-index", daemon=True).start()
+
+
+def _stale(db: Session) -> bool:
+    if time.monotonic() - _quote_index["built_at"] > QUOTE_INDEX_MAX_AGE:
+        return True
+    return data_versions(db, QUOTE_TABLES) != _quote_index["versions"]
+
+
+def refresh_quote_routes(db: Session, *routes):
+    """
+    Re-summarize the given (from_location_id, to_location_id) routes after
+    a trip write; only those routes' recent trips are read. The index then
+    takes the versions the write committed, unless another write landed
+    meanwhile: that one is left to the background rebuild.
+    """
+    routes = {route for route in routes if route[0] and route[1]}
+    if _quote_index["built_at"] is None:
+        return
+    summaries = _collect(db.execute(_history(routes))) if routes else {}
+    own = committed_tables(db)
+    with _swap_lock:
+        for route in routes:
+            if route in summaries:
+                _quote_index["routes"][route] = summaries[route]
+            else:
+                _quote_index["routes"].pop(route, None)
+
+        known = _quote_index["versions"]
+        if known is None or not own:
+            return
+        current = data_versions(db, QUOTE_TABLES)
+        if current == {table: version + (table in own) for table, version in known.items()}:
+            _quote_index["versions"] = current
+
+
+def refresh_vehicle_routes(db: Session, vehicle_number: str):
+    """Re-summarize the routes a vehicle ran, after its class changed"""
+    if _quote_index["built_at"] is None:
+        return
+    routes = db.execute(
+        select(Trip.from_location_id, Trip.to_location_id)
+        .where(
+            Trip.vehicle_number == vehicle_number,
+            Trip.trip_date >= date.today() - timedelta(days=QUOTE_HISTORY_DAYS),
+        )
+        .distinct()
+    ).all()
+    refresh_quote_routes(db, *(tuple(route) for route in routes))
+
+
+def invalidate_quote_index():
+    """Rebuild in the background (e.g. after locations were merged)"""
+    _rebuild_in_background()
+
+
+# ===============================
+# QUOTES
+# ===============================
+
+def _pick(routes, from_id, to_id, vehicle_class):
+    """First level with QUOTE_MIN_SAMPLES trips, else the best-populated one"""
+    best = None
+    for basis, reverse, by_class in LEVELS:
+        if by_class and not vehicle_class:
+            continue
+        route = (to_id, from_id) if reverse else (from_id, to_id)
+        summary = routes.get(route, {}).get(vehicle_class if by_class else ALL_CLASSES)
+        if summary is None:
+            continue
+        if summary["samples"] >= QUOTE_MIN_SAMPLES:
+            return basis, summary
+        if best is None or summary["samples"] > best[1]["samples"]:
+            best = (basis, summary)
+    return best or (None, None)
+
+
+def _median(summary, metric):
+    values = summary["metrics"][metric] if summary else None
+    return values["median"] if values else None
+
+
+def quote_trip(db: Session, data):
+    """
+    Suggested pricing for a booking from the route statistics index:
+    medians of recent trips on the route (same vehicle class first, then
+    any class, then the reverse route). Driver bhatta is scaled to the
+    requested number of days.
+    """
+    if _quote_index["built_at"] is None:
+        # Only before the startup build finishes
+        build_quote_index(db)
+    elif _stale(db):
+        _rebuild_in_background()
+
+    from_id = find_location_id(db, data.from_location)
+    to_id = find_location_id(db, data.to_location)
+
+    vehicle_class = data.vehicle_class
+    if not vehicle_class and data.vehicle_number:
+        vehicle_class = db.query(Vehicle.vehicle_class).filter(
+            Vehicle.vehicle_number == data.vehicle_number
+        ).scalar()
+
+    basis, summary = _pick(_quote_index["routes"], from_id, to_id, vehicle_class)
+
+    if data.trip_date or data.departure_datetime:
+        start, end = busy_window(
+            data.trip_date or data.departure_datetime.date(), data.departure_datetime, data.return_datetime
+        )
+        days = _days(start, end)
+    else:
+        days = int(_median(summary, "days") or 1)
+
+    distance = _median(summary, "distance_km")
+    cost_per_km = _median(summary, "cost_per_km") if data.pricing_type == "per_km" else None
+    package_amount = _median(summary, "package_amount") if data.pricing_type == "package" else None
+    bhatta_per_day = _median(summary, "bhatta_per_day")
+    charged_toll = _median(summary, "charged_toll_amount") or 0
+    charged_parking = _median(summary, "charged_parking_amount") or 0
+
+    fare = package_amount if data.pricing_type == "package" else (
+        distance * cost_per_km if distance and cost_per_km else None
+    )
+
+    return {
+        "from_location": data.from_location,
+        "to_location": data.to_location,
+        "from_location_id": from_id,
+        "to_location_id": to_id,
+        "vehicle_class": vehicle_class,
+        "pricing_type": data.pricing_type,
+        "basis": basis,
+        "sample_size": summary["samples"] if summary else 0,
+        "days": days,
+        "distance_km": round(distance) if distance else None,
+        "cost_per_km": cost_per_km,
+        "package_amount": package_amount,
+        "toll_amount": _median(summary, "toll_amount"),
+        "parking_amount": _median(summary, "parking_amount"),
+        "charged_toll_amount": charged_toll,
+        "charged_parking_amount": charged_parking,
+        "driver_bhatta": round(bhatta_per_day * days, 2) if bhatta_per_day is not None else None,
+        "estimated_total": round(fare + charged_toll + charged_parking, 2) if fare else None,
+        "ranges": {
+            metric: values
+            for metric, values in (summary["metrics"].items() if summary else ())
+            if values and metric != "days"
+        },
+    }
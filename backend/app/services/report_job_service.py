@@ -0,0 +1,217 @@
+import csv
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.database.session import SessionLocal
+from app.models.report_job import ReportJob
+from app.services.data_version_service import data_versions
+from app.services.export_service import EXPORTS, export_select
+
+try:
+    from openpyxl import Workbook
+except ImportError:  # XLSX output is optional
+    Workbook = None
+
+REPORTS_DIR = Path(os.getenv("REPORTS_DIR", Path(__file__).resolve().parents[2] / "generated_reports"))
+REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", "2"))
+CHUNK_SIZE = 2000
+# A job still queued/running after this long is assumed lost (e.g. worker restart)
+JOB_TIMEOUT = timedelta(hours=1)
+
+FORMATS = ("csv", "xlsx")
+
+_executor = ThreadPoolExecutor(max_workers=REPORT_WORKERS, thread_name_prefix="report-job")
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def _aware(value: datetime | None):
+    # SQLite returns naive datetimes even for timezone=True columns
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+# ===============================
+# WRITERS
+# ===============================
+
+def _write_csv(path: Path, header, chunks):
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for chunk in chunks:
+            writer.writerows([getattr(value, "value", value) for value in row] for row in chunk)
+            count += len(chunk)
+    return count
+
+
+def _xlsx_value(value):
+    # Excel has no timezones
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.replace(tzinfo=None)
+    return getattr(value, "value", value)  # enums
+
+
+def _write_xlsx(path: Path, header, chunks):
+    count = 0
+    # write_only streams rows to disk instead of building the sheet in memory
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(header)
+    for chunk in chunks:
+        for row in chunk:
+            sheet.append([_xlsx_value(value) for value in row])
+        count += len(chunk)
+    workbook.save(path)
+    return count
+
+
+WRITERS = {"csv": _write_csv, "xlsx": _write_xlsx}
+
+
+# ===============================
+# JOBS
+# ===============================
+
+def _run_job(job_id: int):
+    db = SessionLocal()
+    partial = None
+    try:
+        job = db.get(ReportJob, job_id)
+        job.status = "running"
+        job.started_at = _now()
+        db.commit()
+
+        params = json.loads(job.params)
+        stmt = export_select(
+            job.report,
+            date.fromisoformat(params["from"]) if params["from"] else None,
+            date.fromisoformat(params["to"]) if params["to"] else None,
+            params["vehicle_number"],
+        )
+
+        REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+        path = REPORTS_DIR / f"{job.report}-{job.cache_key[:16]}.{job.format}"
+        partial = path.with_name(path.name + ".part")
+
+        # Server-side cursor, CHUNK_SIZE rows per fetch
+        result = db.connection().execute(stmt.execution_options(yield_per=CHUNK_SIZE))
+        row_count = WRITERS[job.format](partial, list(result.keys()), result.partitions())
+        os.replace(partial, path)
+
+        job.status = "done"
+        job.file_path = str(path)
+        job.row_count = row_count
+        job.file_size = path.stat().st_size
+        job.finished_at = _now()
+        db.commit()
+    except Exception as exc:
+        db.rollback()
+        if partial is not None and partial.exists():
+            partial.unlink()
+        job = db.get(ReportJob, job_id)
+        if job:
+            job.status = "failed"
+            job.error = str(exc)
+            job.finished_at = _now()
+            db.commit()
+    finally:
+        db.close()
+
+
+def _params(date_from, date_to, vehicle_number):
+    return {
+        "from": date_from.isoformat() if date_from else None,
+        "to": date_to.isoformat() if date_to else None,
+        "vehicle_number": vehicle_number or None,
+    }
+
+
+def submit_report_job(
+    db: Session,
+    report: str,
+    fmt: str = "csv",
+    date_from=None,
+    date_to=None,
+    vehicle_number: str | None = None,
+):
+    """
+    Queue a report, or return the job that already answers it.
+
+    Jobs are keyed by (report, format, params, data versions of the tables
+    the report reads). Versions are read before the rows are, so a cached
+    artifact is never older than its key; any write to those tables makes
+    the next request a cache miss.
+    """
+    if report not in EXPORTS:
+        raise HTTPException(status_code=400, detail=f"Unknown report: {report}")
+    if fmt not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format: {fmt}")
+    if fmt == "xlsx" and Workbook is None:
+        raise HTTPException(status_code=400, detail="XLSX export needs openpyxl installed")
+    if vehicle_number and EXPORTS[report]["vehicle"] is None:
+        raise HTTPException(status_code=400, detail=f"{report} cannot be filtered by vehicle")
+
+    params = json.dumps(_params(date_from, date_to, vehicle_number), sort_keys=True)
+    versions = data_versions(db, EXPORTS[report]["tables"])
+    cache_key = hashlib.sha256(
+        json.dumps([report, fmt, params, versions], sort_keys=True).encode()
+    ).hexdigest()
+
+    for job in (
+        db.query(ReportJob)
+        .filter(ReportJob.cache_key == cache_key, ReportJob.status != "failed")
+        .order_by(ReportJob.id.desc())
+    ):
+        if job.status == "done" and job.file_path and os.path.exists(job.file_path):
+            return job
+        if job.status in ("queued", "running") and _now() - _aware(job.created_at or _now()) < JOB_TIMEOUT:
+            return job
+
+    job = ReportJob(report=report, format=fmt, params=params, cache_key=cache_key, status="queued")
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+
+    _executor.submit(_run_job, job.id)
+    return job
+
+
+def list_report_jobs(db: Session, limit: int = 50):
+    return db.query(ReportJob).order_by(ReportJob.id.desc()).limit(limit).all()
+
+
+def get_report_job(db: Session, job_id: int):
+    return db.query(ReportJob).filter(ReportJob.id == job_id).first()
+
+
+def delete_report_job(db: Session, job_id: int):
+    job = get_report_job(db, job_id)
+    if not job:
+        return None  # handled in route with 404
+    if job.status in ("queued", "running"):
+        raise HTTPException(status_code=409, detail="Report is still being generated")
+
+    # Another job may share the artifact when it was served from cache
+    shared = (
+        db.query(ReportJob.id)
+        .filter(ReportJob.file_path == job.file_path, ReportJob.id != job.id)
+        .first()
+    )
+    if job.file_path and not shared and os.path.exists(job.file_path):
+        os.remove(job.file_path)
+
+    db.delete(job)
+    db.commit()
+    return True
@@ -0,0 +1,282 @@
+from datetime import timedelta
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from sqlalchemy import Float, extract, func, literal, select, union_all
+
+from app.models.trip import Trip
+from app.models.fuel import Fuel
+from app.models.spare_part import SparePart
+from app.models.maintenance import Maintenance
+from app.models.driver import Driver
+from app.models.customer import Customer
+
+# Largest number of groups a single report may return
+MAX_REPORT_ROWS = 10000
+
+
+# ===============================
+# REGISTRY
+# ===============================
+#
+# A source is one fact table. It names its date column, the columns each
+# dimension / filter maps to and the metrics it can sum. A report reads
+# only the sources behind the requested metrics, so every requested
+# dimension and filter must exist on each of them.
+
+SOURCES = {
+    "trips": {
+        "date": Trip.trip_date,
+        "dimensions": {
+            "month": (extract("year", Trip.trip_date) * 100 + extract("month", Trip.trip_date),),
+            "vehicle": (Trip.vehicle_number,),
+            "driver": (Trip.driver_id,),
+            "customer": (Trip.customer_id,),
+            "route": (Trip.from_location, Trip.to_location),
+            "pricing_type": (Trip.pricing_type,),
+        },
+        "filters": {
+            "vehicle_number": Trip.vehicle_number,
+            "driver_id": Trip.driver_id,
+            "customer_id": Trip.customer_id,
+            "pricing_type": Trip.pricing_type,
+        },
+        "metrics": {
+            "trips": func.count(Trip.id),
+            "km": func.sum(Trip.distance_km),
+            "income": func.sum(Trip.total_charged),
+            "cost": func.sum(Trip.total_cost),
+            "dues": func.sum(Trip.pending_amount),
+        },
+    },
+    "fuel": {
+        "date": Fuel.filled_date,
+        "dimensions": {
+            "month": (extract("year", Fuel.filled_date) * 100 + extract("month", Fuel.filled_date),),
+            "vehicle": (Fuel.vehicle_number,),
+        },
+        "filters": {"vehicle_number": Fuel.vehicle_number},
+        "metrics": {"fuel": func.sum(Fuel.total_cost)},
+    },
+    "spares": {
+        "date": SparePart.replaced_date,
+        "dimensions": {
+            "month": (extract("year", SparePart.replaced_date) * 100 + extract("month", SparePart.replaced_date),),
+            "vehicle": (SparePart.vehicle_number,),
+        },
+        "filters": {"vehicle_number": SparePart.vehicle_number},
+        "metrics": {"spares": func.sum(SparePart.cost * SparePart.quantity)},
+    },
+    "maintenance": {
+        "date": Maintenance.start_date,
+        "dimensions": {
+            "month": (extract("year", Maintenance.start_date) * 100 + extract("month", Maintenance.start_date),),
+            "vehicle": (Maintenance.vehicle_number,),
+        },
+        "filters": {"vehicle_number": Maintenance.vehicle_number},
+        "metrics": {"maintenance": func.sum(Maintenance.amount)},
+    },
+}
+
+# Metrics computed from other metrics once the groups are summed
+DERIVED_METRICS = {
+    "profit": (
+        ("income", "cost", "fuel", "spares", "maintenance"),
+        lambda m: m["income"] - m["cost"] - m["fuel"] - m["spares"] - m["maintenance"],
+    ),
+}
+
+
+def _format_month(value):
+    value = int(value)
+    return f"{value // 100:04d}-{value % 100:02d}"
+
+
+def _format_route(from_location, to_location):
+    return f"{from_location} → {to_location}"
+
+
+# How a dimension's grouped column(s) become one output value
+DIMENSION_FORMATS = {
+    "month": _format_month,
+    "route": _format_route,
+}
+
+# Dimensions grouped by id, with the names sent alongside in "labels"
+DIMENSION_LABELS = {
+    "driver": (Driver.id, Driver.name),
+    "customer": (Customer.id, Customer.name),
+}
+
+DIMENSIONS = tuple(SOURCES["trips"]["dimensions"])
+METRICS = tuple(
+    [metric for source in SOURCES.values() for metric in source["metrics"]] + list(DERIVED_METRICS)
+)
+
+
+def _metric_source(metric: str) -> str:
+    return next(name for name, source in SOURCES.items() if metric in source["metrics"])
+
+
+# ===============================
+# COMPILE
+# ===============================
+
+def _validate(dimensions, metrics, filters):
+    unknown = [d for d in dimensions if d not in DIMENSIONS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown dimension(s): {', '.join(unknown)}")
+    unknown = [m for m in metrics if m not in METRICS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown metric(s): {', '.join(unknown)}")
+    if not metrics:
+        raise HTTPException(status_code=400, detail="At least one metric is required")
+    if len(set(dimensions)) != len(dimensions) or len(set(metrics)) != len(metrics):
+        raise HTTPException(status_code=400, detail="Dimensions and metrics must not repeat")
+
+    # Base metrics to sum: requested ones plus the inputs of derived ones
+    base = []
+    for metric in metrics:
+        for needed in DERIVED_METRICS[metric][0] if metric in DERIVED_METRICS else (metric,):
+            if needed not in base:
+                base.append(needed)
+
+    sources = []
+    for metric in base:
+        name = _metric_source(metric)
+        source = SOURCES[name]
+        for dimension in dimensions:
+            if dimension not in source["dimensions"]:
+                raise HTTPException(
+                    status_code=400, detail=f"Metric '{metric}' cannot be grouped by {dimension}"
+                )
+        for key in filters:
+            if key not in source["filters"]:
+                raise HTTPException(status_code=400, detail=f"Metric '{metric}' cannot be filtered by {key}")
+        if name not in sources:
+            sources.append(name)
+
+    return base, sources
+
+
+def _source_select(name: str, dimensions, base, date_from, date_to, filters):
+    """Grouped select of one source: its dimension columns, then every base metric (0 when not its own)"""
+    source = SOURCES[name]
+    group = [
+        column.label(f"{dimension}_{i}")
+        for dimension in dimensions
+        for i, column in enumerate(source["dimensions"][dimension])
+    ]
+    sums = [
+        func.coalesce(source["metrics"][metric], 0).label(metric)
+        if metric in source["metrics"] else literal(0.0, Float).label(metric)
+        for metric in base
+    ]
+
+    stmt = select(*group, *sums)
+    if date_from:
+        stmt = stmt.where(source["date"] >= date_from)
+    if date_to:
+        # Exclusive upper bound also covers datetime columns on the last day
+        stmt = stmt.where(source["date"] < date_to + timedelta(days=1))
+    for key, value in filters.items():
+        stmt = stmt.where(source["filters"][key] == value)
+    if group:
+        stmt = stmt.group_by(*group)
+    return stmt
+
+
+def _labels(db: Session, dimensions, columns):
+    labels = {}
+    for dimension in dimensions:
+        if dimension not in DIMENSION_LABELS:
+            continue
+        ids = {value for value in columns[dimension] if value is not None}
+        key, name = DIMENSION_LABELS[dimension]
+        labels[dimension] = {
+            str(row[0]): row[1] for row in db.execute(select(key, name).where(key.in_(ids)))
+        } if ids else {}
+    return labels
+
+
+def run_report(
+    db: Session,
+    dimensions: list[str],
+    metrics: list[str],
+    date_from=None,
+    date_to=None,
+    filters: dict | None = None,
+    sort: str | None = None,
+    limit: int | None = None,
+):
+    """
+    Compile a (dimensions x metrics) request into one grouped SQL statement:
+    each source behind the requested metrics is grouped on its own, the
+    partial groups are UNION ALL'd and summed again per dimension tuple.
+    Work after the database is proportional to the number of groups.
+
+    The result is columnar: one list per dimension and metric, all aligned.
+    `sort` is a dimension or metric name, "-" prefixed for descending;
+    totals cover every group, before `limit` is applied.
+    """
+    filters = {key: value for key, value in (filters or {}).items() if value is not None}
+    base, sources = _validate(dimensions, metrics, filters)
+
+    parts = [_source_select(name, dimensions, base, date_from, date_to, filters) for name in sources]
+    rows = parts[0].subquery() if len(parts) == 1 else union_all(*parts).subquery()
+
+    group = [column for column in rows.c if column.name not in base]
+    stmt = select(*group, *(func.sum(rows.c[metric]).label(metric) for metric in base))
+    if group:
+        stmt = stmt.group_by(*group).order_by(*group)
+
+    widths = [len(SOURCES[sources[0]]["dimensions"][dimension]) for dimension in dimensions]
+    keys, values = [], []
+    for row in db.execute(stmt):
+        position, key = 0, []
+        for dimension, width in zip(dimensions, widths):
+            grouped = row[position:position + width]
+            position += width
+            fmt = DIMENSION_FORMATS.get(dimension)
+            key.append(fmt(*grouped) if fmt and None not in grouped else grouped[0])
+
+        summed = {metric: float(row[position + i] or 0) for i, metric in enumerate(base)}
+        for metric in metrics:
+            if metric in DERIVED_METRICS:
+                summed[metric] = DERIVED_METRICS[metric][1](summed)
+        keys.append(key)
+        values.append([summed[metric] for metric in metrics])
+
+    totals = {
+        metric: round(sum(v[i] for v in values), 2)
+        for i, metric in enumerate(metrics)
+    }
+
+    order = list(range(len(keys)))
+    if sort:
+        field = sort.lstrip("-")
+        if field in dimensions:
+            i = dimensions.index(field)
+            order.sort(key=lambda r: (keys[r][i] is None, keys[r][i]), reverse=sort.startswith("-"))
+        elif field in metrics:
+            i = metrics.index(field)
+            order.sort(key=lambda r: values[r][i], reverse=sort.startswith("-"))
+        else:
+            raise HTTPException(status_code=400, detail=f"Cannot sort by '{field}'")
+
+    group_count = len(order)
+    order = order[:min(limit or MAX_REPORT_ROWS, MAX_REPORT_ROWS)]
+
+    columns = {dimension: [keys[r][i] for r in order] for i, dimension in enumerate(dimensions)}
+    for i, metric in enumerate(metrics):
+        columns[metric] = [round(values[r][i], 2) for r in order]
+
+    return {
+        "dimensions": dimensions,
+        "metrics": metrics,
+        "row_count": len(order),
+        "group_count": group_count,
+        "columns": columns,
+        "labels": _labels(db, dimensions, columns),
+        "totals": totals,
+    }
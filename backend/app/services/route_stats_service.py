@@ -0,0 +1,112 @@
+from datetime import date
+
+from fastapi import HTTPException
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.orm import Session, aliased
+
+from app.models.trip import Trip
+from app.models.location import Location
+
+ROUTE_SORTS = ("trips", "median_distance_km", "revenue_per_km", "avg_toll", "revenue")
+
+
+def route_stats(
+    db: Session,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    vehicle_number: str | None = None,
+    min_trips: int = 1,
+    sort: str = "trips",
+    limit: int = 100,
+):
+    """
+    Per (from, to) location pair: trips, median distance, revenue per km,
+    average toll and revenue. Grouped on the integer location ids; names
+    are joined to the grouped rows only.
+
+    The median comes from ROW_NUMBER / COUNT windows over each pair (no
+    percentile function needed, so it also runs on SQLite); trips without
+    a distance (package pricing) are left out of distance and revenue/km.
+    """
+    if sort not in ROUTE_SORTS:
+        raise HTTPException(status_code=400, detail="Invalid sort")
+
+    conditions = [Trip.from_location_id.isnot(None), Trip.to_location_id.isnot(None)]
+    if date_from:
+        conditions.append(Trip.trip_date >= date_from)
+    if date_to:
+        conditions.append(Trip.trip_date <= date_to)
+    if vehicle_number:
+        conditions.append(Trip.vehicle_number == vehicle_number)
+
+    pair = (Trip.from_location_id, Trip.to_location_id)
+    distance = func.coalesce(Trip.distance_km, 0)
+    ranked = (
+        select(
+            Trip.from_location_id.label("from_id"),
+            Trip.to_location_id.label("to_id"),
+            distance.label("distance"),
+            func.coalesce(Trip.total_charged, 0.0).label("revenue"),
+            func.coalesce(Trip.toll_amount, 0.0).label("toll"),
+            func.row_number().over(partition_by=pair, order_by=distance).label("position"),
+            func.count().over(partition_by=pair).label("pair_trips"),
+            func.sum(case((distance > 0, 1), else_=0)).over(partition_by=pair).label("with_distance"),
+        )
+        .where(*conditions)
+        .subquery()
+    )
+
+    # Zero distances sort first; the median sits in the middle of the rest
+    skipped = ranked.c.pair_trips - ranked.c.with_distance
+    middle = and_(
+        ranked.c.with_distance > 0,
+        ranked.c.position >= skipped + (ranked.c.with_distance + 1) // 2,
+        ranked.c.position <= skipped + (ranked.c.with_distance + 2) // 2,
+    )
+    has_distance = ranked.c.distance > 0
+
+    stats = (
+        select(
+            ranked.c.from_id,
+            ranked.c.to_id,
+            func.count().label("trips"),
+            (
+                func.sum(case((middle, ranked.c.distance), else_=0)) * 1.0
+                / func.nullif(func.sum(case((middle, 1), else_=0)), 0)
+            ).label("median_distance_km"),
+            (
+                func.sum(case((has_distance, ranked.c.revenue), else_=0.0))
+                / func.nullif(func.sum(ranked.c.distance), 0)
+            ).label("revenue_per_km"),
+            func.avg(ranked.c.toll).label("avg_toll"),
+            func.sum(ranked.c.revenue).label("revenue"),
+        )
+        .group_by(ranked.c.from_id, ranked.c.to_id)
+        .having(func.count() >= min_trips)
+        .subquery()
+    )
+
+    origin = aliased(Location)
+    destination = aliased(Location)
+    rows = db.execute(
+        select(stats, origin.name.label("from_location"), destination.name.label("to_location"))
+        .join(origin, origin.id == stats.c.from_id)
+        .join(destination, destination.id == stats.c.to_id)
+        .order_by(stats.c[sort].desc().nulls_last(), stats.c.from_id, stats.c.to_id)
+        .limit(limit)
+    ).all()
+
+    return [
+        {
+            "from_location_id": row.from_id,
+            "from_location": row.from_location,
+            "to_location_id": row.to_id,
+            "to_location": row.to_location,
+            "trips": row.trips,
+            "median_distance_km": round(float(row.median_distance_km), 1) if row.median_distance_km is not None else None,
+            "revenue_per_km": round(float(row.revenue_per_km), 2) if row.revenue_per_km is not None else None,
+            "avg_toll": round(float(row.avg_toll or 0), 2),
+            "revenue": round(float(row.revenue or 0), 2),
+        }
+        for row in rows
+    ]
@@ -0,0 +1,454 @@
+from collections import defaultdict
+
+from fastapi import HTTPException
+from sqlalchemy import column, delete, event, func, insert, inspect, literal, literal_column, or_, select, table, text, union_all
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.models.search_entry import SearchEntry
+from app.models.trip import Trip
+from app.models.customer import Customer
+from app.models.driver import Driver
+from app.models.vehicle import Vehicle
+from app.models.vendor import Vendor
+from app.utils.pagination import like_pattern
+
+SEARCH_TYPES = ("trip", "customer", "driver", "vehicle", "vendor")
+SYNC_CHUNK_SIZE = 5000
+# Matches per branch (trips / everything else) ranked on Postgres;
+# very broad terms rank the nearest ones, more words narrow it
+SEARCH_CANDIDATES = 500
+
+# Words that never narrow a search ("that trip to Shirdi for Patil in March")
+STOP_WORDS = {"a", "an", "and", "at", "for", "from", "in", "of", "on", "that", "the", "to", "with"}
+# Words naming a result type restrict the search to that type
+TYPE_WORDS = {
+    "trip": "trip", "trips": "trip",
+    "customer": "customer", "customers": "customer",
+    "driver": "driver", "drivers": "driver",
+    "vehicle": "vehicle", "vehicles": "vehicle",
+    "vendor": "vendor", "vendors": "vendor",
+}
+
+MONTHS = (
+    "january", "february", "march", "april", "may", "june",
+    "july", "august", "september", "october", "november", "december",
+)
+
+
+# ===============================
+# ENTRIES
+# ===============================
+
+def _text(*values) -> str:
+    return " ".join(" ".join(str(v).lower().split()) for v in values if v not in (None, ""))
+
+
+def _compact(value):
+    # "MH 12 AB-1234" is also found as "mh12ab1234"
+    return "".join(ch for ch in value.lower() if ch.isalnum()) if value else None
+
+
+def _trip_entry(row):
+    day = row.trip_date
+    return {
+        "entity_type": "trip",
+        "entity_id": row.id,
+        "title": f"{row.invoice_number}: {row.from_location} → {row.to_location}",
+        "subtitle": " · ".join(
+            str(v) for v in (day, row.customer_name, row.vehicle_number, row.driver_name) if v
+        ),
+        "search_text": _text(
+            row.invoice_number, row.from_location, row.to_location, row.route_details,
+            row.vehicle_number, _compact(row.vehicle_number), row.customer_name, row.customer_phone,
+            row.driver_name, row.vendor, day, MONTHS[day.month - 1] if day else None,
+        ),
+        "entry_date": day,
+    }
+
+
+def _customer_entry(row):
+    return {
+        "entity_type": "customer",
+        "entity_id": row.id,
+        "title": row.name,
+        "subtitle": " · ".join(v for v in (row.phone, row.email) if v),
+        "search_text": _text(row.name, row.phone, _compact(row.phone), row.email),
+        "entry_date": None,
+    }
+
+
+def _driver_entry(row):
+    return {
+        "entity_type": "driver",
+        "entity_id": row.id,
+        "title": row.name,
+        "subtitle": " · ".join(v for v in (row.phone, row.license_number) if v),
+        "search_text": _text(row.name, row.phone, row.license_number, _compact(row.license_number)),
+        "entry_date": None,
+    }
+
+
+def _vehicle_entry(row):
+    return {
+        "entity_type": "vehicle",
+        "entity_id": row.id,
+        "title": row.vehicle_number,
+        "subtitle": None,
+        "search_text": _text(row.vehicle_number, _compact(row.vehicle_number)),
+        "entry_date": None,
+    }
+
+
+def _vendor_entry(row):
+    return {
+        "entity_type": "vendor",
+        "entity_id": row.id,
+        "title": row.name,
+        "subtitle": row.category,
+        "search_text": _text(row.name, row.category),
+        "entry_date": None,
+    }
+
+
+# Per type: the model, the columns whose change re-indexes a row, the
+# select producing the entry inputs and the entry builder
+SOURCES = {
+    "trip": {
+        "model": Trip,
+        "fields": (
+            "invoice_number", "trip_date", "from_location", "to_location", "route_details",
+            "vehicle_number", "customer_id", "driver_id", "vendor",
+        ),
+        "rows": lambda: (
+            select(
+                Trip.id, Trip.invoice_number, Trip.trip_date, Trip.from_location, Trip.to_location,
+                Trip.route_details, Trip.vehicle_number, Trip.vendor,
+                Customer.name.label("customer_name"),
+                Customer.phone.label("customer_phone"),
+                Driver.name.label("driver_name"),
+            )
+            .outerjoin(Customer, Customer.id == Trip.customer_id)
+            .outerjoin(Driver, Driver.id == Trip.driver_id)
+        ),
+        "entry": _trip_entry,
+    },
+    "customer": {
+        "model": Customer,
+        "fields": ("name", "phone", "email"),
+        "rows": lambda: select(Customer.id, Customer.name, Customer.phone, Customer.email),
+        "entry": _customer_entry,
+    },
+    "driver": {
+        "model": Driver,
+        "fields": ("name", "phone", "license_number"),
+        "rows": lambda: select(Driver.id, Driver.name, Driver.phone, Driver.license_number),
+        "entry": _driver_entry,
+    },
+    "vehicle": {
+        "model": Vehicle,
+        "fields": ("vehicle_number", "is_deleted"),
+        "rows": lambda: select(Vehicle.id, Vehicle.vehicle_number).where(
+            or_(Vehicle.is_deleted.is_(False), Vehicle.is_deleted.is_(None))
+        ),
+        "entry": _vehicle_entry,
+    },
+    "vendor": {
+        "model": Vendor,
+        "fields": ("name", "category"),
+        "rows": lambda: select(Vendor.id, Vendor.name, Vendor.category),
+        "entry": _vendor_entry,
+    },
+}
+
+# Columns copied into trip entries: changing them re-indexes the trips
+# that reference the row
+DEPENDENTS = {
+    "customer": (("name", "phone"), Trip.customer_id),
+    "driver": (("name",), Trip.driver_id),
+}
+
+_MODEL_TYPES = {source["model"]: kind for kind, source in SOURCES.items()}
+
+
+# ===============================
+# SYNC ON WRITES
+# ===============================
+
+def _replace(conn, kind: str, stale, entries):
+    stale = list(stale)
+    for i in range(0, len(stale), SYNC_CHUNK_SIZE):
+        conn.execute(
+            delete(SearchEntry).where(
+                SearchEntry.entity_type == kind,
+                SearchEntry.entity_id.in_(stale[i:i + SYNC_CHUNK_SIZE]),
+            )
+        )
+    for i in range(0, len(entries), SYNC_CHUNK_SIZE):
+        conn.execute(insert(SearchEntry), entries[i:i + SYNC_CHUNK_SIZE])
+
+
+def _sync(conn, changed, removed, trips_of):
+    """Rewrite the entries of changed rows (and trips of renamed customers / drivers); drop removed ones"""
+    for kind, source in SOURCES.items():
+        ids = changed.get(kind, set())
+        conditions = [source["model"].id.in_(ids)] if ids else []
+        if kind == "trip":
+            conditions += [
+                trip_column.in_(trips_of[dependent])
+                for dependent, (_, trip_column) in DEPENDENTS.items()
+                if trips_of.get(dependent)
+            ]
+
+        stale = set(ids) | removed.get(kind, set())
+        entries = []
+        if conditions:
+            for row in conn.execute(source["rows"]().where(or_(*conditions))):
+                entries.append(source["entry"](row))
+                stale.add(row.id)
+        if stale:
+            _replace(conn, kind, stale, entries)
+
+
+def _changed(obj, fields) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[field].history.has_changes() for field in fields)
+
+
+def _after_flush(session: Session, flush_context):
+    changed, removed, trips_of = defaultdict(set), defaultdict(set), defaultdict(set)
+    for obj in session.new:
+        kind = _MODEL_TYPES.get(type(obj))
+        if kind:
+            changed[kind].add(obj.id)
+    for obj in session.dirty:
+        kind = _MODEL_TYPES.get(type(obj))
+        if kind is None:
+            continue
+        # Stats columns (total_trips, pending_balance, ...) change on every
+        # trip write; only searchable columns trigger a re-index
+        if _changed(obj, SOURCES[kind]["fields"]):
+            changed[kind].add(obj.id)
+        if kind in DEPENDENTS and _changed(obj, DEPENDENTS[kind][0]):
+            trips_of[kind].add(obj.id)
+    for obj in session.deleted:
+        kind = _MODEL_TYPES.get(type(obj))
+        if kind:
+            removed[kind].add(obj.id)
+
+    if changed or removed or trips_of:
+        # Core execute on the session's connection: same transaction
+        _sync(session.connection(), changed, removed, trips_of)
+
+
+def register_search_listeners():
+    """Keep search_index in step with ORM writes, on all sessions"""
+    if not event.contains(Session, "after_flush", _after_flush):
+        event.listen(Session, "after_flush", _after_flush)
+
+
+def rebuild_search_index(db: Session) -> int:
+    """Rebuild search_index from the source tables; returns the entry count"""
+    conn = db.connection()
+    conn.execute(delete(SearchEntry))
+    count = 0
+    for kind, source in SOURCES.items():
+        result = conn.execute(source["rows"]().execution_options(yield_per=SYNC_CHUNK_SIZE))
+        for chunk in result.partitions():
+            conn.execute(insert(SearchEntry), [source["entry"](row) for row in chunk])
+            count += len(chunk)
+    db.commit()
+    return count
+
+
+def backfill_search_index(db: Session) -> int:
+    """Build the index once, for databases created before it existed"""
+    if db.query(SearchEntry.id).first() is not None:
+        return 0
+    return rebuild_search_index(db)
+
+
+# ===============================
+# SQLITE FTS5 FALLBACK
+# ===============================
+
+FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5("
+    "search_text, content='search_index', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS search_index_ai AFTER INSERT ON search_index BEGIN "
+    "INSERT INTO search_fts(rowid, search_text) VALUES (new.id, new.search_text); END",
+    "CREATE TRIGGER IF NOT EXISTS search_index_ad AFTER DELETE ON search_index BEGIN "
+    "INSERT INTO search_fts(search_fts, rowid, search_text) VALUES ('delete', old.id, old.search_text); END",
+    "CREATE TRIGGER IF NOT EXISTS search_index_au AFTER UPDATE ON search_index BEGIN "
+    "INSERT INTO search_fts(search_fts, rowid, search_text) VALUES ('delete', old.id, old.search_text); "
+    "INSERT INTO search_fts(rowid, search_text) VALUES (new.id, new.search_text); END",
+)
+
+_fts_enabled = False
+
+
+def ensure_search_backend(engine):
+    """
+    On SQLite, an FTS5 trigram table over search_index kept in step by
+    triggers. Postgres needs nothing here: the GIN trigram index is part
+    of the model.
+    """
+    global _fts_enabled
+    if engine.dialect.name != "sqlite":
+        return
+    try:
+        with engine.begin() as conn:
+            created = conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'search_fts'")).first() is None
+            for statement in FTS_DDL:
+                conn.execute(text(statement))
+            if created:
+                conn.execute(text("INSERT INTO search_fts(search_fts) VALUES ('rebuild')"))
+        _fts_enabled = True
+    except OperationalError:
+        # SQLite built without FTS5 / the trigram tokenizer: LIKE scans
+        _fts_enabled = False
+
+
+# ===============================
+# QUERY
+# ===============================
+
+def _terms(q: str):
+    words = [w.strip(",.?!;:\"'()") for w in q.lower().split()]
+    implied = {TYPE_WORDS[w] for w in words if w in TYPE_WORDS}
+    tokens = [w for w in words if w and w not in STOP_WORDS and w not in TYPE_WORDS]
+    return tokens, implied
+
+
+def _like(token: str):
+    return SearchEntry.search_text.like(like_pattern(token), escape="\\")
+
+
+RESULT_COLUMNS = (
+    SearchEntry.entity_type,
+    SearchEntry.entity_id,
+    SearchEntry.title,
+    SearchEntry.subtitle,
+    SearchEntry.entry_date,
+)
+
+
+def _postgres_search(tokens, types, limit):
+    # Every word must appear (LIKE, served by the GIN trigram index); the
+    # candidates are the nearest by word-similarity distance (<<->, served
+    # by the GiST trigram index), so broad terms sample the best matches
+    phrase = " ".join(tokens)
+    matches = [_like(token) for token in tokens]
+    distance = literal(phrase).op("<<->")(SearchEntry.search_text)
+    branches = []
+    if "trip" in types:
+        branches.append(
+            select(SearchEntry.id)
+            .where(SearchEntry.entity_type == "trip", *matches)
+            .order_by(distance)
+            .limit(SEARCH_CANDIDATES)
+        )
+    others = [kind for kind in types if kind != "trip"]
+    if others:
+        branches.append(
+            select(SearchEntry.id)
+            .where(SearchEntry.entity_type.in_(others), *matches)
+            .order_by(distance)
+            .limit(SEARCH_CANDIDATES)
+        )
+    if len(branches) == 1:
+        candidates = branches[0].subquery()
+    else:
+        # Parenthesized: each branch keeps its own ORDER BY / LIMIT
+        candidates = union_all(*(branch.subquery().select() for branch in branches)).subquery()
+
+    rank = func.word_similarity(phrase, SearchEntry.search_text)
+    return (
+        select(*RESULT_COLUMNS, rank.label("score"))
+        .where(SearchEntry.id.in_(select(candidates.c.id)))
+        .order_by(rank.desc(), SearchEntry.entry_date.desc().nulls_last(), SearchEntry.id.desc())
+        .limit(limit)
+    )
+
+
+def _like_search(tokens, types, limit):
+    return (
+        select(*RESULT_COLUMNS, literal(0.0).label("score"))
+        .where(SearchEntry.entity_type.in_(types), *[_like(token) for token in tokens])
+        .order_by(SearchEntry.entry_date.desc().nulls_first(), SearchEntry.id.desc())
+        .limit(limit)
+    )
+
+
+def _fts_search(db: Session, tokens, types, limit):
+    rows = []
+    others = [kind for kind in types if kind != "trip"]
+    if others:
+        # Small tables: a LIKE scan of their (entity_type, entity_id) index range
+        rows += db.execute(_like_search(tokens, others, limit)).all()
+    if "trip" not in types or len(rows) >= limit:
+        return rows
+
+    # The trigram tokenizer matches substrings of 3+ characters; shorter
+    # words are checked with LIKE on the matched rows. bm25 is only
+    # computed for the newest SEARCH_CANDIDATES matches.
+    phrases = [token for token in tokens if len(token) >= 3]
+    match = " AND ".join('"' + token.replace('"', '""') + '"' for token in phrases)
+    fts = literal_column("search_fts")
+    matched = (
+        select(literal_column("rowid").label("id"), func.bm25(fts).label("bm25"))
+        .select_from(table("search_fts", column("rowid")))
+        .where(fts.op("MATCH")(match))
+        .order_by(literal_column("rowid").desc())
+        .limit(SEARCH_CANDIDATES)
+        .subquery()
+    )
+    stmt = (
+        select(*RESULT_COLUMNS, (-matched.c.bm25).label("score"))
+        .join(matched, matched.c.id == SearchEntry.id)
+        .where(SearchEntry.entity_type == "trip", *[_like(token) for token in tokens if len(token) < 3])
+        .order_by(matched.c.bm25, SearchEntry.entry_date.desc(), SearchEntry.id.desc())
+        .limit(limit - len(rows))
+    )
+    return rows + db.execute(stmt).all()
+
+
+def search(db: Session, q: str, types: list[str] | None = None, limit: int = 20):
+    """
+    Ranked, typed matches for free text such as "trip to Shirdi for Patil
+    in March". Every remaining word must appear in the entry; type words
+    ("trip", "customers") restrict the result types unless `types` is given.
+
+    Postgres ranks by word_similarity over trigram-index matches. SQLite
+    lists customer / driver / vehicle / vendor matches first, then trips
+    by FTS5 bm25; other databases fall back to LIKE, newest first.
+    """
+    unknown = [kind for kind in types or [] if kind not in SEARCH_TYPES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown type(s): {', '.join(unknown)}")
+
+    tokens, implied = _terms(q)
+    if not tokens:
+        return []
+    wanted = set(types or implied or SEARCH_TYPES)
+    types = [kind for kind in SEARCH_TYPES if kind in wanted]
+
+    dialect = db.bind.dialect.name
+    if dialect == "postgresql":
+        rows = db.execute(_postgres_search(tokens, types, limit)).all()
+    elif _fts_enabled and any(len(token) >= 3 for token in tokens):
+        rows = _fts_search(db, tokens, types, limit)
+    else:
+        rows = db.execute(_like_search(tokens, types, limit)).all()
+
+    return [
+        {
+            "type": row.entity_type,
+            "id": row.entity_id,
+            "title": row.title,
+            "subtitle": row.subtitle,
+            "trip_date": row.entry_date,
+            "score": round(float(row.score or 0), 4),
+        }
+        for row in rows
+    ]
@@ -0,0 +1,221 @@
+"""
+Slow-query log: every SQL statement slower than SLOW_QUERY_MS is recorded
+with its redacted parameters, the app function that issued it and,
+optionally, its EXPLAIN plan.
+
+Entries go into a bounded in-memory buffer per worker (served by
+/api/admin/slow-queries); those slower than SLOW_QUERY_LOG_MS are also
+appended as JSON lines to a rotating log file.
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from datetime import date, datetime, time as dt_time, timezone
+from decimal import Decimal
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+from fastapi import HTTPException
+
+from app.database.query_timer import on_statement
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+# "" (off), "plan" (EXPLAIN) or "analyze" (EXPLAIN ANALYZE, runs the query again)
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "").lower()
+SLOW_QUERY_BUFFER = int(os.getenv("SLOW_QUERY_BUFFER", "200"))
+SLOW_QUERY_LOG_MS = float(os.getenv("SLOW_QUERY_LOG_MS", "1000"))
+# Empty disables the log file
+SLOW_QUERY_LOG = os.getenv(
+    "SLOW_QUERY_LOG", str(Path(__file__).resolve().parents[2] / "logs" / "slow_queries.log")
+)
+
+EXPLAIN_MODES = ("plan", "analyze")
+# The same statement is explained at most once per interval, so a hot slow
+# query does not pay for its plan on every execution
+EXPLAIN_INTERVAL = 60
+MAX_STATEMENT_CHARS = 10_000
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+SKIP_DIRS = (os.path.join(APP_DIR, "database") + os.sep,)
+
+_entries = deque(maxlen=SLOW_QUERY_BUFFER)
+_lock = threading.Lock()
+_explained: dict[str, float] = {}
+
+_logger = logging.getLogger("app.slow_queries")
+_logger.propagate = False
+
+
+# ===============================
+# CAPTURE
+# ===============================
+
+def _caller():
+    """module:function:line of the innermost app frame outside this module"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if (
+            filename.startswith(APP_DIR)
+            and filename != os.path.abspath(__file__)
+            and not filename.startswith(SKIP_DIRS)
+        ):
+            module = os.path.relpath(filename, os.path.dirname(APP_DIR.rstrip(os.sep)))[:-3].replace(os.sep, ".")
+            return f"{module}:{frame.f_code.co_name}:{frame.f_lineno}"
+        frame = frame.f_back
+    return None
+
+
+def _redact_value(value):
+    # Shapes and non-identifying types are kept; text and bytes never are
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date, dt_time)):
+        return value.isoformat()
+    if isinstance(value, (str, bytes)):
+        return f"<{type(value).__name__} len={len(value)}>"
+    return f"<{type(value).__name__}>"
+
+
+def _redact(parameters):
+    if isinstance(parameters, dict):
+        return {key: _redact_value(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_redact_value(value) for value in parameters]
+    return _redact_value(parameters)
+
+
+def _should_explain(statement: str, executemany: bool) -> bool:
+    if SLOW_QUERY_EXPLAIN not in EXPLAIN_MODES or executemany:
+        return False
+    if not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+        return False
+
+    now = time.monotonic()
+    with _lock:
+        if now - _explained.get(statement, -EXPLAIN_INTERVAL) < EXPLAIN_INTERVAL:
+            return False
+        if len(_explained) > 1000:
+            _explained.clear()
+        _explained[statement] = now
+    return True
+
+
+def _explain(conn, statement, parameters):
+    """
+    Plan text of `statement`, run on a separate DBAPI cursor so it fires no
+    events and leaves the pending result alone. On Postgres it runs inside
+    a savepoint: a failing EXPLAIN must not abort the caller's transaction.
+    """
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        prefix = "EXPLAIN QUERY PLAN "
+    elif dialect == "postgresql":
+        prefix = "EXPLAIN (ANALYZE, BUFFERS) " if SLOW_QUERY_EXPLAIN == "analyze" else "EXPLAIN "
+    else:
+        return None
+
+    cursor = conn.connection.cursor()
+    try:
+        if dialect == "postgresql":
+            cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(prefix + statement, parameters or ())
+            rows = cursor.fetchall()
+        except Exception as exc:
+            if dialect == "postgresql":
+                cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            return f"EXPLAIN failed: {exc}"
+        if dialect == "postgresql":
+            cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+    finally:
+        cursor.close()
+
+    if dialect == "sqlite":
+        # (id, parent, notused, detail)
+        return "\n".join(str(row[-1]) for row in rows)
+    return "\n".join(str(row[0]) for row in rows)
+
+
+def _log_file():
+    path = Path(SLOW_QUERY_LOG)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handler = RotatingFileHandler(path, maxBytes=10 * 1024 * 1024, backupCount=5, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    _logger.addHandler(handler)
+    _logger.setLevel(logging.WARNING)
+
+
+def _record_statement(conn, statement, parameters, executemany, seconds):
+    elapsed_ms = seconds * 1000
+    if elapsed_ms < SLOW_QUERY_MS:
+        return
+
+    if executemany:
+        redacted = _redact(parameters[0]) if parameters else None
+        batch = len(parameters)
+    else:
+        redacted = _redact(parameters)
+        batch = None
+
+    entry = {
+        "recorded_at": datetime.now(timezone.utc),
+        "duration_ms": round(elapsed_ms, 2),
+        "statement": statement[:MAX_STATEMENT_CHARS],
+        "parameters": redacted,
+        "batch_size": batch,
+        "caller": _caller(),
+        "plan": _explain(conn, statement, parameters) if _should_explain(statement, executemany) else None,
+    }
+    with _lock:
+        _entries.append(entry)
+
+    if elapsed_ms >= SLOW_QUERY_LOG_MS and _logger.handlers:
+        _logger.warning(json.dumps(entry, default=str))
+
+
+def register_slow_query_listeners(engine):
+    """Record the statements on `engine` slower than SLOW_QUERY_MS"""
+    if SLOW_QUERY_LOG and not _logger.handlers:
+        _log_file()
+    on_statement(engine, _record_statement)
+
+
+# ===============================
+# READ
+# ===============================
+
+def slow_queries(limit: int = 50, min_ms: float | None = None, sort: str = "recent"):
+    """Recorded slow queries of this worker, newest or slowest first"""
+    if sort not in ("recent", "slowest"):
+        raise HTTPException(status_code=400, detail="Invalid sort")
+
+    with _lock:
+        entries = list(_entries)
+    if min_ms is not None:
+        entries = [e for e in entries if e["duration_ms"] >= min_ms]
+    if sort == "slowest":
+        entries.sort(key=lambda e: e["duration_ms"], reverse=True)
+    else:
+        entries.reverse()
+
+    return {
+        "threshold_ms": SLOW_QUERY_MS,
+        "log_threshold_ms": SLOW_QUERY_LOG_MS,
+        "explain": SLOW_QUERY_EXPLAIN if SLOW_QUERY_EXPLAIN in EXPLAIN_MODES else None,
+        "buffer_size": SLOW_QUERY_BUFFER,
+        "recorded": len(entries),
+        "entries": entries[:limit],
+    }
+
+
+def clear_slow_queries():
+    with _lock:
+        _entries.clear()
+        _explained.clear()
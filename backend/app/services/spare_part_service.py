@@ -1,7 +1,11 @@
+from collections import defaultdict
+
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from app.models.spare_part import SparePart
 from app.models.vehicle import Vehicle
+from app.services.vendor_service import resolve_vendor_id, resolve_vendor_ids, vendor_id_for
+from app.utils.bulk import bulk_insert, bulk_results, check_bulk_size, raise_item_errors
 
 
 # ---------------- ADD ----------------
@@ -13,7 +17,7 @@ def add_spare_part(db: Session, data):
     if not vehicle:
         raise HTTPException(404, "Vehicle not found")
 
-    spare = SparePart(**data.dict())
+    spare = SparePart(**data.dict(), vendor_id=resolve_vendor_id(db, data.vendor))
     db.add(spare)
 
     vehicle.total_maintenance_cost += data.cost * data.quantity
@@ -23,6 +27,45 @@ def add_spare_part(db: Session, data):
     return spare
 
 
+# ---------------- BULK ADD ----------------
+def add_spare_parts_bulk(db: Session, items):
+    """
+    All parts of a workshop bill at once: validated together, one vehicle
+    and one vendor lookup, one INSERT, one total_maintenance_cost update
+    per vehicle and one commit. Nothing is written when any item is invalid.
+    """
+    check_bulk_size(items)
+
+    numbers = {item.vehicle_number for item in items}
+    vehicles = {
+        vehicle.vehicle_number: vehicle
+        for vehicle in db.query(Vehicle).filter(Vehicle.vehicle_number.in_(numbers))
+    }
+
+    errors = []
+    for index, item in enumerate(items):
+        if item.vehicle_number not in vehicles:
+            errors.append((index, f"Vehicle {item.vehicle_number} not found"))
+        elif item.quantity < 1 or item.cost < 0:
+            errors.append((index, "Quantity must be at least 1 and cost not negative"))
+    raise_item_errors(errors)
+
+    vendor_ids = resolve_vendor_ids(db, (item.vendor for item in items))
+    ids = bulk_insert(db, SparePart, [
+        {**item.dict(), "vendor_id": vendor_id_for(vendor_ids, item.vendor)}
+        for item in items
+    ])
+
+    added_cost = defaultdict(float)
+    for item in items:
+        added_cost[item.vehicle_number] += item.cost * item.quantity
+    for number, cost in added_cost.items():
+        vehicles[number].total_maintenance_cost += cost
+
+    db.commit()
+    return bulk_results(ids)
+
+
 # ---------------- UPDATE ----------------
 def update_spare_part(db: Session, spare_id: int, data):
     spare = db.query(SparePart).filter(SparePart.id == spare_id).first()
@@ -40,6 +83,7 @@ def update_spare_part(db: Session, spare_id: int, data):
     spare.cost = data.cost
     spare.quantity = data.quantity
     spare.vendor = data.vendor
+    spare.vendor_id = resolve_vendor_id(db, data.vendor)
     spare.replaced_date = data.replaced_date
 
     if vehicle:
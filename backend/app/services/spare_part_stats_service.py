@@ -0,0 +1,169 @@
+from collections import defaultdict
+
+from sqlalchemy.orm import Session
+from sqlalchemy import Date, Float, func, select
+
+from app.models.spare_part import SparePart
+from app.models.trip import Trip
+
+# Fleet-wide percentiles reported for replacement intervals
+PERCENTILES = (10, 25, 50, 75, 90)
+# An interval shorter than this share of the fleet median is an early replacement
+EARLY_RATIO = 0.5
+# Fewer fleet intervals than this for a part and no outliers are flagged
+MIN_FLEET_INTERVALS = 5
+
+
+def part_key(part_name):
+    """Grouping key of a part name: "Brake Pad " and "brake pad" are one part"""
+    return func.lower(func.trim(part_name))
+
+
+def _replacement_intervals():
+    """
+    Replacements per vehicle, part and day, each with the previous one
+    from LAG() over (vehicle_number, part) by replaced_date, and the
+    odometer at both: the end_km of the vehicle's last trip on or before
+    the replacement day (one seek on ix_trips_vehicle_date each).
+    """
+    # Several rows of one part on one day (left and right pads) are one replacement
+    daily = (
+        select(
+            SparePart.vehicle_number.label("vehicle_number"),
+            part_key(SparePart.part_name).label("part"),
+            SparePart.replaced_date.label("replaced_date"),
+            func.sum(SparePart.quantity).label("quantity"),
+            func.sum(SparePart.cost * SparePart.quantity).label("cost"),
+        )
+        .group_by(SparePart.vehicle_number, part_key(SparePart.part_name), SparePart.replaced_date)
+        .subquery()
+    )
+
+    odometer = (
+        select(func.nullif(Trip.end_km, 0))
+        .where(Trip.vehicle_number == daily.c.vehicle_number, Trip.trip_date <= daily.c.replaced_date)
+        .order_by(Trip.trip_date.desc(), Trip.id.desc())
+        .limit(1)
+        .correlate(daily)
+        .scalar_subquery()
+    )
+    with_odometer = select(daily, odometer.label("odometer")).subquery()
+
+    window = {
+        "partition_by": (with_odometer.c.vehicle_number, with_odometer.c.part),
+        "order_by": with_odometer.c.replaced_date,
+    }
+    return select(
+        with_odometer,
+        func.lag(with_odometer.c.replaced_date, type_=Date).over(**window).label("previous_date"),
+        func.lag(with_odometer.c.odometer, type_=Float).over(**window).label("previous_odometer"),
+    ).subquery()
+
+
+def _percentile(values, pct):
+    """Linear-interpolated percentile of a sorted list"""
+    if not values:
+        return None
+    position = (len(values) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return round(values[lower] + (values[upper] - values[lower]) * (position - lower), 1)
+
+
+def _percentiles(values):
+    values = sorted(values)
+    return {f"p{p}": _percentile(values, p) for p in PERCENTILES}
+
+
+def replacement_intervals(
+    db: Session,
+    part: str | None = None,
+    vehicle_number: str | None = None,
+):
+    """
+    How long parts last: days and km between consecutive replacements of
+    the same part on the same vehicle, for the whole fleet in one query.
+
+    Per part: fleet percentiles of the intervals. Per (vehicle, part):
+    replacement count, median interval and last replacement. An interval
+    under EARLY_RATIO of the part's fleet median (days or km) is reported
+    as an early replacement. `part` and `vehicle_number` only narrow what
+    is returned; percentiles stay fleet-wide.
+    """
+    intervals = _replacement_intervals()
+    rows = db.execute(
+        select(intervals).order_by(intervals.c.part, intervals.c.vehicle_number, intervals.c.replaced_date)
+    ).all()
+
+    # part -> vehicle -> replacements in date order
+    history = defaultdict(lambda: defaultdict(list))
+    for row in rows:
+        # No trip between the two replacements: km unknown rather than 0
+        km = None
+        if row.odometer and row.previous_odometer and row.odometer > row.previous_odometer:
+            km = round(row.odometer - row.previous_odometer, 1)
+        history[row.part][row.vehicle_number].append({
+            "replaced_date": row.replaced_date,
+            "previous_date": row.previous_date,
+            "days": (row.replaced_date - row.previous_date).days if row.previous_date else None,
+            "km": km,
+            "quantity": int(row.quantity or 0),
+            "cost": float(row.cost or 0),
+        })
+
+    wanted_part = part.strip().lower() if part else None
+    parts, vehicles, outliers = [], [], []
+    for name, by_vehicle in sorted(history.items()):
+        events = [e for replacements in by_vehicle.values() for e in replacements]
+        days = [e["days"] for e in events if e["days"] is not None]
+        kms = [e["km"] for e in events if e["km"] is not None]
+        day_percentiles, km_percentiles = _percentiles(days), _percentiles(kms)
+        median_days, median_km = day_percentiles["p50"], km_percentiles["p50"]
+
+        if wanted_part and name != wanted_part:
+            continue
+        parts.append({
+            "part": name,
+            "vehicles": len(by_vehicle),
+            "replacements": len(events),
+            "intervals": len(days),
+            "days_percentiles": day_percentiles,
+            "km_percentiles": km_percentiles,
+        })
+
+        for vehicle, replacements in sorted(by_vehicle.items()):
+            if vehicle_number and vehicle != vehicle_number:
+                continue
+            early = 0
+            for e in replacements:
+                if e["days"] is None or len(days) < MIN_FLEET_INTERVALS:
+                    continue
+                early_days = median_days and e["days"] < median_days * EARLY_RATIO
+                early_km = median_km and e["km"] is not None and e["km"] < median_km * EARLY_RATIO
+                if not (early_days or early_km):
+                    continue
+                early += 1
+                outliers.append({
+                    "vehicle_number": vehicle,
+                    "part": name,
+                    **{k: e[k] for k in ("replaced_date", "previous_date", "days", "km", "cost")},
+                    "fleet_median_days": median_days,
+                    "fleet_median_km": median_km,
+                })
+
+            vehicle_days = sorted(e["days"] for e in replacements if e["days"] is not None)
+            vehicle_kms = sorted(e["km"] for e in replacements if e["km"] is not None)
+            vehicles.append({
+                "vehicle_number": vehicle,
+                "part": name,
+                "replacements": len(replacements),
+                "quantity": sum(e["quantity"] for e in replacements),
+                "cost": round(sum(e["cost"] for e in replacements), 2),
+                "median_days": _percentile(vehicle_days, 50),
+                "median_km": _percentile(vehicle_kms, 50),
+                "last_replaced": replacements[-1]["replaced_date"],
+                "early_replacements": early,
+            })
+
+    outliers.sort(key=lambda o: o["replaced_date"], reverse=True)
+    return {"parts": parts, "vehicles": vehicles, "outliers": outliers}
@@ -1,4 +1,5 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
 
 from app.models.trip import Trip
@@ -8,6 +9,22 @@ from app.models.vehicle import Vehicle
 from app.models.driver import Driver
 from app.models.customer import Customer
 from app.schemas.trip import TripCreate, TripUpdate
+from app.services.booking_service import (
+    busy_window,
+    segment_window,
+    assert_available,
+    invalidate_booking_index,
+    is_timed,
+)
+from app.services.vendor_service import resolve_vendor_id
+from app.services.odometer_service import check_trip_continuity, clear_trip_findings
+from app.services.invoice_number_service import (
+    allocate_invoice_number,
+    get_trip_by_invoice,
+    reserve_invoice_number,
+)
+from app.services.location_service import intern_location
+from app.services.quote_service import refresh_quote_routes
 
 
 # =========================
@@ -17,9 +34,10 @@ def create_trip(db: Session, trip_data: TripCreate):
     # Validate discount (fixed amount only)
     if trip_data.discount_amount and not (500 <= trip_data.discount_amount <= 1000):
         raise HTTPException(400, "Discount must be between ₹500 and ₹1000")
-    # Validate invoice number
-    if not trip_data.invoice_number or trip_data.invoice_number.strip() == "":
-        raise HTTPException(400, "Invoice number is required")
+    # Hand-entered invoice number (otherwise allocated below)
+    invoice_number = (trip_data.invoice_number or "").strip() or None
+    if invoice_number and get_trip_by_invoice(db, invoice_number):
+        raise HTTPException(409, "Invoice number already exists")
     
     # Validate pricing inputs
     if trip_data.pricing_type not in {"per_km", "package"}:
@@ -50,6 +68,19 @@ def create_trip(db: Session, trip_data: TripCreate):
     if not customer:
         raise HTTPException(404, "Customer not found")
 
+    # 📅 DOUBLE-BOOKING CHECK
+    window = busy_window(
+        trip_data.trip_date, trip_data.departure_datetime, trip_data.return_datetime
+    )
+    change_windows = [
+        (dc.driver_id, segment_window(window, dc.start_time, dc.end_time))
+        for dc in (trip_data.driver_changes or [])
+    ]
+    assert_available(
+        db, trip_data.vehicle_number, trip_data.driver_id, window, change_windows,
+        timed=is_timed(trip_data.departure_datetime, trip_data.return_datetime),
+    )
+
     # 🔢 TOTAL COST (PHASE-2)
     total_cost = (
         trip_data.diesel_used +
@@ -91,13 +122,23 @@ def create_trip(db: Session, trip_data: TripCreate):
     )
     pending_amount = max(total_charged - trip_data.amount_received, 0)
 
+    # 🧾 INVOICE NUMBER: last step before the writes, the counter row stays locked until commit
+    if not invoice_number:
+        invoice_number = allocate_invoice_number(db, trip_data.trip_date, trip_data.invoice_series)
+    else:
+        reserve_invoice_number(db, invoice_number)
+
     trip = Trip(
-        invoice_number=trip_data.invoice_number,
+        invoice_number=invoice_number,
         trip_date=trip_data.trip_date,
         departure_datetime=trip_data.departure_datetime,
         return_datetime=trip_data.return_datetime,
+        busy_from=window[0],
+        busy_until=window[1],
         from_location=trip_data.from_location,
         to_location=trip_data.to_location,
+        from_location_id=intern_location(db, trip_data.from_location),
+        to_location_id=intern_location(db, trip_data.to_location),
         route_details=trip_data.route_details,
         vehicle_number=trip_data.vehicle_number,
         driver_id=trip_data.driver_id,
@@ -113,6 +154,7 @@ def create_trip(db: Session, trip_data: TripCreate):
         other_expenses=trip_data.other_expenses,
         driver_bhatta=trip_data.driver_bhatta,
         vendor=trip_data.vendor,
+        vendor_id=resolve_vendor_id(db, trip_data.vendor),
         total_cost=total_cost,
         pricing_type=trip_data.pricing_type,
         package_amount=trip_data.package_amount,
@@ -152,12 +194,14 @@ def create_trip(db: Session, trip_data: TripCreate):
         ))
 
     # Driver changes
-    for dc in (trip_data.driver_changes or []):
+    for dc, (_, (seg_from, seg_until)) in zip(trip_data.driver_changes or [], change_windows):
         db.add(TripDriverChange(
             trip_id=trip.id,
             driver_id=dc.driver_id,
             start_time=dc.start_time,
             end_time=dc.end_time,
+            busy_from=seg_from,
+            busy_until=seg_until,
             notes=dc.notes
         ))
 
@@ -168,11 +212,47 @@ def create_trip(db: Session, trip_data: TripCreate):
     customer.total_billed += total_charged
     customer.pending_balance += pending_amount
 
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        # A hand-entered number taken between the check above and commit
+        if "invoice_number" in str(exc.orig):
+            raise HTTPException(409, "Invoice number already exists")
+        raise
+    invalidate_booking_index()
+    refresh_quote_routes(db, (trip.from_location_id, trip.to_location_id))
+    check_trip_continuity(db, trip.vehicle_number, trip.busy_from, trip.id)
     db.refresh(trip)
     return trip
 
 
+# =========================
+# TRIP DOCUMENT
+# =========================
+def get_trip_document(db: Session, trip_id: int):
+    """
+    Trip with everything its detail / invoice screens show. Five queries
+    whatever the trip holds: the trip joined to customer, driver and
+    vehicle, then one selectin per collection (driver changes come with
+    their drivers joined).
+    """
+    return (
+        db.query(Trip)
+        .options(
+            joinedload(Trip.customer),
+            joinedload(Trip.driver),
+            joinedload(Trip.vehicle),
+            selectinload(Trip.pricing_items),
+            selectinload(Trip.driver_changes).joinedload(TripDriverChange.driver),
+            selectinload(Trip.payments),
+            selectinload(Trip.driver_expenses),
+        )
+        .filter(Trip.id == trip_id)
+        .first()
+    )
+
+
 # =========================
 # GET TRIPS BY VEHICLE
 # =========================
@@ -205,10 +285,18 @@ def update_trip(db: Session, trip_id: int, data: TripUpdate):
     if not trip:
         raise HTTPException(404, "Trip not found")
 
+    old_position = (trip.vehicle_number, trip.busy_from)
+    old_route = (trip.from_location_id, trip.to_location_id)
+
     # Validate discount (fixed amount only)
     if data.discount_amount and not (500 <= data.discount_amount <= 1000):
         raise HTTPException(400, "Discount must be between ₹500 and ₹1000")
 
+    # Edited invoice number; blank keeps the current one
+    invoice_number = (data.invoice_number or "").strip() or trip.invoice_number
+    if invoice_number != trip.invoice_number and get_trip_by_invoice(db, invoice_number):
+        raise HTTPException(409, "Invoice number already exists")
+
     # 🔁 HANDLE DISTANCE CHANGE
     vehicle = db.query(Vehicle).filter(
         Vehicle.vehicle_number == trip.vehicle_number
@@ -228,12 +316,26 @@ def update_trip(db: Session, trip_id: int, data: TripUpdate):
         if data.package_amount <= 0:
             raise HTTPException(400, "Package amount must be greater than zero")
 
+    # 📅 DOUBLE-BOOKING CHECK
+    window = busy_window(data.trip_date, data.departure_datetime, data.return_datetime)
+    change_windows = [
+        (dc.driver_id, segment_window(window, dc.start_time, dc.end_time))
+        for dc in (data.driver_changes or [])
+    ]
+    assert_available(
+        db, data.vehicle_number, data.driver_id, window, change_windows, exclude_trip_id=trip.id,
+        timed=is_timed(data.departure_datetime, data.return_datetime),
+    )
+
     # 🔄 UPDATE FIELDS
     trip.trip_date = data.trip_date
     trip.departure_datetime = data.departure_datetime
     trip.return_datetime = data.return_datetime
+    trip.busy_from, trip.busy_until = window
     trip.from_location = data.from_location
     trip.to_location = data.to_location
+    trip.from_location_id = intern_location(db, data.from_location)
+    trip.to_location_id = intern_location(db, data.to_location)
     trip.route_details = data.route_details
     trip.vehicle_number = data.vehicle_number
     trip.driver_id = data.driver_id
@@ -250,6 +352,7 @@ def update_trip(db: Session, trip_id: int, data: TripUpdate):
     trip.other_expenses = data.other_expenses
     trip.driver_bhatta = data.driver_bhatta
     trip.vendor = data.vendor
+    trip.vendor_id = resolve_vendor_id(db, data.vendor)
 
     # 🔢 RECALCULATE COST
     trip.total_cost = (
@@ -329,12 +432,14 @@ def update_trip(db: Session, trip_id: int, data: TripUpdate):
 
     # Replace driver changes
     db.query(TripDriverChange).filter(TripDriverChange.trip_id == trip.id).delete()
-    for dc in (data.driver_changes or []):
+    for dc, (_, (seg_from, seg_until)) in zip(data.driver_changes or [], change_windows):
         db.add(TripDriverChange(
             trip_id=trip.id,
             driver_id=dc.driver_id,
             start_time=dc.start_time,
             end_time=dc.end_time,
+            busy_from=seg_from,
+            busy_until=seg_until,
             notes=dc.notes
         ))
 
@@ -344,7 +449,24 @@ def update_trip(db: Session, trip_id: int, data: TripUpdate):
         customer.total_billed += trip.total_charged - prior_total_charged
         customer.pending_balance += trip.pending_amount - prior_pending
 
-    db.commit()
+    # 🧾 INVOICE NUMBER: last step before commit, as in create_trip
+    if invoice_number != trip.invoice_number:
+        reserve_invoice_number(db, invoice_number)
+        trip.invoice_number = invoice_number
+
+    try:
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        if "invoice_number" in str(exc.orig):
+            raise HTTPException(409, "Invoice number already exists")
+        raise
+    invalidate_booking_index()
+    refresh_quote_routes(db, old_route, (trip.from_location_id, trip.to_location_id))
+    # 🧭 ODOMETER CONTINUITY (old neighbours first if the trip moved)
+    if old_position != (trip.vehicle_number, trip.busy_from):
+        check_trip_continuity(db, *old_position, trip.id)
+    check_trip_continuity(db, trip.vehicle_number, trip.busy_from, trip.id)
     db.refresh(trip)
     return trip
 
@@ -374,6 +496,13 @@ def delete_trip(db: Session, trip_id: int):
         customer.total_billed -= trip.total_charged
         customer.pending_balance -= trip.pending_amount
 
+    old_position = (trip.vehicle_number, trip.busy_from, trip.id)
+    old_route = (trip.from_location_id, trip.to_location_id)
+    clear_trip_findings(db, trip.id)
+
     db.delete(trip)
     db.commit()
+    invalidate_booking_index()
+    refresh_quote_routes(db, old_route)
+    check_trip_continuity(db, *old_position)
     return {"message": "Trip deleted successfully"}
@@ -0,0 +1,143 @@
+from datetime import date
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+
+from app.models.trip import Trip
+from app.models.payment import Payment
+from app.models.driver_expense import DriverExpense
+from app.utils.pagination import after_cursor, decode_cursor, encode_cursor
+
+# Sort keys accepted by trip_profitability; margin sorts worst first,
+# the others highest / newest first
+PROFITABILITY_SORTS = ("margin", "revenue", "driver_expenses", "trip_date")
+
+
+def _per_trip(column, trip_id_column, conditions):
+    """SUM(column) per trip, grouped only over the trips that pass the filters"""
+    return (
+        select(trip_id_column.label("trip_id"), func.sum(column).label("total"), func.count().label("count"))
+        .join(Trip, Trip.id == trip_id_column)
+        .where(*conditions)
+        .group_by(trip_id_column)
+        .subquery()
+    )
+
+
+def trip_profitability(
+    db: Session,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    vehicle_number: str | None = None,
+    driver_id: int | None = None,
+    customer_id: int | None = None,
+    loss_only: bool = False,
+    sort: str = "margin",
+    limit: int = 50,
+    cursor: str | None = None,
+):
+    """
+    Revenue, direct cost, driver expenses, payments and margin per trip.
+
+    Driver expenses and payments are each summed once per trip in a grouped
+    subquery restricted to the filtered trips and joined back, so a page
+    costs two aggregations rather than a lookup per trip.
+    margin = total_charged - total_cost - driver expenses.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    if sort not in PROFITABILITY_SORTS:
+        raise HTTPException(status_code=400, detail="Invalid sort")
+
+    conditions = []
+    if date_from:
+        conditions.append(Trip.trip_date >= date_from)
+    if date_to:
+        conditions.append(Trip.trip_date <= date_to)
+    if vehicle_number:
+        conditions.append(Trip.vehicle_number == vehicle_number)
+    if driver_id:
+        conditions.append(Trip.driver_id == driver_id)
+    if customer_id:
+        conditions.append(Trip.customer_id == customer_id)
+
+    expenses = _per_trip(DriverExpense.amount, DriverExpense.trip_id, conditions)
+    payments = _per_trip(Payment.amount, Payment.trip_id, conditions)
+
+    revenue = func.coalesce(Trip.total_charged, 0.0)
+    direct_cost = func.coalesce(Trip.total_cost, 0.0)
+    driver_expenses = func.coalesce(expenses.c.total, 0.0)
+    margin = revenue - direct_cost - driver_expenses
+
+    query = (
+        db.query(
+            Trip.id,
+            Trip.invoice_number,
+            Trip.trip_date,
+            Trip.vehicle_number,
+            Trip.driver_id,
+            Trip.customer_id,
+            Trip.from_location,
+            Trip.to_location,
+            revenue.label("revenue"),
+            direct_cost.label("direct_cost"),
+            driver_expenses.label("driver_expenses"),
+            func.coalesce(Trip.amount_received, 0.0).label("received"),
+            func.coalesce(payments.c.total, 0.0).label("payments_total"),
+            func.coalesce(payments.c.count, 0).label("payment_count"),
+            margin.label("margin"),
+        )
+        .outerjoin(expenses, expenses.c.trip_id == Trip.id)
+        .outerjoin(payments, payments.c.trip_id == Trip.id)
+        .filter(*conditions)
+    )
+    if loss_only:
+        query = query.filter(margin < 0)
+
+    sort_column = {
+        "margin": margin,
+        "revenue": revenue,
+        "driver_expenses": driver_expenses,
+        "trip_date": Trip.trip_date,
+    }[sort]
+    descending = sort != "margin"
+
+    if cursor:
+        value, last_id = decode_cursor(cursor, date if sort == "trip_date" else float, int)
+        query = query.filter(after_cursor(sort_column, Trip.id, value, last_id, descending))
+
+    if descending:
+        query = query.order_by(sort_column.desc(), Trip.id.desc())
+    else:
+        query = query.order_by(sort_column.asc(), Trip.id.asc())
+
+    rows = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort), last.id)
+
+    return [
+        {
+            "trip_id": row.id,
+            "invoice_number": row.invoice_number,
+            "trip_date": row.trip_date,
+            "vehicle_number": row.vehicle_number,
+            "driver_id": row.driver_id,
+            "customer_id": row.customer_id,
+            "from_location": row.from_location,
+            "to_location": row.to_location,
+            "revenue": float(row.revenue),
+            "direct_cost": float(row.direct_cost),
+            "driver_expenses": float(row.driver_expenses),
+            "received": float(row.received),
+            "payments_total": float(row.payments_total),
+            "payment_count": row.payment_count,
+            "outstanding": max(float(row.revenue) - float(row.received), 0.0),
+            "margin": round(float(row.margin), 2),
+            "margin_pct": round(float(row.margin) * 100 / float(row.revenue), 2) if row.revenue else None,
+        }
+        for row in rows
+    ], next_cursor
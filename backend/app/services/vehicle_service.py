@@ -20,7 +20,8 @@ def create_vehicle(db: Session, vehicle: VehicleCreate):
         raise HTTPException(400, "Vehicle already exists")
 
     db_vehicle = Vehicle(
-        vehicle_number=vehicle.vehicle_number
+        vehicle_number=vehicle.vehicle_number,
+        vehicle_class=(vehicle.vehicle_class or "").strip() or None
     )
 
     db.add(db_vehicle)
@@ -0,0 +1,176 @@
+from datetime import date
+
+from fastapi import HTTPException
+from sqlalchemy import Date, Float, String, and_, cast, func, literal, null, or_, select, union_all
+from sqlalchemy.orm import Session
+
+from app.models.trip import Trip
+from app.models.fuel import Fuel
+from app.models.spare_part import SparePart
+from app.models.maintenance import Maintenance
+from app.models.vehicle import Vehicle
+from app.models.vehicle_note import VehicleNote
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+# ===============================
+# SOURCES
+# ===============================
+#
+# Each source maps its table onto the common event columns. "date" is the
+# column the branch orders by; every source has an index on
+# (vehicle, date) so a branch reads at most one page from its index.
+# Events on the same day are ordered by source (registry order), then id.
+
+SOURCES = {
+    "trip": {
+        "model": Trip,
+        "vehicle": lambda number, vehicle_id: Trip.vehicle_number == number,
+        "date": Trip.trip_date,
+        "title": Trip.from_location + " → " + Trip.to_location,
+        "detail": Trip.invoice_number,
+        "amount": Trip.total_charged,
+        "quantity": Trip.distance_km,
+    },
+    "fuel": {
+        "model": Fuel,
+        "vehicle": lambda number, vehicle_id: Fuel.vehicle_number == number,
+        "date": Fuel.filled_date,
+        "title": Fuel.fuel_type,
+        "detail": Fuel.vendor,
+        "amount": Fuel.total_cost,
+        "quantity": Fuel.quantity,
+    },
+    "spare_part": {
+        "model": SparePart,
+        "vehicle": lambda number, vehicle_id: SparePart.vehicle_number == number,
+        "date": SparePart.replaced_date,
+        "title": SparePart.part_name,
+        "detail": SparePart.vendor,
+        "amount": SparePart.cost * SparePart.quantity,
+        "quantity": SparePart.quantity,
+    },
+    "maintenance": {
+        "model": Maintenance,
+        "vehicle": lambda number, vehicle_id: Maintenance.vehicle_number == number,
+        # Day of a datetime column; a vehicle has few maintenance rows
+        "date": func.date(Maintenance.start_date, type_=Date),
+        "title": func.lower(cast(Maintenance.maintenance_type, String)),
+        "detail": Maintenance.description,
+        "amount": Maintenance.amount,
+        "quantity": null(),
+    },
+    "note": {
+        "model": VehicleNote,
+        "vehicle": lambda number, vehicle_id: VehicleNote.vehicle_id == vehicle_id,
+        "date": VehicleNote.note_date,
+        "title": VehicleNote.note,
+        "detail": null(),
+        "amount": null(),
+        "quantity": null(),
+    },
+}
+
+EVENT_TYPES = tuple(SOURCES)
+
+
+def _after(name: str, source: dict, before):
+    """
+    Keyset condition for one branch: events after the cursor in
+    ORDER BY date DESC, source DESC, id DESC. The source rank is constant
+    within a branch, so it only decides how the cursor's own day is cut.
+    """
+    day, cursor_type, last_id = before
+    column, id_column = source["date"], source["model"].id
+    rank, cursor_rank = EVENT_TYPES.index(name), EVENT_TYPES.index(cursor_type)
+    if rank < cursor_rank:
+        return column <= day
+    if rank > cursor_rank:
+        return column < day
+    return or_(column < day, and_(column == day, id_column < last_id))
+
+
+def _branch(name: str, vehicle_number: str, vehicle_id: int, before, limit: int):
+    source = SOURCES[name]
+    stmt = (
+        select(
+            literal(name).label("type"),
+            literal(EVENT_TYPES.index(name)).label("rank"),
+            source["model"].id.label("id"),
+            source["date"].label("date"),
+            cast(source["title"], String).label("title"),
+            cast(source["detail"], String).label("detail"),
+            cast(source["amount"], Float).label("amount"),
+            cast(source["quantity"], Float).label("quantity"),
+        )
+        .where(source["vehicle"](vehicle_number, vehicle_id))
+    )
+    if before:
+        stmt = stmt.where(_after(name, source, before))
+    # Limited per branch so each side stops after one page of its index;
+    # wrapped because SQLite rejects ORDER BY / LIMIT on a UNION member
+    stmt = stmt.order_by(source["date"].desc(), source["model"].id.desc()).limit(limit)
+    return select(stmt.subquery())
+
+
+def vehicle_timeline(
+    db: Session,
+    vehicle_number: str,
+    types: list[str] | None = None,
+    limit: int = 50,
+    before: str | None = None,
+):
+    """
+    Trips, fuel, spare parts, maintenance and notes of one vehicle as a
+    single newest-first event list. Each source contributes its own
+    newest `limit` events after the cursor; the UNION ALL of those is
+    sorted and cut to one page, so a page costs the same however long
+    the vehicle's history is.
+    Returns (events, next_cursor); next_cursor is None on the last page.
+    """
+    types = types or list(EVENT_TYPES)
+    unknown = [t for t in types if t not in SOURCES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown event type(s): {', '.join(unknown)}")
+
+    vehicle_id = db.query(Vehicle.id).filter(Vehicle.vehicle_number == vehicle_number).scalar()
+    if vehicle_id is None:
+        raise HTTPException(status_code=404, detail="Vehicle not found")
+
+    cursor = None
+    if before:
+        day, cursor_type, last_id = decode_cursor(before, date, str, int)
+        if cursor_type not in SOURCES:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        cursor = (day, cursor_type, last_id)
+
+    branches = [
+        _branch(name, vehicle_number, vehicle_id, cursor, limit + 1)
+        for name in EVENT_TYPES if name in types
+    ]
+    events = union_all(*branches).subquery() if len(branches) > 1 else branches[0].subquery()
+
+    rows = db.execute(
+        select(events)
+        .order_by(events.c.date.desc(), events.c.rank.desc(), events.c.id.desc())
+        .limit(limit + 1)
+    ).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.date, last.type, last.id)
+
+    return [
+        {
+            "type": row.type,
+            "id": row.id,
+            "event_date": row.date,
+            "title": row.title,
+            "detail": row.detail,
+            "amount": row.amount,
+            "quantity": row.quantity,
+        }
+        for row in rows
+    ], next_cursor
@@ -1,8 +1,11 @@
-from sqlalchemy import or_
+from sqlalchemy import func, or_, select, update
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
 from app.models.vendor import Vendor
+from app.models.fuel import Fuel
+from app.models.spare_part import SparePart
+from app.models.trip import Trip
 from app.schemas.vendor import VendorCreate
 
 
@@ -16,11 +19,64 @@ def add_vendor(db: Session, data: VendorCreate):
 
     vendor = Vendor(name=data.name, category=data.category)
     db.add(vendor)
+    db.flush()
+    # Entries typed with this name before the vendor existed
+    link_vendor_ids(db, vendor.id)
     db.commit()
     db.refresh(vendor)
     return vendor
 
 
+def resolve_vendor_id(db: Session, name: str | None):
+    """Vendor id for a free-text vendor name (case/space-insensitive), or None"""
+    if not name or not name.strip():
+        return None
+    return (
+        db.query(func.min(Vendor.id))
+        .filter(func.lower(Vendor.name) == name.strip().lower())
+        .scalar()
+    )
+
+
+def resolve_vendor_ids(db: Session, names) -> dict:
+    """{normalized name: vendor id} for a batch of free-text names, in one query"""
+    keys = {name.strip().lower() for name in names if name and name.strip()}
+    if not keys:
+        return {}
+    rows = (
+        db.query(func.lower(Vendor.name), func.min(Vendor.id))
+        .filter(func.lower(Vendor.name).in_(keys))
+        .group_by(func.lower(Vendor.name))
+    )
+    return {key: vendor_id for key, vendor_id in rows}
+
+
+def vendor_id_for(vendor_ids: dict, name: str | None):
+    return vendor_ids.get(name.strip().lower()) if name and name.strip() else None
+
+
+def link_vendor_ids(db: Session, vendor_id: int | None = None):
+    """
+    Set vendor_id on fuel entries, spare parts and trips from their vendor
+    name where it is still missing. Limited to one vendor when given.
+    Does not commit.
+    """
+    for model in (Fuel, SparePart, Trip):
+        match = select(func.min(Vendor.id)).where(
+            func.lower(Vendor.name) == func.lower(func.trim(model.vendor))
+        )
+        if vendor_id is not None:
+            match = match.where(Vendor.id == vendor_id)
+        match = match.scalar_subquery()
+
+        db.execute(
+            update(model)
+            .where(model.vendor_id.is_(None), model.vendor.isnot(None), match.isnot(None))
+            .values(vendor_id=match)
+            .execution_options(synchronize_session=False)
+        )
+
+
 def list_vendors(db: Session, category: str | None = None):
     query = db.query(Vendor)
     if category:
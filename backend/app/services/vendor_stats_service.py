@@ -1,45 +1,182 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import Float, String, func, literal, select, union_all
 from app.models.vendor import Vendor
 from app.models.fuel import Fuel
 from app.models.spare_part import SparePart
+from app.models.trip import Trip
 from app.models.vendor_payment import VendorPayment
+from app.utils.pagination import decode_cursor, encode_cursor
 
+LEDGER_PAGE_SIZE = 50
 
-def vendor_summary(db: Session, vendor_id: int):
-    vendor = db.query(Vendor).filter(Vendor.id == vendor_id).first()
-    if not vendor:
-        return None
 
-    name = vendor.name
+def _trip_fuel_cost():
+    return func.coalesce(Trip.diesel_used, 0) + func.coalesce(Trip.petrol_used, 0)
 
-    fuel_total = (
-        db.query(func.coalesce(func.sum(Fuel.total_cost), 0.0))
-        .filter(Fuel.vendor == name)
-        .scalar()
-    )
 
-    spare_total = (
-        db.query(func.coalesce(func.sum(SparePart.cost * SparePart.quantity), 0.0))
-        .filter(SparePart.vendor == name)
-        .scalar()
-    )
+def _zero():
+    return literal(0.0, Float)
+
 
-    paid_total = (
-        db.query(func.coalesce(func.sum(VendorPayment.amount), 0.0))
-        .filter(VendorPayment.vendor_id == vendor_id)
-        .scalar()
+def _vendor_totals(vendor_id: int | None = None):
+    """
+    Per-vendor fuel / spare / trip-fuel / paid totals as one grouped
+    query over a UNION ALL of the vendor_id-keyed tables
+    """
+    parts = [
+        select(Fuel.vendor_id.label("vendor_id"), Fuel.total_cost.label("fuel"),
+               _zero().label("spare"), _zero().label("trip_fuel"), _zero().label("paid"))
+        .where(Fuel.vendor_id.isnot(None)),
+        select(SparePart.vendor_id, _zero(), SparePart.cost * SparePart.quantity, _zero(), _zero())
+        .where(SparePart.vendor_id.isnot(None)),
+        select(Trip.vendor_id, _zero(), _zero(), _trip_fuel_cost(), _zero())
+        .where(Trip.vendor_id.isnot(None)),
+        select(VendorPayment.vendor_id, _zero(), _zero(), _zero(), VendorPayment.amount),
+    ]
+    if vendor_id is not None:
+        parts = [part.where(part.selected_columns[0] == vendor_id) for part in parts]
+
+    rows = union_all(*parts).subquery()
+    return (
+        select(
+            rows.c.vendor_id,
+            func.sum(rows.c.fuel).label("fuel_total"),
+            func.sum(rows.c.spare).label("spare_total"),
+            func.sum(rows.c.trip_fuel).label("trip_fuel_total"),
+            func.sum(rows.c.paid).label("paid_total"),
+        )
+        .group_by(rows.c.vendor_id)
+        .subquery()
     )
 
-    total_owed = float(fuel_total or 0) + float(spare_total or 0)
-    pending = total_owed - float(paid_total or 0)
+
+def _summary_row(vendor, totals):
+    fuel_total = float(totals.fuel_total or 0) if totals else 0.0
+    spare_total = float(totals.spare_total or 0) if totals else 0.0
+    trip_fuel_total = float(totals.trip_fuel_total or 0) if totals else 0.0
+    paid_total = float(totals.paid_total or 0) if totals else 0.0
+    total_owed = fuel_total + spare_total + trip_fuel_total
 
     return {
-        "vendor_id": vendor_id,
-        "vendor_name": name,
-        "fuel_total": float(fuel_total or 0),
-        "spare_total": float(spare_total or 0),
+        "vendor_id": vendor.id,
+        "vendor_name": vendor.name,
+        "category": vendor.category,
+        "fuel_total": fuel_total,
+        "spare_total": spare_total,
+        "trip_fuel_total": trip_fuel_total,
         "total_owed": total_owed,
-        "paid_total": float(paid_total or 0),
-        "pending": pending,
+        "paid_total": paid_total,
+        "pending": total_owed - paid_total,
     }
+
+
+def vendor_summaries(db: Session):
+    totals = _vendor_totals()
+    rows = (
+        db.query(Vendor, totals)
+        .outerjoin(totals, totals.c.vendor_id == Vendor.id)
+        .order_by(Vendor.name.asc())
+        .all()
+    )
+    return [_summary_row(row.Vendor, row) for row in rows]
+
+
+def vendor_summary(db: Session, vendor_id: int):
+    vendor = db.query(Vendor).filter(Vendor.id == vendor_id).first()
+    if not vendor:
+        return None
+
+    totals = _vendor_totals(vendor_id)
+    row = db.query(totals).first()
+    return _summary_row(vendor, row)
+
+
+def vendor_ledger(db: Session, vendor_id: int, limit: int = LEDGER_PAGE_SIZE, cursor: str | None = None):
+    """
+    Purchases (fuel, spare parts, trip fuel) and payments for one vendor,
+    newest first, each with the running balance owed after that entry.
+
+    The balance is a window sum over the vendor's whole history in date
+    order; pages are cut with a keyset on that order (seq).
+    Returns (entries, next_cursor); next_cursor is None on the last page.
+    """
+    if not db.query(Vendor.id).filter(Vendor.id == vendor_id).first():
+        return None  # handled in route with 404
+
+    entries = union_all(
+        select(
+            Fuel.filled_date.label("entry_date"),
+            literal("fuel", String).label("kind"),
+            Fuel.id.label("ref_id"),
+            Fuel.vehicle_number.label("vehicle_number"),
+            Fuel.fuel_type.label("description"),
+            Fuel.quantity.label("quantity"),
+            Fuel.total_cost.label("debit"),
+            _zero().label("credit"),
+        ).where(Fuel.vendor_id == vendor_id),
+        select(
+            SparePart.replaced_date,
+            literal("spare", String),
+            SparePart.id,
+            SparePart.vehicle_number,
+            SparePart.part_name,
+            SparePart.quantity,
+            SparePart.cost * SparePart.quantity,
+            _zero(),
+        ).where(SparePart.vendor_id == vendor_id),
+        select(
+            Trip.trip_date,
+            literal("trip", String),
+            Trip.id,
+            Trip.vehicle_number,
+            Trip.invoice_number,
+            Trip.fuel_litres,
+            _trip_fuel_cost(),
+            _zero(),
+        ).where(Trip.vendor_id == vendor_id, _trip_fuel_cost() > 0),
+        select(
+            VendorPayment.paid_on,
+            literal("payment", String),
+            VendorPayment.id,
+            literal(None, String),
+            VendorPayment.notes,
+            literal(None, Float),
+            _zero(),
+            VendorPayment.amount,
+        ).where(VendorPayment.vendor_id == vendor_id),
+    ).subquery()
+
+    order = (entries.c.entry_date, entries.c.kind, entries.c.ref_id)
+    ledger = select(
+        entries,
+        func.row_number().over(order_by=order).label("seq"),
+        func.sum(entries.c.debit - entries.c.credit).over(order_by=order, rows=(None, 0)).label("balance"),
+    ).subquery()
+
+    query = db.query(ledger)
+    if cursor:
+        (last_seq,) = decode_cursor(cursor, int)
+        query = query.filter(ledger.c.seq < last_seq)
+
+    rows = query.order_by(ledger.c.seq.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].seq)
+
+    return [
+        {
+            "seq": row.seq,
+            "entry_date": row.entry_date,
+            "kind": row.kind,
+            "ref_id": row.ref_id,
+            "vehicle_number": row.vehicle_number,
+            "description": row.description,
+            "quantity": row.quantity,
+            "debit": float(row.debit or 0),
+            "credit": float(row.credit or 0),
+            "balance": round(float(row.balance or 0), 2),
+        }
+        for row in rows
+    ], next_cursor
@@ -0,0 +1,42 @@
+from fastapi import HTTPException
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+# Largest number of records one bulk request may carry
+BULK_MAX_ITEMS = 500
+
+
+def check_bulk_size(items):
+    if not items:
+        raise HTTPException(status_code=400, detail="At least one item is required")
+    if len(items) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_MAX_ITEMS} items per request")
+
+
+def raise_item_errors(errors: list):
+    """
+    Reject the whole batch when any item is invalid; `errors` holds
+    (index, message) pairs and is returned as the detail list
+    """
+    if errors:
+        raise HTTPException(
+            status_code=400,
+            detail=[{"index": index, "error": message} for index, message in errors],
+        )
+
+
+def bulk_insert(db: Session, model, rows: list[dict]) -> list[int]:
+    """
+    INSERT all rows as one executemany: batched multi-row INSERT ..
+    RETURNING on Postgres (SQLite cannot order RETURNING rows and gets one
+    statement per row). Returns the new ids in the order of `rows`.
+    Does not commit.
+    """
+    # render_nulls: rows with a None value would otherwise start a new batch
+    stmt = insert(model).returning(model.id, sort_by_parameter_order=True)
+    result = db.execute(stmt.execution_options(render_nulls=True), rows)
+    return list(result.scalars())
+
+
+def bulk_results(ids: list[int]):
+    return {"created": len(ids), "items": [{"index": i, "id": id_} for i, id_ in enumerate(ids)]}
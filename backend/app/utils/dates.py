@@ -0,0 +1,16 @@
+import calendar
+from datetime import date
+
+from fastapi import HTTPException
+
+
+def month_bounds(month: str) -> tuple[date, date]:
+    """
+    First and last day of a YYYY-MM month
+    """
+    try:
+        year, mon = map(int, month.split("-"))
+        last_day = calendar.monthrange(year, mon)[1]
+        return date(year, mon, 1), date(year, mon, last_day)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid month format. Use YYYY-MM")
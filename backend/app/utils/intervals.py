@@ -0,0 +1,37 @@
+from bisect import bisect_left
+from itertools import accumulate
+
+
+class IntervalIndex:
+    """
+    Static index over half-open [start, end) intervals of one resource.
+
+    Intervals are sorted by start and carry a running maximum of their
+    ends (a flattened augmented interval tree), so checking whether
+    anything overlaps [start, end) is one binary search, and listing the
+    overlaps only walks back over intervals that can still reach start.
+    """
+
+    def __init__(self, intervals):
+        # intervals: iterable of (start, end, key)
+        self._items = sorted(intervals, key=lambda item: item[0])
+        self._starts = [item[0] for item in self._items]
+        self._max_end = list(accumulate((item[1] for item in self._items), max))
+
+    def __len__(self):
+        return len(self._items)
+
+    def overlaps(self, start, end) -> bool:
+        idx = bisect_left(self._starts, end)
+        return idx > 0 and self._max_end[idx - 1] > start
+
+    def overlapping(self, start, end) -> list:
+        """Keys of the intervals overlapping [start, end), in start order"""
+        found = []
+        idx = bisect_left(self._starts, end) - 1
+        while idx >= 0 and self._max_end[idx] > start:
+            if self._items[idx][1] > start:
+                found.append(self._items[idx][2])
+            idx -= 1
+        found.reverse()
+        return found
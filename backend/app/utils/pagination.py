@@ -0,0 +1,74 @@
+import base64
+import json
+from datetime import date
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(*values) -> str:
+    """
+    Encode the sort key of the last row of a page into an opaque cursor
+    """
+    raw = json.dumps(list(values), default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _cursor_value(value, kind):
+    # bool is an int subclass but never a valid key
+    if isinstance(value, bool):
+        raise ValueError
+    if kind is date:
+        if not isinstance(value, str):
+            raise ValueError
+        return date.fromisoformat(value)
+    if kind is float:
+        if not isinstance(value, (int, float)):
+            raise ValueError
+        return float(value)
+    if not isinstance(value, kind):
+        raise ValueError
+    return value
+
+
+def decode_cursor(cursor: str, *kinds) -> list:
+    """
+    Decode a cursor produced by encode_cursor into one value per expected
+    type (str, int, float or date, which is parsed from ISO format).
+    Anything else is a 400, so a tampered cursor never reaches the query.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if not isinstance(values, list) or len(values) != len(kinds):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    try:
+        return [_cursor_value(value, kind) for value, kind in zip(values, kinds)]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def after_cursor(sort_column, id_column, value, last_id, descending: bool = True):
+    """
+    Keyset condition selecting rows that come after (value, last_id)
+    in ORDER BY sort_column, id_column
+    """
+    if descending:
+        return or_(
+            sort_column < value,
+            and_(sort_column == value, id_column < last_id),
+        )
+    return or_(
+        sort_column > value,
+        and_(sort_column == value, id_column > last_id),
+    )
+
+
+def like_pattern(term: str, prefix: bool = False) -> str:
+    """
+    Build a LIKE pattern for a user supplied term (use with escape="\\")
+    """
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%" if prefix else f"%{escaped}%"
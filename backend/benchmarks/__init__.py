@@ -0,0 +1,14 @@
+"""
+Offline benchmarks, run from backend/ with `python -m benchmarks.<name>`.
+They are not part of the API.
+"""
+import importlib
+import pkgutil
+
+import app.models
+
+
+def load_models():
+    """Import every model so relationships resolve without app.main"""
+    for module in pkgutil.iter_modules(app.models.__path__):
+        importlib.import_module(f"app.models.{module.name}")
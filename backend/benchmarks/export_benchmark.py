@@ -0,0 +1,50 @@
+"""
+Export throughput: runs an export to the end without sending it.
+
+    cd backend && python -m benchmarks.export_benchmark trips --format csv --from 2025-01-01
+
+Reads the database configured for the app (DATABASE_URL / .env).
+"""
+import argparse
+import json
+import time
+from datetime import date
+
+from app.services.export_service import EXPORTS, export_select, stream_export
+from benchmarks import load_models
+
+
+def benchmark_export(entity: str, fmt: str, date_from=None, date_to=None, vehicle=None):
+    stmt = export_select(entity, date_from, date_to, vehicle)
+    stats = {"rows": 0}
+    byte_count = 0
+    started = time.perf_counter()
+    for chunk in stream_export(stmt, fmt, stats):
+        byte_count += len(chunk)
+    seconds = time.perf_counter() - started
+
+    return {
+        "entity": entity,
+        "format": fmt,
+        "rows": stats["rows"],
+        "bytes": byte_count,
+        "seconds": round(seconds, 3),
+        "rows_per_sec": round(stats["rows"] / seconds) if seconds else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("entity", choices=sorted(EXPORTS))
+    parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson")
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat)
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat)
+    parser.add_argument("--vehicle")
+    args = parser.parse_args()
+
+    load_models()
+    print(json.dumps(benchmark_export(args.entity, args.format, args.date_from, args.date_to, args.vehicle)))
+
+
+if __name__ == "__main__":
+    main()
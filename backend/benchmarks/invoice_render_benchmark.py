@@ -0,0 +1,42 @@
+"""
+Invoice batch throughput: a batch rendered cold in-process, cold in the
+process pool, then warm (every invoice served from the cache).
+
+    cd backend && python -m benchmarks.invoice_render_benchmark --month 2025-01 --format pdf
+
+Reads the database configured for the app (DATABASE_URL / .env) and
+writes into INVOICE_CACHE_DIR.
+"""
+import argparse
+import json
+
+from app.database.session import SessionLocal
+from app.services.invoice_render_service import FORMATS, INVOICE_RENDER_WORKERS, render_invoice_batch
+from benchmarks import load_models
+
+
+def benchmark_invoice_render(db, month: str | None, trip_ids: list[int] | None, fmt: str = "html"):
+    _, serial = render_invoice_batch(db, month, trip_ids, fmt, use_cache=False, use_pool=False)
+    _, pooled = render_invoice_batch(db, month, trip_ids, fmt, use_cache=False, use_pool=True)
+    _, warm = render_invoice_batch(db, month, trip_ids, fmt, use_cache=True)
+    return {"format": fmt, "workers": INVOICE_RENDER_WORKERS, "serial": serial, "pool": pooled, "cached": warm}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--month", help="YYYY-MM")
+    target.add_argument("--trip-ids", type=lambda value: [int(i) for i in value.split(",")])
+    parser.add_argument("--format", choices=FORMATS, default="html")
+    args = parser.parse_args()
+
+    load_models()
+    db = SessionLocal()
+    try:
+        print(json.dumps(benchmark_invoice_render(db, args.month, args.trip_ids, args.format), indent=2))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+# Picked up by gunicorn from the working directory (/app in the image)
+import os
+import shutil
+
+
+def on_starting(server):
+    # Metric files of a previous run would be added to this one's
+    path = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,106 @@
+"""
+Double-booking checks on [busy_from, busy_until) windows.
+
+Runs on a throwaway SQLite file by default; set TEST_DATABASE_URL to a
+scratch PostgreSQL database to exercise the tstzrange overlap there.
+"""
+import os
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database.base import Base
+from app.models.driver import Driver
+from app.models.trip import Trip
+from app.models.vehicle import Vehicle
+from app.services.booking_service import assert_available, busy_window
+from benchmarks import load_models
+
+TRIP_DATE = date(2025, 6, 1)
+IST = timezone(timedelta(hours=5, minutes=30))
+
+
+@pytest.fixture
+def db(tmp_path):
+    load_models()
+    url = os.getenv("TEST_DATABASE_URL") or f"sqlite:///{tmp_path / 'booking.db'}"
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, autoflush=False)()
+    session.add_all([
+        Vehicle(vehicle_number="MH12AB1234"),
+        Vehicle(vehicle_number="MH12CD5678"),
+        Driver(id=1, name="Ramesh"),
+        Driver(id=2, name="Suresh"),
+    ])
+    session.commit()
+    yield session
+    session.close()
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+def _book(db, invoice_number, departure, return_, vehicle_number="MH12AB1234", driver_id=1):
+    start, end = busy_window(TRIP_DATE, departure, return_)
+    trip = Trip(
+        invoice_number=invoice_number, trip_date=TRIP_DATE, from_location="Pune", to_location="Shirdi",
+        vehicle_number=vehicle_number, driver_id=driver_id,
+        departure_datetime=departure, return_datetime=return_, busy_from=start, busy_until=end,
+    )
+    db.add(trip)
+    db.commit()
+    return trip
+
+
+def _check(db, departure, return_, vehicle_number="MH12AB1234", driver_id=1, exclude_trip_id=None):
+    window = busy_window(TRIP_DATE, departure, return_)
+    assert_available(db, vehicle_number, driver_id, window, exclude_trip_id=exclude_trip_id)
+
+
+def _utc(hour, minute=0):
+    return datetime(2025, 6, 1, hour, minute, tzinfo=timezone.utc)
+
+
+def test_adjacent_windows_do_not_clash(db):
+    _book(db, "INV-1", _utc(6), _utc(12))
+    # Ends when the booked trip starts / starts when it ends: [start, end) windows
+    _check(db, _utc(2), _utc(6))
+    _check(db, _utc(12), _utc(18))
+
+
+def test_overlapping_window_is_rejected(db):
+    _book(db, "INV-1", _utc(6), _utc(12))
+
+    with pytest.raises(HTTPException) as vehicle_clash:
+        _check(db, _utc(11), _utc(14), driver_id=2)
+    assert vehicle_clash.value.status_code == 409
+    assert "INV-1" in vehicle_clash.value.detail
+
+    with pytest.raises(HTTPException) as driver_clash:
+        _check(db, _utc(7), _utc(8), vehicle_number="MH12CD5678")
+    assert driver_clash.value.status_code == 409
+
+
+def test_updated_trip_does_not_clash_with_itself(db):
+    trip = _book(db, "INV-1", _utc(6), _utc(12))
+    _check(db, _utc(8), _utc(14), exclude_trip_id=trip.id)
+
+    with pytest.raises(HTTPException):
+        _check(db, _utc(8), _utc(14))
+
+
+def test_naive_and_aware_times_are_the_same_instants(db):
+    # 10:00-14:00 IST is 04:30-08:30 UTC; naive times are taken as UTC
+    _book(db, "INV-1", datetime(2025, 6, 1, 10, 0, tzinfo=IST), datetime(2025, 6, 1, 14, 0, tzinfo=IST))
+
+    _check(db, datetime(2025, 6, 1, 8, 30), datetime(2025, 6, 1, 10, 0))
+    _check(db, datetime(2025, 6, 1, 1, 0), datetime(2025, 6, 1, 4, 30))
+    with pytest.raises(HTTPException) as clash:
+        _check(db, datetime(2025, 6, 1, 8, 0), datetime(2025, 6, 1, 9, 0))
+    assert clash.value.status_code == 409
+    with pytest.raises(HTTPException):
+        _check(db, _utc(4), datetime(2025, 6, 1, 11, 0, tzinfo=IST))
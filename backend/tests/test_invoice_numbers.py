@@ -0,0 +1,118 @@
+"""
+Invoice number allocation under concurrency.
+
+Runs on a throwaway SQLite file by default; set TEST_DATABASE_URL to a
+scratch PostgreSQL database to exercise the row locks there:
+
+    cd backend && TEST_DATABASE_URL=postgresql://... python -m pytest tests
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database.base import Base
+from app.models.invoice_counter import InvoiceCounter
+from app.models.trip import Trip
+from app.services import invoice_number_service
+from app.services.invoice_number_service import (
+    allocate_invoice_number,
+    fiscal_year,
+    format_invoice_number,
+    reserve_invoice_number,
+)
+from benchmarks import load_models
+
+THREADS = 16
+PER_THREAD = 125  # 2000 numbers
+TRIP_DATE = date(2025, 6, 1)
+FY = fiscal_year(TRIP_DATE)
+
+
+@pytest.fixture
+def sessions(tmp_path):
+    load_models()
+    url = os.getenv("TEST_DATABASE_URL") or f"sqlite:///{tmp_path / 'invoices.db'}"
+    connect_args = {"check_same_thread": False, "timeout": 60} if url.startswith("sqlite") else {}
+    engine = create_engine(url, connect_args=connect_args, pool_size=THREADS)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine, autoflush=False)
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+def _add_trip(db, invoice_number):
+    db.add(Trip(invoice_number=invoice_number, trip_date=TRIP_DATE, from_location="A", to_location="B"))
+
+
+def _seq(invoice_number):
+    return int(invoice_number.rsplit("-", 1)[1])
+
+
+def test_parallel_allocation_is_unique_and_gap_free(sessions):
+    def book(_):
+        numbers = []
+        for _ in range(PER_THREAD):
+            db = sessions()
+            try:
+                number = allocate_invoice_number(db, TRIP_DATE)
+                _add_trip(db, number)
+                db.commit()  # any duplicate fails here on the unique index
+                numbers.append(number)
+            finally:
+                db.close()
+        return numbers
+
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        numbers = [n for chunk in pool.map(book, range(THREADS)) for n in chunk]
+
+    assert len(set(numbers)) == THREADS * PER_THREAD
+    assert sorted(_seq(n) for n in numbers) == list(range(1, THREADS * PER_THREAD + 1))
+
+
+def test_hand_entered_number_moves_the_counter(sessions):
+    db = sessions()
+    db.add(InvoiceCounter(series="INV", fiscal_year=FY, last_value=3))
+    db.commit()
+    manual = format_invoice_number("INV", FY, 4)
+    reserve_invoice_number(db, manual)
+    _add_trip(db, manual)
+    db.commit()
+
+    assert allocate_invoice_number(db, TRIP_DATE) == format_invoice_number("INV", FY, 5)
+    db.close()
+
+
+def test_counter_behind_issued_numbers_skips_ahead(sessions):
+    # Numbers saved before reserve_invoice_number existed
+    db = sessions()
+    db.add(InvoiceCounter(series="INV", fiscal_year=FY, last_value=1))
+    for seq in (2, 3):
+        _add_trip(db, format_invoice_number("INV", FY, seq))
+    db.commit()
+
+    number = allocate_invoice_number(db, TRIP_DATE)
+    _add_trip(db, number)
+    db.commit()
+    assert number == format_invoice_number("INV", FY, 4)
+    assert allocate_invoice_number(db, TRIP_DATE) == format_invoice_number("INV", FY, 5)
+    db.close()
+
+
+def test_allocation_without_upsert(sessions, monkeypatch):
+    # Databases without ON CONFLICT / RETURNING (e.g. MySQL) lock and write the row
+    monkeypatch.setattr(invoice_number_service, "_upsert", lambda db: None)
+    db = sessions()
+    reserve_invoice_number(db, format_invoice_number("INV", FY, 2))
+    db.commit()
+    reserve_invoice_number(db, format_invoice_number("INV", FY, 1))
+    db.commit()
+
+    assert allocate_invoice_number(db, TRIP_DATE) == format_invoice_number("INV", FY, 3)
+    assert allocate_invoice_number(db, TRIP_DATE, series="B") == format_invoice_number("B", FY, 1)
+    assert allocate_invoice_number(db, TRIP_DATE, series="B") == format_invoice_number("B", FY, 2)
+    db.close()
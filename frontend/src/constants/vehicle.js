@@ -0,0 +1,2 @@
+// Vehicle classes; quotes group past trips by route and class
+export const VEHICLE_CLASSES = ["Sedan", "SUV", "Tempo Traveller", "Mini Bus", "Bus"];
@@ -1,42 +1,52 @@
 import { useEffect, useState } from "react";
 import { useNavigate } from "react-router-dom";
 import api from "../../services/api";
+import { formatDateDDMMYYYY } from "../../utils/date";
+
+const PAGE_SIZE = 50;
 
 export default function CustomerList() {
   const [customers, setCustomers] = useState([]);
-  const [trips, setTrips] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [searchName, setSearchName] = useState("");
   const [searchInvoice, setSearchInvoice] = useState("");
+  const [sort, setSort] = useState("name");
+  const [loading, setLoading] = useState(false);
   const navigate = useNavigate();
 
-  useEffect(() => {
-    Promise.all([api.get("/customers"), api.get("/trips")])
-      .then(([customersRes, tripsRes]) => {
-        setCustomers(customersRes.data || []);
-        setTrips(tripsRes.data || []);
+  const fetchCustomers = (cursor = null) => {
+    setLoading(true);
+    return api
+      .get("/customers", {
+        params: {
+          q: searchName.trim() || undefined,
+          invoice: searchInvoice.trim() || undefined,
+          sort,
+          limit: PAGE_SIZE,
+          cursor: cursor || undefined,
+        },
+      })
+      .then((res) => {
+        const rows = res.data || [];
+        setCustomers((prev) => (cursor ? [...prev, ...rows] : rows));
+        setNextCursor(res.headers["x-next-cursor"] || null);
       })
       .catch((err) => {
         console.error(err);
-        setCustomers([]);
-        setTrips([]);
-      });
-  }, []);
-
-  const filteredCustomers = customers.filter((c) => {
-    const nameMatch = searchName.trim()
-      ? String(c.name || "").toLowerCase().includes(searchName.trim().toLowerCase())
-      : true;
+        if (!cursor) setCustomers([]);
+        setNextCursor(null);
+      })
+      .finally(() => setLoading(false));
+  };
 
-    const invoiceMatch = searchInvoice.trim()
-      ? trips.some(
-          (t) =>
-            t.customer_id === c.id &&
-            String(t.invoice_number || "").toLowerCase().includes(searchInvoice.trim().toLowerCase())
-        )
-      : true;
+  useEffect(() => {
+    // Debounce typing so each keystroke doesn't hit the server
+    const timer = setTimeout(() => fetchCustomers(), 250);
+    return () => clearTimeout(timer);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [searchName, searchInvoice, sort]);
 
-    return nameMatch && invoiceMatch;
-  });
+  const isFiltered = searchName.trim() || searchInvoice.trim();
 
   return (
     <>
@@ -50,10 +60,10 @@ export default function CustomerList() {
         </button>
       </div>
 
-      <div className="mb-4 grid grid-cols-1 md:grid-cols-2 gap-3">
+      <div className="mb-4 grid grid-cols-1 md:grid-cols-3 gap-3">
         <input
           className="border p-2 rounded w-full"
-          placeholder="Search by Customer Name"
+          placeholder="Search by Name, Phone or Email"
           value={searchName}
           onChange={(e) => setSearchName(e.target.value)}
         />
@@ -63,6 +73,17 @@ export default function CustomerList() {
           value={searchInvoice}
           onChange={(e) => setSearchInvoice(e.target.value)}
         />
+        <select
+          className="border p-2 rounded w-full"
+          value={sort}
+          onChange={(e) => setSort(e.target.value)}
+        >
+          <option value="name">Sort by Name</option>
+          <option value="total_billed">Sort by Total Billed</option>
+          <option value="pending_balance">Sort by Pending</option>
+          <option value="trip_count">Sort by Trips</option>
+          <option value="last_trip_date">Sort by Last Trip</option>
+        </select>
       </div>
 
       <div className="bg-white rounded shadow overflow-hidden">
@@ -70,26 +91,32 @@ export default function CustomerList() {
           <thead className="bg-gray-200">
             <tr>
               <th className="p-3 text-left">Customer Name</th>
+              <th className="p-3 text-right">Trips</th>
+              <th className="p-3 text-right">Billed</th>
+              <th className="p-3 text-right">Pending</th>
+              <th className="p-3 text-left">Last Trip</th>
               <th className="p-3 text-left">Actions</th>
             </tr>
           </thead>
           <tbody>
             {customers.length === 0 ? (
               <tr>
-                <td colSpan="2" className="p-4 text-center text-gray-500">
-                  No customers added
-                </td>
-              </tr>
-            ) : filteredCustomers.length === 0 ? (
-              <tr>
-                <td colSpan="2" className="p-4 text-center text-gray-500">
-                  No matching customers found
+                <td colSpan="6" className="p-4 text-center text-gray-500">
+                  {loading
+                    ? "Loading..."
+                    : isFiltered
+                      ? "No matching customers found"
+                      : "No customers added"}
                 </td>
               </tr>
             ) : (
-              filteredCustomers.map((c) => (
+              customers.map((c) => (
                 <tr key={c.id} className="border-t">
                   <td className="p-3">{c.name}</td>
+                  <td className="p-3 text-right">{c.trip_count}</td>
+                  <td className="p-3 text-right">₹{Number(c.billed_amount || 0).toFixed(2)}</td>
+                  <td className="p-3 text-right">₹{Number(c.pending_amount || 0).toFixed(2)}</td>
+                  <td className="p-3">{formatDateDDMMYYYY(c.last_trip_date) || "-"}</td>
                   <td className="p-3 space-x-2">
                     <button
                       onClick={() => navigate(`/customers/${c.id}`)}
@@ -110,6 +137,18 @@ export default function CustomerList() {
           </tbody>
         </table>
       </div>
+
+      {nextCursor && (
+        <div className="mt-4 text-center">
+          <button
+            onClick={() => fetchCustomers(nextCursor)}
+            disabled={loading}
+            className="bg-gray-200 text-gray-800 px-4 py-2 rounded disabled:opacity-50"
+          >
+            {loading ? "Loading..." : "Load more"}
+          </button>
+        </div>
+      )}
     </>
   );
 }
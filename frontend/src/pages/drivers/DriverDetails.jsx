@@ -9,80 +9,79 @@ export default function DriverDetails() {
   const navigate = useNavigate();
   const [driver, setDriver] = useState(null);
   const [expenses, setExpenses] = useState([]);
-  const [trips, setTrips] = useState([]);
-  const [salaries, setSalaries] = useState([]);
+  const [monthTrips, setMonthTrips] = useState([]);
+  const [overview, setOverview] = useState(null);
   const [salaryForm, setSalaryForm] = useState({ amount: "", paid_on: "", notes: "" });
   const [selectedMonth, setSelectedMonth] = useState(
     new Date().toISOString().slice(0, 7)
   );
   const [loading, setLoading] = useState(true);
 
-  // Group expenses per trip so each trip shows a single row
-  const groupedExpenses = Object.values(
-    expenses.reduce((acc, exp) => {
-      const existing = acc[exp.trip_id] || {
-        tripId: exp.trip_id,
-        date: exp.created_at,
-        total: 0,
-        descriptions: [],
-        notes: [],
-      };
+  // Notes per trip for the grouped history (totals come from the overview)
+  const notesByTrip = expenses.reduce((acc, exp) => {
+    acc[exp.trip_id] = acc[exp.trip_id] || { descriptions: [], notes: [] };
+    acc[exp.trip_id].descriptions.push(exp.description);
+    if (exp.notes) acc[exp.trip_id].notes.push(exp.notes);
+    return acc;
+  }, {});
 
-      existing.total += Number(exp.amount || 0);
-      existing.date = exp.created_at; // latest entry timestamp
-      existing.descriptions.push(exp.description);
-      if (exp.notes) existing.notes.push(exp.notes);
-
-      acc[exp.trip_id] = existing;
-      return acc;
-    }, {})
-  );
+  const loadOverview = () =>
+    api
+      .get(`/drivers/${id}/overview`, { params: { month: selectedMonth, recent: 10 } })
+      .then((res) => {
+        setOverview(res.data);
+        setDriver(res.data.driver);
+      });
 
   useEffect(() => {
+    setLoading(true);
     Promise.all([
-      api.get(`/drivers/${id}`),
+      loadOverview(),
       api.get(`/driver-expenses/driver/${id}`),
-      api.get("/trips"),
-      api.get(`/driver-salaries/driver/${id}`)
-    ]).then(([driverRes, expensesRes, tripsRes, salariesRes]) => {
-      setDriver(driverRes.data);
+      api.get(`/trips/driver/${id}`)
+    ]).then(([, expensesRes, tripsRes]) => {
       setExpenses(expensesRes.data);
-      setTrips(tripsRes.data.filter(t => t.driver_id === Number(id)));
-      setSalaries(salariesRes.data);
+      setMonthTrips(tripsRes.data);
       setLoading(false);
     }).catch(error => {
       console.error("Error loading driver details:", error);
       setLoading(false);
     });
+    // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [id]);
 
+  useEffect(() => {
+    if (!loading) {
+      loadOverview().catch(error => console.error("Error loading driver overview:", error));
+    }
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [selectedMonth]);
+
   if (loading) {
     return <div className="p-6">Loading...</div>;
   }
 
-  if (!driver) {
+  if (!driver || !overview) {
     return <div className="p-6">Driver not found</div>;
   }
 
-  const totalExpenses = expenses.reduce((sum, exp) => sum + Number(exp.amount), 0);
+  const totalExpenses = overview.expenses.total;
+  const groupedExpenses = overview.expenses.by_trip;
 
   const isInSelectedMonth = (dateStr) =>
     dateStr && String(dateStr).slice(0, 7) === selectedMonth;
 
   const monthlyExpenses = expenses.filter(e => isInSelectedMonth(e.created_at));
-  const monthlyExpensesTotal = monthlyExpenses.reduce((sum, exp) => sum + Number(exp.amount || 0), 0);
+  const monthlyExpensesTotal = Number(overview.expenses.month_total || 0);
 
-  const monthlyBhattaTrips = trips.filter(t => isInSelectedMonth(t.trip_date));
-  const monthlyBhattaTotal = monthlyBhattaTrips.reduce(
-    (sum, t) => sum + Number(t.driver_bhatta || 0),
-    0
-  );
+  const monthlyBhattaTrips = monthTrips.filter(t => isInSelectedMonth(t.trip_date));
+  const monthlyBhattaTotal = Number(overview.month_trips?.bhatta || 0);
 
-  const monthlySalary = Number(driver.monthly_salary || 0);
+  const monthlySalary = Number(overview.salary.monthly_salary || 0);
   const monthlyTotalDue = monthlySalary + monthlyExpensesTotal + monthlyBhattaTotal;
 
-  const monthlySalaryPayments = salaries.filter(s => isInSelectedMonth(s.paid_on));
-  const monthlySalaryPaid = monthlySalaryPayments.reduce((sum, s) => sum + Number(s.amount || 0), 0);
+  const recentSalaryPayments = overview.recent_salaries;
+  const monthlySalaryPaid = Number(overview.salary.paid || 0);
   const monthlyPending = Math.max(0, monthlyTotalDue - monthlySalaryPaid);
 
   const submitSalaryPayment = async (e) => {
@@ -96,8 +95,7 @@ export default function DriverDetails() {
         paid_on: salaryForm.paid_on,
         notes: salaryForm.notes || null,
       });
-      const res = await api.get(`/driver-salaries/driver/${id}`);
-      setSalaries(res.data);
+      await loadOverview();
       setSalaryForm({ amount: "", paid_on: "", notes: "" });
     } catch (error) {
       alert("Error recording salary payment: " + (error.response?.data?.detail || error.message));
@@ -131,7 +129,7 @@ export default function DriverDetails() {
         <div className="grid grid-cols-3 gap-4 mb-6">
           <div className="bg-gradient-to-r from-blue-500 to-blue-600 text-white p-6 rounded-lg shadow-lg">
             <p className="text-sm opacity-90">Total Trips</p>
-            <p className="text-3xl font-bold">{trips.length}</p>
+            <p className="text-3xl font-bold">{overview.trips.count}</p>
           </div>
           <div className="bg-gradient-to-r from-orange-500 to-orange-600 text-white p-6 rounded-lg shadow-lg">
             <p className="text-sm opacity-90">Total Expenses</p>
@@ -139,7 +137,7 @@ export default function DriverDetails() {
           </div>
           <div className="bg-gradient-to-r from-green-500 to-green-600 text-white p-6 rounded-lg shadow-lg">
             <p className="text-sm opacity-90">Expense Items</p>
-            <p className="text-3xl font-bold">{expenses.length}</p>
+            <p className="text-3xl font-bold">{overview.expenses.count}</p>
           </div>
         </div>
 
@@ -257,14 +255,14 @@ export default function DriverDetails() {
                 </tr>
               </thead>
               <tbody>
-                {monthlySalaryPayments.length === 0 ? (
+                {recentSalaryPayments.length === 0 ? (
                   <tr>
                     <td colSpan="3" className="p-4 text-center text-gray-500">
-                      No salary payments for this month
+                      No salary payments recorded
                     </td>
                   </tr>
                 ) : (
-                  monthlySalaryPayments.map(p => (
+                  recentSalaryPayments.map(p => (
                     <tr key={p.id} className="border-t">
                       <td className="p-3 text-sm">{formatDateDDMMYYYY(p.paid_on)}</td>
                       <td className="p-3 text-sm font-semibold">₹ {Number(p.amount).toFixed(2)}</td>
@@ -371,7 +369,7 @@ export default function DriverDetails() {
             <h2 className="text-xl font-semibold text-gray-800">Driver Expenses History</h2>
           </div>
 
-          {expenses.length === 0 ? (
+          {groupedExpenses.length === 0 ? (
             <div className="p-8 text-center text-gray-500">
               No expenses recorded for this driver
             </div>
@@ -389,30 +387,30 @@ export default function DriverDetails() {
                 </thead>
                 <tbody>
                   {groupedExpenses.map((group) => {
-                    const trip = trips.find(t => t.id === group.tripId);
+                    const details = notesByTrip[group.trip_id] || { descriptions: [], notes: [] };
                     const descLabel =
-                      group.descriptions.length === 1
-                        ? group.descriptions[0]
-                        : `${group.descriptions.length} items`;
+                      group.items === 1 && details.descriptions.length === 1
+                        ? details.descriptions[0]
+                        : `${group.items} items`;
 
                     return (
-                      <tr key={group.tripId} className="border-t hover:bg-gray-50">
+                      <tr key={group.trip_id} className="border-t hover:bg-gray-50">
                         <td className="p-3 text-sm text-gray-600">
-                          {formatDateDDMMYYYY(group.date)}
+                          {formatDateDDMMYYYY(group.last_entry_at)}
                         </td>
                         <td className="p-3 text-sm">
                           <button
-                            onClick={() => navigate(`/trips/${group.tripId}`)}
+                            onClick={() => navigate(`/trips/${group.trip_id}`)}
                             className="text-blue-600 hover:text-blue-800 font-semibold"
                           >
-                            {trip?.invoice_number ? `#${trip.invoice_number}` : "N/A"}
+                            {group.invoice_number ? `#${group.invoice_number}` : "N/A"}
                           </button>
                         </td>
                         <td className="p-3 text-sm font-semibold text-gray-800">
                           {descLabel}
                         </td>
                         <td className="p-3 text-sm text-gray-600">
-                          {group.notes.length > 0 ? group.notes.join(", ") : "-"}
+                          {details.notes.length > 0 ? details.notes.join(", ") : "-"}
                         </td>
                         <td className="p-3 text-sm text-right font-bold text-orange-600">
                           ₹ {Number(group.total).toFixed(2)}
@@ -20,23 +20,11 @@ export default function InvoiceView() {
 
   const loadInvoiceData = async () => {
     try {
-      const tripRes = await api.get(`/trips/${id}`);
-      setTrip(tripRes.data);
-
-      const customerRes = await api.get("/customers");
-      setCustomer(
-        customerRes.data.find(c => c.id === tripRes.data.customer_id)
-      );
-
-      const vehicleRes = await api.get("/vehicles");
-      setVehicle(
-        vehicleRes.data.find(v => v.vehicle_number === tripRes.data.vehicle_number)
-      );
-
-      const driverRes = await api.get("/drivers");
-      setDriver(
-        driverRes.data.find(d => d.id === tripRes.data.driver_id)
-      );
+      const res = await api.get(`/trips/${id}/document`);
+      setTrip(res.data);
+      setCustomer(res.data.customer);
+      setVehicle(res.data.vehicle);
+      setDriver(res.data.driver);
     } catch (error) {
       console.error("Error loading invoice:", error);
     }
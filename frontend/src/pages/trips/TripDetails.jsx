@@ -17,29 +17,12 @@ export default function TripDetails() {
   useEffect(() => {
     const load = async () => {
       try {
-        const res = await api.get(`/trips/${id}`);
+        const res = await api.get(`/trips/${id}/document`);
         setTrip(res.data);
-        // Load payments for this trip
-        api.get(`/payments/trip/${id}`)
-          .then(r => setPayments(r.data))
-          .catch(() => setPayments([]));
-        
-        // Load driver expenses
-        api.get(`/driver-expenses/trip/${id}`)
-          .then(r => setDriverExpenses(r.data))
-          .catch(() => setDriverExpenses([]));
-        
-        // fetch customer and driver names (best-effort)
-        if (res.data.customer_id) {
-          api.get(`/customers/${res.data.customer_id}`)
-            .then(r => setCustomerName(r.data.name))
-            .catch(() => {});
-        }
-        if (res.data.driver_id) {
-          api.get(`/drivers/${res.data.driver_id}`)
-            .then(r => setDriverName(r.data.name || r.data.id))
-            .catch(() => {});
-        }
+        setPayments(res.data.payments || []);
+        setDriverExpenses(res.data.driver_expenses || []);
+        setCustomerName(res.data.customer?.name || "");
+        setDriverName(res.data.driver?.name || "");
       } catch (e) {
         setError("Unable to load trip");
       } finally {
@@ -187,7 +170,7 @@ export default function TripDetails() {
             {trip.driver_changes.map((dc) => (
               <div key={dc.id} className="flex justify-between items-center border-b pb-2">
                 <div>
-                  <p className="font-semibold text-gray-800">Driver #{dc.driver_id}</p>
+                  <p className="font-semibold text-gray-800">{dc.driver?.name || `Driver #${dc.driver_id}`}</p>
                   <p className="text-xs text-gray-500">
                     {dc.start_time || "Start"} → {dc.end_time || "End"}
                   </p>
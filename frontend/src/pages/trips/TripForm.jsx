@@ -387,14 +387,14 @@ export default function TripForm() {
                 <p className="text-blue-100 mt-1">Tour & Travel Management</p>
               </div>
               <div className="text-right">
-                <label className="text-sm text-blue-100 block">Invoice Number <span className="text-red-300 font-bold">*</span></label>
+                <label className="text-sm text-blue-100 block">Invoice Number</label>
                 <input
                   type="text"
                   name="invoice_number"
                   value={form.invoice_number}
                   onChange={handleChange}
-                  placeholder="Enter invoice number"
-                  required
+                  placeholder="Auto-assigned"
+                  readOnly={isEdit}
                   className="w-full md:w-auto text-xl md:text-2xl font-bold text-white bg-blue-700 border border-blue-500 rounded px-3 py-2 focus:outline-none focus:ring-2 focus:ring-white"
                 />
               </div>
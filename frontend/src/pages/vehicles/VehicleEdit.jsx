@@ -2,6 +2,7 @@ import { useEffect, useState } from "react";
 import { useParams, useNavigate } from "react-router-dom";
 import api from "../../services/api";
 import LoadingSpinner from "../../components/common/LoadingSpinner";
+import { VEHICLE_CLASSES } from "../../constants/vehicle";
 
 export default function VehicleEdit() {
   const { vehicle_number } = useParams();
@@ -10,6 +11,7 @@ export default function VehicleEdit() {
   const [loading, setLoading] = useState(true);
   const [formData, setFormData] = useState({
     vehicle_number: "",
+    vehicle_class: "",
   });
 
   // Load existing vehicle data
@@ -19,6 +21,7 @@ export default function VehicleEdit() {
       .then((res) => {
         setFormData({
           vehicle_number: res.data.vehicle_number,
+          vehicle_class: res.data.vehicle_class || "",
         });
         setLoading(false);
       })
@@ -31,7 +34,9 @@ export default function VehicleEdit() {
   const handleSubmit = async (e) => {
     e.preventDefault();
     try {
-      await api.put(`/vehicles/${vehicle_number}`, formData);
+      await api.put(`/vehicles/${vehicle_number}`, {
+        vehicle_class: formData.vehicle_class || null,
+      });
       alert("Vehicle updated successfully");
       navigate(`/vehicles/${vehicle_number}`);
     } catch (err) {
@@ -76,6 +81,22 @@ export default function VehicleEdit() {
             </p>
           </div>
 
+          <div>
+            <label className="block text-sm font-medium text-gray-700 mb-1">
+              Vehicle Class
+            </label>
+            <select
+              value={formData.vehicle_class}
+              onChange={(e) => setFormData({ ...formData, vehicle_class: e.target.value })}
+              className="border p-2 w-full rounded"
+            >
+              <option value="">Not set</option>
+              {VEHICLE_CLASSES.map((c) => (
+                <option key={c} value={c}>{c}</option>
+              ))}
+            </select>
+          </div>
+
           <div className="flex gap-3">
             <button
               type="submit"
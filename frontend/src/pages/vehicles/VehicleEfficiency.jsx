@@ -5,6 +5,7 @@ import api from "../../services/api";
 export default function VehicleEfficiency() {
   const [vehicles, setVehicles] = useState([]);
   const [efficiency, setEfficiency] = useState({});
+  const [fuelEfficiency, setFuelEfficiency] = useState({ fleet: null, vehicles: {} });
   const [loading, setLoading] = useState(true);
   const navigate = useNavigate();
 
@@ -17,6 +18,14 @@ export default function VehicleEfficiency() {
       const res = await api.get("/vehicles");
       setVehicles(res.data);
 
+      // km per litre from fill intervals, computed for the whole fleet in one call
+      api.get("/fuel/efficiency")
+        .then(fuelRes => setFuelEfficiency({
+          fleet: fuelRes.data.fleet,
+          vehicles: Object.fromEntries(fuelRes.data.vehicles.map(v => [v.vehicle_number, v])),
+        }))
+        .catch(e => console.error("Error loading fuel efficiency:", e));
+
       // Calculate efficiency for each vehicle using the summary endpoint
       const eff = {};
       for (const v of res.data) {
@@ -75,6 +84,7 @@ export default function VehicleEfficiency() {
               <th className="p-3 text-left">Trips</th>
               <th className="p-3 text-left">Cost / KM</th>
               <th className="p-3 text-left">Fuel Cost / KM</th>
+              <th className="p-3 text-left">KM / Litre</th>
               <th className="p-3 text-left">Total Cost</th>
               <th className="p-3 text-left">Actions</th>
             </tr>
@@ -82,13 +92,14 @@ export default function VehicleEfficiency() {
           <tbody>
             {vehicles.length === 0 ? (
               <tr>
-                <td colSpan="7" className="p-4 text-center text-gray-500">
+                <td colSpan="8" className="p-4 text-center text-gray-500">
                   No vehicles found
                 </td>
               </tr>
             ) : (
               vehicles.map(v => {
                 const eff = efficiency[v.vehicle_number] || {};
+                const fuelEff = fuelEfficiency.vehicles[v.vehicle_number];
                 return (
                   <tr key={v.vehicle_number} className="border-t hover:bg-gray-50">
                     <td className="p-3 font-medium">{v.vehicle_number}</td>
@@ -96,6 +107,16 @@ export default function VehicleEfficiency() {
                     <td className="p-3">{eff.trips || 0}</td>
                     <td className="p-3 font-semibold text-blue-600">₹{eff.costPerKm || 0}</td>
                     <td className="p-3 text-green-600">₹{eff.fuelCostPerKm || 0}</td>
+                    <td className="p-3">
+                      {fuelEff?.km_per_litre != null ? (
+                        <>
+                          {fuelEff.km_per_litre}
+                          <span className="text-xs text-gray-500 ml-1">
+                            (better than {fuelEff.km_per_litre_rank}% of fleet)
+                          </span>
+                        </>
+                      ) : "-"}
+                    </td>
                     <td className="p-3">₹{(eff.totalCost || 0).toLocaleString()}</td>
                     <td className="p-3">
                       <button
@@ -118,6 +139,11 @@ export default function VehicleEfficiency() {
         <ul className="list-disc list-inside space-y-1">
           <li><strong>Cost / KM:</strong> Total vehicle cost (fuel + trip expenses + maintenance) divided by total km</li>
           <li><strong>Fuel Cost / KM:</strong> Only fuel expenses divided by total km</li>
+          <li>
+            <strong>KM / Litre:</strong> Odometer km driven between fills divided by litres filled
+            {fuelEfficiency.fleet?.km_per_litre_percentiles?.p50 != null &&
+              ` (fleet median ${fuelEfficiency.fleet.km_per_litre_percentiles.p50})`}
+          </li>
           <li><strong>Total Cost:</strong> Sum of all expenses (fuel + trip expenses + maintenance)</li>
         </ul>
       </div>
@@ -1,17 +1,21 @@
 import { useState } from "react";
 import api from "../../services/api";
+import { VEHICLE_CLASSES } from "../../constants/vehicle";
 
 export default function VehicleForm() {
   const [vehicleNumber, setVehicleNumber] = useState("");
+  const [vehicleClass, setVehicleClass] = useState("");
 
   const handleSubmit = async (e) => {
     e.preventDefault();
     try {
       await api.post("/vehicles", {
         vehicle_number: vehicleNumber,
+        vehicle_class: vehicleClass || null,
       });
       alert("Vehicle added successfully");
       setVehicleNumber("");
+      setVehicleClass("");
     } catch (err) {
       alert("Vehicle already exists");
     }
@@ -37,6 +41,21 @@ export default function VehicleForm() {
           required
         />
 
+        <label className="block text-sm font-medium mb-1">
+          Vehicle Class
+        </label>
+
+        <select
+          className="border p-2 w-full mb-4 rounded"
+          value={vehicleClass}
+          onChange={(e) => setVehicleClass(e.target.value)}
+        >
+          <option value="">Not set</option>
+          {VEHICLE_CLASSES.map((c) => (
+            <option key={c} value={c}>{c}</option>
+          ))}
+        </select>
+
         <button
           type="submit"
           className="bg-blue-600 hover:bg-blue-700 text-white px-4 py-2 rounded w-full sm:w-auto"
@@ -3,15 +3,19 @@ import { useParams, useNavigate } from "react-router-dom";
 import api from "../../services/api";
 import { formatDateDDMMYYYY } from "../../utils/date";
 
+const LEDGER_PAGE_SIZE = 50;
+const LEDGER_KINDS = { fuel: "Fuel", spare: "Spare Part", trip: "Trip Fuel", payment: "Payment" };
+
 export default function VendorDetails() {
   const { id } = useParams();
   const navigate = useNavigate();
 
   const [vendor, setVendor] = useState(null);
-  const [fuelHistory, setFuelHistory] = useState([]);
-  const [spareHistory, setSpareHistory] = useState([]);
-  const [tripHistory, setTripHistory] = useState([]);
-  const [activeTab, setActiveTab] = useState("fuel");
+  const [summary, setSummary] = useState(null);
+  const [ledger, setLedger] = useState([]);
+  const [ledgerCursor, setLedgerCursor] = useState(null);
+  const [ledgerLoading, setLedgerLoading] = useState(false);
+  const [activeTab, setActiveTab] = useState("ledger");
   const [payments, setPayments] = useState([]);
   const [payForm, setPayForm] = useState({ amount: "", paid_on: "", notes: "" });
   const [showAddModal, setShowAddModal] = useState(false);
@@ -41,6 +45,28 @@ export default function VendorDetails() {
     api.get("/vehicles").then(res => setVehicles(res.data));
   }, [id]);
 
+  const loadLedger = async (cursor = null) => {
+    setLedgerLoading(true);
+    try {
+      const res = await api.get(`/vendors/${id}/ledger`, {
+        params: { limit: LEDGER_PAGE_SIZE, cursor: cursor || undefined },
+      });
+      setLedger(prev => (cursor ? [...prev, ...res.data] : res.data));
+      setLedgerCursor(res.headers["x-next-cursor"] || null);
+    } finally {
+      setLedgerLoading(false);
+    }
+  };
+
+  const loadTotals = async () => {
+    const [summaryRes, payRes] = await Promise.all([
+      api.get(`/vendors/${id}/summary`),
+      api.get(`/vendor-payments/vendor/${id}`),
+    ]);
+    setSummary(summaryRes.data);
+    setPayments(payRes.data);
+  };
+
   const loadVendorData = async () => {
     try {
       // Get vendor details
@@ -50,67 +76,18 @@ export default function VendorDetails() {
 
       if (!vendorData) return;
 
-      // Set default tab based on vendor category
-      if (vendorData.category === "fuel") {
-        setActiveTab("fuel");
-      } else if (vendorData.category === "spare") {
-        setActiveTab("spare");
-      }
-
-      // Payments
-      const payRes = await api.get(`/vendor-payments/vendor/${id}`);
-      setPayments(payRes.data);
-
-      // Only load fuel history for fuel vendors
-      if (vendorData.category === "fuel" || vendorData.category === "both") {
-        // Get separate fuel entries
-        const fuelRes = await api.get("/fuel");
-        const fuelEntries = fuelRes.data.filter(f => f.vendor === vendorData.name);
-
-        // Get trips with fuel for this vendor and convert to fuel entries
-        const tripRes = await api.get("/trips");
-        const tripFuelEntries = tripRes.data
-          .filter(t => t.vendor === vendorData.name && (t.diesel_used > 0 || t.petrol_used > 0))
-          .map(t => {
-            const totalCost = t.diesel_used > 0 ? t.diesel_used : t.petrol_used;
-            const litres = Number(t.fuel_litres || 0);
-            const rate = litres > 0 ? totalCost / litres : 0;
-
-            return {
-              id: `trip-${t.id}`,
-              filled_date: t.trip_date,
-              vehicle_number: t.vehicle_number,
-              fuel_type: t.diesel_used > 0 ? "diesel" : "petrol",
-              quantity: litres,
-              rate_per_litre: Number(rate.toFixed(2)),
-              total_cost: totalCost,
-              vendor: vendorData.name,
-              trip_id: t.id
-            };
-          });
-
-        // Combine both fuel entries
-        setFuelHistory([...fuelEntries, ...tripFuelEntries]);
-
-        // Also set trip history for trips tab
-        setTripHistory(tripRes.data.filter(t => t.vendor === vendorData.name));
-      }
-
-      // Only load spare parts history for spare vendors
-      if (vendorData.category === "spare" || vendorData.category === "both") {
-        const spareRes = await api.get("/spare-parts");
-        setSpareHistory(spareRes.data.filter(s => s.vendor === vendorData.name));
-      }
+      // Totals are computed server-side; history comes from the paged ledger
+      await Promise.all([loadTotals(), loadLedger()]);
     } catch (error) {
       console.error("Error loading vendor data:", error);
     }
   };
 
-  const totalFuelCost = fuelHistory.reduce((sum, f) => sum + (Number(f.total_cost) || 0), 0);
-  const totalSpareCost = spareHistory.reduce((sum, s) => sum + (Number(s.cost) * Number(s.quantity) || 0), 0);
-  const totalOwed = totalFuelCost + totalSpareCost;
-  const totalPaid = payments.reduce((sum, p) => sum + (Number(p.amount) || 0), 0);
-  const pendingAmount = Math.max(0, totalOwed - totalPaid);
+  const totalFuelCost = summary?.fuel_total || 0;
+  const totalSpareCost = summary?.spare_total || 0;
+  const totalTripFuelCost = summary?.trip_fuel_total || 0;
+  const totalPaid = summary?.paid_total || 0;
+  const pendingAmount = Math.max(0, summary?.pending || 0);
 
   const submitPayment = async (e) => {
     e.preventDefault();
@@ -124,8 +101,7 @@ export default function VendorDetails() {
     try {
       await api.post("/vendor-payments", payload);
       alert("Payment recorded successfully");
-      const payRes = await api.get(`/vendor-payments/vendor/${id}`);
-      setPayments(payRes.data);
+      await Promise.all([loadTotals(), loadLedger()]);
       setPayForm({ amount: "", paid_on: "", notes: "" });
     } catch (err) {
       console.error("Payment submit error:", err);
@@ -137,8 +113,7 @@ export default function VendorDetails() {
     if (!window.confirm("Delete this payment?")) return;
     try {
       await api.delete(`/vendor-payments/${paymentId}`);
-      const payRes = await api.get(`/vendor-payments/vendor/${id}`);
-      setPayments(payRes.data);
+      await Promise.all([loadTotals(), loadLedger()]);
     } catch (err) {
       console.error("Delete payment error:", err);
       alert("Error deleting payment: " + (err.response?.data?.detail || err.message));
@@ -227,8 +202,6 @@ export default function VendorDetails() {
     );
   }
 
-  const totalTripFuelCost = tripHistory.reduce((sum, t) => sum + (t.diesel_used || 0) + (t.petrol_used || 0), 0);
-
   return (
     <div className="p-6 space-y-4">
       <div className="flex items-center justify-between">
@@ -477,42 +450,16 @@ export default function VendorDetails() {
 
       {/* TABS */}
       <div className="flex gap-2 border-b">
-        {(vendor.category === "fuel" || vendor.category === "both") && (
-          <button
-            onClick={() => setActiveTab("fuel")}
-            className={`px-4 py-2 font-medium border-b-2 ${
-              activeTab === "fuel"
-                ? "border-blue-600 text-blue-600"
-                : "border-transparent text-gray-600"
-            }`}
-          >
-            Fuel Entries ({fuelHistory.length})
-          </button>
-        )}
-        {(vendor.category === "spare" || vendor.category === "both") && (
-          <button
-            onClick={() => setActiveTab("spare")}
-            className={`px-4 py-2 font-medium border-b-2 ${
-              activeTab === "spare"
-                ? "border-blue-600 text-blue-600"
-                : "border-transparent text-gray-600"
-            }`}
-          >
-            Spare Parts ({spareHistory.length})
-          </button>
-        )}
-        {(vendor.category === "fuel" || vendor.category === "both") && (
-          <button
-            onClick={() => setActiveTab("trips")}
-            className={`px-4 py-2 font-medium border-b-2 ${
-              activeTab === "trips"
-                ? "border-blue-600 text-blue-600"
-                : "border-transparent text-gray-600"
-            }`}
-          >
-            Trips ({tripHistory.length})
-          </button>
-        )}
+        <button
+          onClick={() => setActiveTab("ledger")}
+          className={`px-4 py-2 font-medium border-b-2 ${
+            activeTab === "ledger"
+              ? "border-blue-600 text-blue-600"
+              : "border-transparent text-gray-600"
+          }`}
+        >
+          Ledger
+        </button>
         <button
           onClick={() => setActiveTab("payments")}
           className={`px-4 py-2 font-medium border-b-2 ${
@@ -597,119 +544,67 @@ export default function VendorDetails() {
         </div>
       )}
 
-      {/* FUEL TAB */}
-      {activeTab === "fuel" && (
+      {/* LEDGER TAB */}
+      {activeTab === "ledger" && (
         <div className="bg-white rounded shadow overflow-x-auto">
           <table className="w-full border-collapse">
             <thead className="bg-gray-200">
               <tr>
                 <th className="p-2 text-left">Date</th>
-                <th className="p-2 text-left">Vehicle</th>
                 <th className="p-2 text-left">Type</th>
-                <th className="p-2 text-left">Quantity (L)</th>
-                <th className="p-2 text-left">Rate</th>
-                <th className="p-2 text-left">Total</th>
-              </tr>
-            </thead>
-            <tbody>
-              {fuelHistory.length === 0 ? (
-                <tr>
-                  <td colSpan="6" className="p-4 text-center text-gray-500">
-                    No fuel entries
-                  </td>
-                </tr>
-              ) : (
-                fuelHistory.map(f => (
-                  <tr key={f.id} className="border-t">
-                    <td className="p-2">{formatDateDDMMYYYY(f.filled_date)}</td>
-                    <td className="p-2">{f.vehicle_number}</td>
-                    <td className="p-2 capitalize">{f.fuel_type}</td>
-                    <td className="p-2">{f.quantity}</td>
-                    <td className="p-2">₹ {f.rate_per_litre}</td>
-                    <td className="p-2">₹ {f.total_cost}</td>
-                  </tr>
-                ))
-              )}
-            </tbody>
-          </table>
-        </div>
-      )}
-
-      {/* SPARE PARTS TAB */}
-      {activeTab === "spare" && (
-        <div className="bg-white rounded shadow overflow-x-auto">
-          <table className="w-full border-collapse">
-            <thead className="bg-gray-200">
-              <tr>
-                <th className="p-2 text-left">Date</th>
                 <th className="p-2 text-left">Vehicle</th>
-                <th className="p-2 text-left">Part</th>
+                <th className="p-2 text-left">Details</th>
                 <th className="p-2 text-left">Qty</th>
-                <th className="p-2 text-left">Cost</th>
-                <th className="p-2 text-left">Total</th>
+                <th className="p-2 text-right">Purchase</th>
+                <th className="p-2 text-right">Paid</th>
+                <th className="p-2 text-right">Balance</th>
               </tr>
             </thead>
             <tbody>
-              {spareHistory.length === 0 ? (
+              {ledger.length === 0 ? (
                 <tr>
-                  <td colSpan="6" className="p-4 text-center text-gray-500">
-                    No spare parts
+                  <td colSpan="8" className="p-4 text-center text-gray-500">
+                    {ledgerLoading ? "Loading..." : "No entries"}
                   </td>
                 </tr>
               ) : (
-                spareHistory.map(s => (
-                  <tr key={s.id} className="border-t">
-                    <td className="p-2">{formatDateDDMMYYYY(s.replaced_date)}</td>
-                    <td className="p-2">{s.vehicle_number}</td>
-                    <td className="p-2">{s.part_name}</td>
-                    <td className="p-2">{s.quantity}</td>
-                    <td className="p-2">₹ {s.cost}</td>
-                    <td className="p-2">₹ {(s.cost * s.quantity).toFixed(2)}</td>
-                  </tr>
-                ))
-              )}
-            </tbody>
-          </table>
-        </div>
-      )}
-
-      {/* TRIPS TAB */}
-      {activeTab === "trips" && (
-        <div className="bg-white rounded shadow overflow-x-auto">
-          <table className="w-full border-collapse">
-            <thead className="bg-gray-200">
-              <tr>
-                <th className="p-2 text-left">Date</th>
-                <th className="p-2 text-left">Vehicle</th>
-                <th className="p-2 text-left">Route</th>
-                <th className="p-2 text-left">Distance</th>
-                <th className="p-2 text-left">Fuel Cost</th>
-              </tr>
-            </thead>
-            <tbody>
-              {tripHistory.length === 0 ? (
-                <tr>
-                  <td colSpan="5" className="p-4 text-center text-gray-500">
-                    No trips
-                  </td>
-                </tr>
-              ) : (
-                tripHistory.map(t => (
-                  <tr key={t.id} className="border-t">
-                    <td className="p-2">{formatDateDDMMYYYY(t.trip_date)}</td>
-                    <td className="p-2">{t.vehicle_number}</td>
-                    <td className="p-2">
-                      {t.from_location} → {t.to_location}
-                    </td>
-                    <td className="p-2">{t.distance_km} km</td>
+                ledger.map(e => (
+                  <tr key={e.seq} className="border-t">
+                    <td className="p-2">{formatDateDDMMYYYY(e.entry_date)}</td>
+                    <td className="p-2">{LEDGER_KINDS[e.kind] || e.kind}</td>
+                    <td className="p-2">{e.vehicle_number || "-"}</td>
                     <td className="p-2">
-                      ₹ {((t.diesel_used || 0) + (t.petrol_used || 0)).toFixed(2)}
+                      {e.kind === "trip" ? (
+                        <button
+                          onClick={() => navigate(`/trips/${e.ref_id}`)}
+                          className="text-blue-600 hover:underline"
+                        >
+                          {e.description}
+                        </button>
+                      ) : (
+                        <span className="capitalize">{e.description || "-"}</span>
+                      )}
                     </td>
+                    <td className="p-2">{e.quantity != null ? Number(e.quantity).toFixed(2) : "-"}</td>
+                    <td className="p-2 text-right">{e.debit ? `₹ ${e.debit.toFixed(2)}` : "-"}</td>
+                    <td className="p-2 text-right">{e.credit ? `₹ ${e.credit.toFixed(2)}` : "-"}</td>
+                    <td className="p-2 text-right">₹ {e.balance.toFixed(2)}</td>
                   </tr>
                 ))
               )}
             </tbody>
           </table>
+          {ledgerCursor && (
+            <div className="p-3 text-center">
+              <button
+                onClick={() => loadLedger(ledgerCursor)}
+                disabled={ledgerLoading}
+                className="bg-gray-200 text-gray-800 px-4 py-2 rounded disabled:opacity-50"
+              >
+                {ledgerLoading ? "Loading..." : "Load more"}
+              </button>
+            </div>
+          )}
         </div>
       )}
     </div>